@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Geometry Benchmark Suite
+
+Times the generators in blender/geometry inside headless Blender, including
+scaling sweeps over bracket_count and molding segments, and compares the
+results against a stored baseline.
+
+Usage:
+    blender --background --factory-startup --python blender/benchmarks/bench_geometry.py
+    blender --background --factory-startup --python blender/benchmarks/bench_geometry.py -- --save-baseline
+
+The run exits with status 1 when any case is slower than its baseline by more
+than the tolerance (default 25%). Baselines are machine-specific, so record
+them with --save-baseline on the machine that runs the comparison (e.g. CI)
+and commit benchmarks/baselines/geometry.json there. Without a baseline the
+run only reports timings; pass --require-baseline (as CI should once the
+baseline is committed) to fail instead.
+
+The components_per_process cases build many shelf components in one process,
+once through the bulk foreach_set path the geometry modules use and once
+through an equivalent per-element bmesh reference, to show the difference.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add blender directory to Python path for module imports
+blender_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if blender_dir not in sys.path:
+    sys.path.append(blender_dir)
+
+import bmesh
+import bpy
+from utils.scene_utils import clear_scene, remove_objects
+from geometry.shelf import create_main_shelf
+from geometry.brackets import create_bracket_support, create_brackets
+from geometry.layout import solve_assembly_layout
+from geometry.backing import create_backing_plane, create_pegboard_holes
+from geometry.crown import create_crown_topper, create_decorative_molding
+from utils.jobs import DEFAULT_ASSEMBLY_PARAMS, merge_params
+from benchmarks.harness import (time_case, load_baseline, save_baseline,
+                                compare_to_baseline, print_comparisons)
+
+DEFAULT_BASELINE = os.path.join(blender_dir, "benchmarks", "baselines", "geometry.json")
+
+BRACKET_COUNTS = [1, 10, 50, 100, 500]
+MOLDING_SEGMENTS = [1, 2, 4, 8, 16, 32, 64]
+COMPONENTS_PER_PROCESS = [10, 100]
+# (width, height, hole_spacing): the default backing and a full-height wall
+# panel with more than 10,000 holes
+PEGBOARD_SIZES = [(2.2, 1.5, 0.1), (2.2, 2.4, 0.02)]
+
+
+def bmesh_object(name, build):
+    """Create a linked mesh object whose geometry is built by build(bm)."""
+    mesh = bpy.data.meshes.new(f"{name}_mesh")
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    bm = bmesh.new()
+    build(bm)
+    bm.to_mesh(mesh)
+    bm.free()
+    return obj
+
+
+def bmesh_box(bm, size):
+    """Reference bmesh box, as the geometry modules used to build it."""
+    bmesh.ops.create_cube(bm, size=1.0)
+    bmesh.ops.scale(bm, vec=size, verts=bm.verts)
+
+
+def bmesh_bracket(bm, length=0.6, height=0.3, thickness=0.1):
+    """Reference bmesh bracket: per-vertex creation plus face extrusion."""
+    verts = [bm.verts.new((0, 0, 0)), bm.verts.new((length, 0, 0)), bm.verts.new((0, 0, -height))]
+    face = bm.faces.new(verts)
+    extruded = bmesh.ops.extrude_face_region(bm, geom=[face])
+    extruded_verts = [v for v in extruded['geom'] if isinstance(v, bmesh.types.BMVert)]
+    bmesh.ops.translate(bm, vec=(0, thickness, 0), verts=extruded_verts)
+
+
+def bmesh_crown(bm, width=2.2, height=0.15, depth=0.1):
+    """Reference bmesh crown ovoid."""
+    bmesh.ops.create_uvsphere(bm, u_segments=16, v_segments=8, radius=1.0)
+    bmesh.ops.scale(bm, vec=(width, depth, height), verts=bm.verts)
+
+
+def bmesh_reference_components(count):
+    """Build count shelf/bracket/backing/crown sets with per-element bmesh ops."""
+    objects = []
+    for i in range(count):
+        objects.append(bmesh_object(f"RefShelf_{i}", lambda bm: bmesh_box(bm, (2.0, 0.6, 0.1))))
+        objects.append(bmesh_object(f"RefBracket_{i}", bmesh_bracket))
+        objects.append(bmesh_object(f"RefBacking_{i}", lambda bm: bmesh_box(bm, (2.2, 0.02, 1.5))))
+        objects.append(bmesh_object(f"RefCrown_{i}", bmesh_crown))
+    return objects
+
+
+def bulk_components(count):
+    """Build count shelf/bracket/backing/crown sets with the geometry modules."""
+    objects = []
+    for i in range(count):
+        objects.append(create_main_shelf(f"BulkShelf_{i}", width=2.0, height=0.1, depth=0.6))
+        objects.append(create_bracket_support(f"BulkBracket_{i}"))
+        objects.append(create_backing_plane(f"BulkBacking_{i}"))
+        objects.append(create_crown_topper(f"BulkCrown_{i}"))
+    return objects
+
+
+def pegboard(width, height, spacing):
+    """Create a backing plane and perforate it."""
+    backing = create_backing_plane("BenchPegboard", width=width, height=height)
+    create_pegboard_holes(backing, width=width, height=height, hole_spacing=spacing,
+                          hole_diameter=spacing * 0.4)
+    return backing
+
+
+def as_list(result):
+    """Normalize a generator's return value to a list of objects."""
+    return result if isinstance(result, list) else [result]
+
+
+def benchmark_cases():
+    """
+    Build the benchmark cases.
+
+    Returns:
+        dict: Mapping of case name to a zero-argument callable returning the
+            objects it created
+    """
+    cases = {
+        'create_main_shelf': lambda: create_main_shelf("BenchShelf", width=2.0, height=0.1, depth=0.6),
+        'create_bracket_support': lambda: create_bracket_support("BenchBracket"),
+        'create_crown_topper': lambda: create_crown_topper("BenchCrown"),
+        'create_backing_plane': lambda: create_backing_plane("BenchBacking"),
+    }
+
+    for count in BRACKET_COUNTS:
+        cases[f'create_brackets[bracket_count={count}]'] = (
+            lambda count=count: create_brackets(bracket_placements(count)))
+
+    for segments in MOLDING_SEGMENTS:
+        cases[f'create_decorative_molding[segments={segments}]'] = (
+            lambda segments=segments: create_decorative_molding("BenchMolding", segments=segments))
+
+    for width, height, spacing in PEGBOARD_SIZES:
+        holes = int(width / spacing) * int(height / spacing)
+        cases[f'create_pegboard_holes[holes={holes}]'] = (
+            lambda width=width, height=height, spacing=spacing: pegboard(width, height, spacing))
+
+    for count in COMPONENTS_PER_PROCESS:
+        cases[f'components_per_process[bulk,sets={count}]'] = lambda count=count: bulk_components(count)
+        cases[f'components_per_process[bmesh,sets={count}]'] = (
+            lambda count=count: bmesh_reference_components(count))
+
+    return cases
+
+
+def bracket_placements(count):
+    """Solve the bracket placements of the default shelf with count brackets."""
+    params = merge_params(DEFAULT_ASSEMBLY_PARAMS, {'brackets': {'count': count}})
+    return solve_assembly_layout(params).placements('bracket')
+
+
+def run_benchmarks(repeats=5, selected=None):
+    """
+    Run the benchmark cases.
+
+    Args:
+        repeats (int): Timed runs per case
+        selected (str): Only run cases whose name contains this text
+
+    Returns:
+        dict: Timing results keyed by case name
+    """
+    clear_scene()
+
+    results = {}
+    for name, func in benchmark_cases().items():
+        if selected and selected not in name:
+            continue
+        results[name] = time_case(func, repeats=repeats,
+                                  teardown=lambda objects: remove_objects(as_list(objects)))
+        print(f"{name}: {results[name]['median_seconds'] * 1000:.3f}ms")
+    return results
+
+
+def parse_args(argv=None):
+    """
+    Parse script arguments (the ones after ``--`` on the Blender command line).
+
+    Args:
+        argv (list): Full argument list (default: sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    argv = sys.argv if argv is None else argv
+    script_args = argv[argv.index('--') + 1:] if '--' in argv else []
+
+    parser = argparse.ArgumentParser(prog="bench_geometry.py", description="Benchmark geometry modules")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown as a fraction of the baseline (default: 0.25)")
+    parser.add_argument('--repeats', type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument('--filter', help="Only run cases whose name contains this text")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the results as the new baseline")
+    parser.add_argument('--require-baseline', action='store_true',
+                        help="Fail when there is no baseline instead of only reporting timings")
+    parser.add_argument('--output', help="Also write the raw results as JSON to this path")
+    return parser.parse_args(script_args)
+
+
+def main():
+    """Main function - entry point for the script."""
+    print("=== Geometry Benchmarks ===")
+    args = parse_args()
+
+    results = run_benchmarks(repeats=args.repeats, selected=args.filter)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, metadata={'blender': bpy.app.version_string})
+        print(f"Saved baseline: {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        if args.require_baseline:
+            sys.exit(1)
+        return
+
+    comparisons = compare_to_baseline(results, baseline, tolerance=args.tolerance)
+    print_comparisons(comparisons)
+
+    regressions = [c['case'] for c in comparisons if c['status'] == 'regression']
+    if regressions:
+        print(f"Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Memory Growth Check
+
+Generates a colour sweep of shelf assemblies in one headless Blender process,
+the way a batch run (fresh scene per variant) and the daemon (one shared
+component graph) do, purging after every variant. Every variant uses new
+colours, so each one asks the material library for new materials; after the
+purge, bpy.data must be back where it was after the first variant.
+
+Usage:
+    blender --background --factory-startup --python blender/benchmarks/bench_memory.py
+    blender --background --factory-startup --python blender/benchmarks/bench_memory.py -- --variants 50
+
+The run exits with status 1 when a bpy.data collection grows across the
+sweep or the leak alarm (utils/memory.py) goes off.
+"""
+
+import argparse
+import colorsys
+import json
+import os
+import sys
+
+# Add blender directory to Python path for module imports
+blender_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if blender_dir not in sys.path:
+    sys.path.append(blender_dir)
+
+from gen_shelf_modular import create_shelf_graph, generate_complete_shelf_assembly
+from utils.jobs import resolve_variant_params
+from utils.memory import MemoryMonitor, memory_snapshot, purge_orphans
+from utils.scene_utils import clear_scene
+
+
+def sweep_params(index, count):
+    """Assembly parameters with distinct colours (and a textured pegboard variation)."""
+    colors = [colorsys.hsv_to_rgb((index / count + offset) % 1.0, 0.6, 0.7) + (1.0,)
+              for offset in (0.0, 0.25, 0.5, 0.75)]
+    return resolve_variant_params({
+        'name': f"sweep_{index:03d}",
+        'shelf': {'color': colors[0]},
+        'brackets': {'color': colors[1]},
+        'backing': {'color': colors[2], 'pegboard': 'texture'},
+        'crown': {'color': colors[3]},
+    })
+
+
+def run_sweep(count, shared_graph=False, window=5):
+    """
+    Generate count colour variants and record memory after every purge.
+
+    Args:
+        count (int): Number of variants
+        shared_graph (bool): Keep one component graph (and scene) across
+            variants, as the daemon does
+        window (int): Leak alarm window
+
+    Returns:
+        dict: Per-variant datablock counts, growth after the first variant
+            and the leak alarms
+    """
+    clear_scene()
+    graph = create_shelf_graph() if shared_graph else None
+    monitor = MemoryMonitor(window)
+    counts = []
+    for index in range(count):
+        before = memory_snapshot()
+        generate_complete_shelf_assembly(sweep_params(index, count), graph=graph)
+        purge_orphans()
+        after = memory_snapshot()
+        monitor.record(f"sweep_{index:03d}", before, after)
+        counts.append(after['datablocks'])
+    growth = {name: counts[-1][name] - counts[0][name] for name in counts[0]
+              if counts[-1][name] != counts[0][name]}
+    if graph is not None:
+        graph.clear()
+    clear_scene()
+    return {'counts': counts, 'growth': growth, 'alarms': monitor.alarms}
+
+
+def parse_args(argv=None):
+    """
+    Parse script arguments (the ones after ``--`` on the Blender command line).
+
+    Args:
+        argv (list): Full argument list (default: sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    argv = sys.argv if argv is None else argv
+    script_args = argv[argv.index('--') + 1:] if '--' in argv else []
+
+    parser = argparse.ArgumentParser(prog="bench_memory.py", description="Check memory growth over a colour sweep")
+    parser.add_argument('--variants', type=int, default=20, help="Colour variants per sweep (default: 20)")
+    parser.add_argument('--output', help="Also write the per-variant counts as JSON to this path")
+    return parser.parse_args(script_args)
+
+
+def main():
+    """Main function - entry point for the script."""
+    print("=== Memory Growth Check ===")
+    args = parse_args()
+
+    results = {
+        'fresh_scene': run_sweep(args.variants),
+        'shared_graph': run_sweep(args.variants, shared_graph=True),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    for mode, result in results.items():
+        first, last = result['counts'][0], result['counts'][-1]
+        print(f"{mode}: materials {first['materials']} -> {last['materials']}, "
+              f"meshes {first['meshes']} -> {last['meshes']} over {args.variants} variants")
+        if result['growth'] or result['alarms']:
+            print(f"{mode}: bpy.data grew across the sweep: {result['growth'] or result['alarms']}")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
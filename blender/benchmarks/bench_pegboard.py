@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Pegboard Mode Benchmark
+
+Compares the two pegboard modes side by side: real hole geometry
+(pegboard_arrays) and the plain slab with an alpha mask and normal map
+(texture mode). For each board size it reports the holes each mode shows,
+triangle count, GLB size and build plus GLB serialization time, and exits
+with status 1 when the two modes show a different number of holes. Runs
+with plain Python and NumPy, no Blender needed.
+
+Usage:
+    python3 blender/benchmarks/bench_pegboard.py
+    python3 blender/benchmarks/bench_pegboard.py --resolution 128 --output pegboard.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add blender directory to Python path for module imports
+blender_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if blender_dir not in sys.path:
+    sys.path.append(blender_dir)
+
+from geometry.mesh_core import (pegboard_arrays, pegboard_hole_centers, pegboard_texture_hole_count,
+                                pegboard_texture_mapping, pegboard_texture_slab_arrays, pegboard_uvs,
+                                render_arrays)
+from utils.glb_writer import GLBWriter
+from utils.textures import encode_png, pegboard_alpha_tile, pegboard_normal_tile
+from benchmarks.harness import time_case
+
+COLOR = (0.7, 0.65, 0.55, 1.0)
+
+# (width, height, hole_spacing): the default backing and a full-height wall
+# panel with more than 10,000 holes
+PEGBOARD_SIZES = [(2.2, 1.5, 0.1), (2.2, 2.4, 0.02)]
+
+
+def geometry_glb(width, height, spacing, thickness=0.02):
+    """Build a GLB of the backing with real holes; returns (GLB, triangles, holes)."""
+    arrays = render_arrays(pegboard_arrays(width, height, thickness, spacing, spacing * 0.4))
+    writer = GLBWriter()
+    material = writer.add_material("Backing", color=COLOR, roughness=0.8)
+    writer.add_node("Backing", mesh=writer.add_mesh("Backing", [{'arrays': arrays, 'material': material}]))
+    centers_x, centers_z = pegboard_hole_centers(width, height, spacing)
+    return writer.to_bytes(), len(arrays['indices']) // 3, len(centers_x) * len(centers_z)
+
+
+def texture_glb(width, height, spacing, resolution, thickness=0.02):
+    """Build a GLB of the plain backing slab with pegboard textures; returns (GLB, triangles, holes)."""
+    mapping = pegboard_texture_mapping(width, height, spacing, spacing * 0.4)
+    arrays = render_arrays(pegboard_texture_slab_arrays(width, height, thickness, spacing))
+    arrays['uvs'] = pegboard_uvs(arrays['positions'], mapping)
+
+    writer = GLBWriter()
+    alpha = writer.add_texture(writer.add_image(
+        encode_png(pegboard_alpha_tile(resolution, mapping['hole_fraction'])), "PegboardAlpha"))
+    normal = writer.add_texture(writer.add_image(
+        encode_png(pegboard_normal_tile(resolution, mapping['hole_fraction'])), "PegboardNormal"))
+    material = writer.add_material("Backing", color=COLOR, roughness=0.8, base_color_texture=alpha,
+                                   normal_texture=normal, alpha_mode='MASK')
+    writer.add_node("Backing", mesh=writer.add_mesh("Backing", [{'arrays': arrays, 'material': material}]))
+    return writer.to_bytes(), len(arrays['indices']) // 3, pegboard_texture_hole_count(arrays['uvs'], mapping)
+
+
+def run_benchmarks(repeats=5, resolution=64):
+    """
+    Measure both pegboard modes for every board size.
+
+    Args:
+        repeats (int): Timed runs per case
+        resolution (int): Texture tile size in texels
+
+    Returns:
+        list: One result dict per board size and mode
+    """
+    results = []
+    for width, height, spacing in PEGBOARD_SIZES:
+        builders = {
+            'geometry': lambda: geometry_glb(width, height, spacing),
+            'texture': lambda: texture_glb(width, height, spacing, resolution),
+        }
+        for mode, build in builders.items():
+            glb, triangles, holes = build()
+            timing = time_case(build, repeats=repeats)
+            results.append({
+                'mode': mode,
+                'width': width,
+                'height': height,
+                'hole_spacing': spacing,
+                'holes': holes,
+                'triangles': triangles,
+                'glb_bytes': len(glb),
+                'median_seconds': timing['median_seconds'],
+            })
+    return results
+
+
+def print_results(results):
+    """Print the side-by-side comparison table."""
+    print(f"{'board':<16} {'holes':>7} {'mode':<9} {'triangles':>10} {'GLB bytes':>11} {'build ms':>9}")
+    for r in results:
+        board = f"{r['width']}x{r['height']}@{r['hole_spacing']}"
+        print(f"{board:<16} {r['holes']:>7} {r['mode']:<9} {r['triangles']:>10} "
+              f"{r['glb_bytes']:>11} {r['median_seconds'] * 1000:>9.2f}")
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(prog="bench_pegboard.py",
+                                     description="Compare geometry and texture pegboard modes")
+    parser.add_argument('--repeats', type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument('--resolution', type=int, default=64,
+                        help="Texture tile size in texels (default: 64)")
+    parser.add_argument('--output', help="Also write the results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main function - entry point for the script."""
+    print("=== Pegboard Mode Benchmark ===")
+    args = parse_args()
+
+    results = run_benchmarks(repeats=args.repeats, resolution=args.resolution)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    holes = {}
+    for r in results:
+        holes.setdefault((r['width'], r['height'], r['hole_spacing']), {})[r['mode']] = r['holes']
+    mismatched = [board for board, counts in holes.items() if len(set(counts.values())) > 1]
+    if mismatched:
+        print(f"Pegboard modes show different hole counts for: {mismatched}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark Harness Module
+
+Timing, baseline storage and regression checks shared by the benchmark
+scripts. This module does not depend on bpy.
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+
+
+def time_case(func, repeats=5, setup=None, teardown=None):
+    """
+    Time a benchmark case.
+
+    Args:
+        func (callable): Code under test; its return value is passed to teardown
+        repeats (int): Number of timed runs
+        setup (callable): Called before every run, untimed
+        teardown (callable): teardown(result) called after every run, untimed
+
+    Returns:
+        dict: Median, minimum and maximum seconds over the runs
+    """
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+        if teardown is not None:
+            teardown(result)
+    return {
+        'median_seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'max_seconds': max(timings),
+        'repeats': repeats,
+    }
+
+
+def load_baseline(filepath):
+    """
+    Load stored baseline results.
+
+    Args:
+        filepath (str): Baseline JSON path
+
+    Returns:
+        dict: Baseline results keyed by case name (empty if there is no baseline)
+    """
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, 'r') as f:
+        return json.load(f).get('results', {})
+
+
+def save_baseline(filepath, results, metadata=None):
+    """
+    Store results as the new baseline.
+
+    Args:
+        filepath (str): Baseline JSON path
+        results (dict): Results keyed by case name
+        metadata (dict): Extra information about the recording environment
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    baseline = {
+        'metadata': dict({'machine': platform.machine(), 'python': platform.python_version()},
+                         **(metadata or {})),
+        'results': results,
+    }
+    with open(filepath, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25, metric='median_seconds'):
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (dict): Results keyed by case name
+        baseline (dict): Baseline results keyed by case name
+        tolerance (float): Allowed slowdown as a fraction of the baseline
+        metric (str): Result field to compare
+
+    Returns:
+        list: One comparison record per case, with status 'ok', 'regression',
+            'improved' or 'new'
+    """
+    comparisons = []
+    for case, result in results.items():
+        value = result[metric]
+        reference = baseline.get(case, {}).get(metric)
+        record = {'case': case, 'value': value, 'baseline': reference, 'ratio': None}
+        if reference is None or reference <= 0:
+            record['status'] = 'new'
+        else:
+            record['ratio'] = value / reference
+            if record['ratio'] > 1.0 + tolerance:
+                record['status'] = 'regression'
+            elif record['ratio'] < 1.0 - tolerance:
+                record['status'] = 'improved'
+            else:
+                record['status'] = 'ok'
+        comparisons.append(record)
+    return comparisons
+
+
+def print_comparisons(comparisons, unit_scale=1000.0, unit='ms'):
+    """
+    Print a comparison table.
+
+    Args:
+        comparisons (list): Records from compare_to_baseline()
+        unit_scale (float): Multiplier applied to values for display
+        unit (str): Display unit
+    """
+    width = max([len(c['case']) for c in comparisons] + [len('Case')])
+    print(f"{'Case':<{width}}  {'Value':>12}  {'Baseline':>12}  {'Ratio':>7}  Status")
+    for c in comparisons:
+        baseline = f"{c['baseline'] * unit_scale:.3f}{unit}" if c['baseline'] is not None else '-'
+        ratio = f"{c['ratio']:.2f}x" if c['ratio'] is not None else '-'
+        print(f"{c['case']:<{width}}  {c['value'] * unit_scale:>10.3f}{unit}  {baseline:>12}  "
+              f"{ratio:>7}  {c['status']}")
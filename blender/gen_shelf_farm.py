@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Shelf Generation Farm
+
+Fans a batch of assembly variants out across several headless Blender worker
+processes. Blender's Python is single-threaded, so this orchestrator runs with
+plain CPython and keeps one `blender --background` process per core busy.
+
+Usage:
+    python blender/gen_shelf_farm.py --jobs blender/jobs/example_variants.json --workers 4
+
+The variants are split into small chunks that workers pull from a shared queue,
+so a slow chunk does not leave the other cores idle. Failed variants are
+retried in a fresh worker, and every worker's timing report is merged into a
+single manifest.json in the output directory. Variants already in the build
+cache are restored before any worker is launched.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Add blender directory to Python path for module imports
+blender_dir = os.path.dirname(os.path.abspath(__file__))
+if blender_dir not in sys.path:
+    sys.path.append(blender_dir)
+
+from utils.jobs import load_job_file
+from utils.build_cache import (BuildCache, DEFAULT_CACHE_DIR, compute_cache_key,
+                               detect_blender_version, hash_source_files)
+
+GENERATOR_SCRIPT = os.path.join(blender_dir, "gen_shelf_modular.py")
+
+
+def split_into_chunks(variants, chunk_size):
+    """
+    Split variants into chunks of at most chunk_size.
+
+    Args:
+        variants (list): Assembly parameter dicts
+        chunk_size (int): Maximum variants per chunk
+
+    Returns:
+        list: List of variant lists
+    """
+    return [variants[i:i + chunk_size] for i in range(0, len(variants), chunk_size)]
+
+
+def run_worker(blender_bin, variants, output_dir, formats, work_dir, label, cache_dir=None):
+    """
+    Generate a chunk of variants in one headless Blender process.
+
+    Args:
+        blender_bin (str): Blender executable
+        variants (list): Assembly parameter dicts for this chunk
+        output_dir (str): Output directory for exported files
+        formats (list): Export formats
+        work_dir (str): Directory for the worker's job file, report and log
+        label (str): Unique label for this worker run
+        cache_dir (str): Build cache directory, or None to disable the cache
+
+    Returns:
+        dict: Worker run summary with per-variant results keyed by name
+    """
+    job_path = os.path.join(work_dir, f"{label}.json")
+    report_path = os.path.join(work_dir, f"{label}_report.json")
+    log_path = os.path.join(work_dir, f"{label}.log")
+
+    # Labels restart with every run; a report left in a reused work dir
+    # must not stand in for a worker that crashed before writing its own
+    for path in (report_path, log_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    with open(job_path, 'w') as f:
+        json.dump({'formats': formats, 'variants': variants}, f)
+
+    command = [
+        blender_bin, "--background", "--factory-startup",
+        "--python", GENERATOR_SCRIPT, "--",
+        "--jobs", job_path, "--output-dir", output_dir, "--report", report_path,
+    ]
+    command += ["--cache-dir", cache_dir] if cache_dir else ["--no-cache"]
+
+    start = time.perf_counter()
+    launch_error = None
+    with open(log_path, 'w') as log:
+        try:
+            returncode = subprocess.call(command, stdout=log, stderr=subprocess.STDOUT)
+        except OSError as e:
+            # e.g. a missing or non-executable Blender binary
+            returncode = None
+            launch_error = f"worker {label} could not start {blender_bin}: {e}"
+            log.write(f"{launch_error}\n")
+    wall_seconds = time.perf_counter() - start
+
+    results = {}
+    if os.path.exists(report_path):
+        with open(report_path, 'r') as f:
+            for result in json.load(f):
+                results[result['name']] = result
+
+    # Anything the worker did not report on (e.g. a crash) counts as failed
+    for params in variants:
+        if params['name'] not in results:
+            results[params['name']] = {
+                'name': params['name'],
+                'exports': {},
+                'error': launch_error or f"worker {label} exited with code {returncode} without a result",
+            }
+
+    return {
+        'label': label,
+        'returncode': returncode,
+        'wall_seconds': wall_seconds,
+        'log': log_path,
+        'results': results,
+    }
+
+
+def restore_cached_variants(variants, output_dir, formats, cache, blender_version):
+    """
+    Restore every variant that is already in the build cache.
+
+    Args:
+        variants (list): Complete assembly parameter dicts
+        output_dir (str): Output directory for exported files
+        formats (list): Export formats
+        cache (BuildCache): Build cache
+        blender_version (str): Blender version for cache keys
+
+    Returns:
+        dict: Results for the restored variants keyed by name
+    """
+    source_hash = hash_source_files()
+    restored = {}
+    for params in variants:
+        key = compute_cache_key(params, formats, blender_version, source_hash)
+        exports = cache.restore(key, output_dir, params['name'])
+        if exports is not None:
+            restored[params['name']] = {
+                'name': params['name'],
+                'exports': exports,
+                'error': None,
+                'cached': True,
+                'attempts': 0,
+                'worker': None,
+            }
+    return restored
+
+
+def run_farm(variants, output_dir, formats, workers, blender_bin="blender",
+             chunk_size=None, retries=2, work_dir=None, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Generate variants across a pool of headless Blender workers.
+
+    Args:
+        variants (list): Complete assembly parameter dicts
+        output_dir (str): Output directory for exported files
+        formats (list): Export formats
+        workers (int): Number of concurrent Blender processes
+        blender_bin (str): Blender executable
+        chunk_size (int): Variants per worker run (default: about two chunks per worker)
+        retries (int): How many times to retry failed variants
+        work_dir (str): Directory for worker job files and logs (default: temporary)
+        cache_dir (str): Build cache directory, or None to disable the cache
+
+    Returns:
+        dict: Merged manifest of all variant results and worker runs
+    """
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+
+    final_results = {}
+    if cache_dir:
+        blender_version = detect_blender_version(blender_bin)
+        if blender_version is not None:
+            final_results = restore_cached_variants(variants, output_dir, formats,
+                                                    BuildCache(cache_dir), blender_version)
+            print(f"Restored {len(final_results)} of {len(variants)} variants from build cache")
+    pending = [params for params in variants if params['name'] not in final_results]
+
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(pending) / (workers * 2)))
+
+    by_name = {params['name']: params for params in variants}
+    attempts = {name: 0 for name in by_name}
+    worker_runs = []
+    if pending:
+        work_dir = work_dir or tempfile.mkdtemp(prefix="shelf_farm_")
+        os.makedirs(work_dir, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        labels = itertools.count(1)
+
+        def submit(chunk):
+            label = f"chunk{next(labels):04d}"
+            for params in chunk:
+                attempts[params['name']] += 1
+            return pool.submit(run_worker, blender_bin, chunk, output_dir, formats,
+                               work_dir, label, cache_dir)
+
+        running = set()
+        for chunk in split_into_chunks(pending, chunk_size):
+            running.add(submit(chunk))
+
+        # Retries are resubmitted as soon as a worker finishes, so the pool
+        # never waits on the slowest chunk before reprocessing failures
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                run = future.result()
+                worker_runs.append({k: v for k, v in run.items() if k != 'results'})
+                print(f"Worker {run['label']} finished in {run['wall_seconds']:.2f}s "
+                      f"(exit code {run['returncode']})")
+
+                retry = []
+                for name, result in run['results'].items():
+                    result['attempts'] = attempts[name]
+                    result['worker'] = run['label']
+                    final_results[name] = result
+                    if result['error'] is not None and attempts[name] <= retries:
+                        retry.append(by_name[name])
+
+                if retry:
+                    print(f"Retrying {len(retry)} failed variants from {run['label']}...")
+                    for chunk in split_into_chunks(retry, chunk_size):
+                        running.add(submit(chunk))
+
+    wall_seconds = time.perf_counter() - start
+    ordered = [final_results[params['name']] for params in variants]
+
+    return {
+        'output_dir': output_dir,
+        'formats': formats,
+        'workers': workers,
+        'chunk_size': chunk_size,
+        'wall_seconds': wall_seconds,
+        'variant_seconds': sum(r.get('total_seconds', 0.0) for r in ordered),
+        'cached': sum(1 for r in ordered if r.get('cached')),
+        'succeeded': sum(1 for r in ordered if r['error'] is None),
+        'failed': sum(1 for r in ordered if r['error'] is not None),
+        'variants': ordered,
+        'worker_runs': worker_runs,
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Generate shelf variants across Blender workers")
+    parser.add_argument('--jobs', required=True, help="JSON job file listing assembly variants")
+    parser.add_argument('--output-dir', help="Output directory (overrides the job file)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of concurrent Blender processes (default: CPU count)")
+    parser.add_argument('--blender', default=os.environ.get('BLENDER_BIN', 'blender'),
+                        help="Blender executable (default: $BLENDER_BIN or 'blender')")
+    parser.add_argument('--chunk-size', type=int, help="Variants per worker run")
+    parser.add_argument('--retries', type=int, default=2, help="Retries for failed variants")
+    parser.add_argument('--work-dir', help="Directory for worker job files and logs")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Build cache directory")
+    parser.add_argument('--no-cache', action='store_true', help="Always regenerate every variant")
+    parser.add_argument('--manifest', help="Manifest path (default: <output-dir>/manifest.json)")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main function - entry point for the script."""
+    print("=== Blockbuster Shelf Generation Farm ===")
+    args = parse_args()
+
+    job = load_job_file(args.jobs)
+    output_dir = (args.output_dir or job['output_dir']
+                  or os.environ.get('BLENDER_OUTPUT_DIR', '/app/steamvr-addon/models'))
+    output_dir = os.path.abspath(output_dir)
+
+    print(f"Generating {len(job['variants'])} variants with {args.workers} workers...")
+    manifest = run_farm(job['variants'], output_dir, job['formats'], args.workers,
+                        blender_bin=args.blender, chunk_size=args.chunk_size,
+                        retries=args.retries, work_dir=args.work_dir,
+                        cache_dir=None if args.no_cache else args.cache_dir)
+
+    manifest_path = args.manifest or os.path.join(output_dir, "manifest.json")
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"{manifest['succeeded']} succeeded, {manifest['failed']} failed in "
+          f"{manifest['wall_seconds']:.2f}s wall "
+          f"({manifest['variant_seconds']:.2f}s of Blender variant time)")
+    print(f"Manifest: {manifest_path}")
+
+    if manifest['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
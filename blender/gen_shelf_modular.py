@@ -4,129 +4,1048 @@ Blender Shelf Generation Script
 
 Procedurally generates a 3D blockbuster-style shelf assembly for SteamVR environments.
 This script orchestrates the creation of all shelf components using modular geometry modules.
+
+Usage:
+    blender --background --python blender/gen_shelf_modular.py
+    blender --background --python blender/gen_shelf_modular.py -- --jobs variants.json
+
+With ``--jobs``, every variant in the job file is generated and exported in a
+single Blender process (see utils/jobs.py for the job file format).
+
+With ``--store``, a whole store is generated from a store layout JSON file
+(the client's StoreLayoutConfig, see utils/store_layout.py): every shelf unit
+type is generated once and placed many times, so the export holds its
+geometry once plus one transform per unit.
+
+Exports are kept in a content-addressed build cache (see utils/build_cache.py).
+When nothing changed, the script restores every export from the cache and can
+even run under plain Python without Blender:
+    python blender/gen_shelf_modular.py
 """
 
+import argparse
+import json
 import sys
 import os
+import time
 
 # Add blender directory to Python path for module imports
 blender_dir = os.path.dirname(os.path.abspath(__file__))
 if blender_dir not in sys.path:
     sys.path.append(blender_dir)
 
+from utils.jobs import (DEFAULT_ASSEMBLY_PARAMS, DEFAULT_EXPORT_FORMATS, EXPORT_COMPRESSION_MODES,
+                        EXPORT_LOD_MODES, load_job_file, merge_params)
+from geometry.lod import DEFAULT_LOD_ERRORS
+from geometry.layout import Placement, solve_assembly_layout, validate_layout, with_placements
+from utils.compression import check_compression_tool, compress_glb, compression_report, quantization_bits
+from utils.quantization import validate_quantization
+from utils.component_graph import ComponentGraph, ComponentNode
+from utils.instrumentation import PipelineProfiler, active_profiler, count_draw_calls, geometry_stats, stage
+from utils.store_layout import (TILING_MODES, assign_tiles, load_store_layout, solve_store_layout,
+                                store_manifest, validate_store)
+from utils.budgets import (BUDGET_ACTIONS, BUDGET_PROFILE_NAMES, check_budget, downgrade_params,
+                           format_violations, resolve_budget)
+from utils.build_cache import (BuildCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES,
+                               compute_cache_key, detect_blender_version, hash_file, hash_source_files)
+
+# Blender modules are optional until a variant actually has to be generated,
+# so fully cached runs do not need bpy at all
+BLENDER_IMPORT_ERROR = None
 try:
     import bpy
-    from utils.scene_utils import setup_scene, create_collection, move_objects_to_collection, export_shelf_assembly
+    from mathutils import Matrix
+    from utils.scene_utils import (setup_scene, clear_scene, create_collection, move_objects_to_collection,
+                                   export_shelf_assembly, remove_objects, apply_placement)
+    from utils.glb_export import render_vertex_count
+    from utils.static_batch import create_static_batch, static_batch_groups
+    from utils.lod_levels import create_lod_levels, lod_manifest
+    from utils.memory import DEFAULT_LEAK_WINDOW, MemoryMonitor, memory_snapshot, purge_orphans
     from geometry.shelf import create_main_shelf, add_shelf_material
-    from geometry.brackets import create_bracket_support, position_brackets_on_shelf, add_bracket_material
-    from geometry.backing import create_backing_plane, position_backing_behind_shelf, add_backing_material
-    from geometry.crown import create_crown_topper, position_crown_above_backing, add_crown_material
+    from geometry.brackets import create_brackets, add_bracket_material
+    from geometry.backing import (create_backing_plane, add_backing_material,
+                                  create_pegboard_holes, apply_pegboard_texture)
+    from geometry.crown import create_crown_topper, add_crown_material
 except ImportError as e:
-    print(f"Error importing Blender modules: {e}")
-    print("This script must be run within Blender or with Blender's Python interpreter")
-    sys.exit(1)
+    bpy = None
+    BLENDER_IMPORT_ERROR = e
+
+# Collection holding the placed units of a store; it stays out of the scene
+# while unit types are generated, since setup_scene() clears the scene
+STORE_COLLECTION = "ShelfStore"
+
+# File extension written by each export format
+EXPORT_EXTENSIONS = {
+    'FBX': 'fbx',
+    'OBJ': 'obj',
+    'GLTF': 'glb',
+    'GLB': 'glb',
+}
+
+
+def placements(params):
+    """Get the solved placements of a component section (see with_placements())."""
+    return [Placement(**placement) for placement in params['placements']]
+
+
+def build_main_shelf(shelf_params, dependencies):
+    """Build the main shelf component (extended depth for better proportions)."""
+    print("Creating main shelf...")
+    placement = placements(shelf_params)[0]
+    width, height, depth = placement.size
+    with stage('create_main_shelf'):
+        main_shelf = create_main_shelf(placement.name, width=width, height=height, depth=depth)
+    apply_placement(main_shelf, placement)
+    with stage('add_shelf_material'):
+        add_shelf_material(main_shelf, color=shelf_params['color'])
+    return [main_shelf]
+
+
+def build_brackets(bracket_params, dependencies):
+    """Build the bracket supports under the main shelf."""
+    print("Creating bracket supports...")
+    with stage('create_brackets', count=bracket_params['count']):
+        brackets = create_brackets(placements(bracket_params))
+    for bracket in brackets:
+        with stage('add_bracket_material', object=bracket.name):
+            add_bracket_material(bracket, color=bracket_params['color'])
+    return brackets
+
+
+def build_backing(backing_params, dependencies):
+    """Build the backing plane behind the main shelf."""
+    print("Creating backing plane...")
+    placement = placements(backing_params)[0]
+    width, height, thickness = placement.size
+    with stage('create_backing_plane'):
+        backing = create_backing_plane(placement.name, width=width, height=height, thickness=thickness)
+    apply_placement(backing, placement)
+    with stage('add_backing_material'):
+        add_backing_material(backing, color=backing_params['color'])
+    if backing_params['pegboard'] == 'geometry':
+        with stage('create_pegboard_holes'):
+            create_pegboard_holes(backing, width=width, height=height, thickness=thickness,
+                                  hole_spacing=backing_params['hole_spacing'],
+                                  hole_diameter=backing_params['hole_diameter'])
+    elif backing_params['pegboard'] == 'texture':
+        with stage('apply_pegboard_texture'):
+            apply_pegboard_texture(backing, width=width, height=height, thickness=thickness,
+                                   hole_spacing=backing_params['hole_spacing'],
+                                   hole_diameter=backing_params['hole_diameter'],
+                                   resolution=backing_params['texture_resolution'])
+    return [backing]
+
+
+def build_crown(crown_params, dependencies):
+    """Build the decorative crown (centered on backing)."""
+    print("Creating decorative crown...")
+    placement = placements(crown_params)[0]
+    width, height, depth = placement.size
+    with stage('create_crown_topper'):
+        crown = create_crown_topper(placement.name, width=width, height=height, depth=depth)
+    apply_placement(crown, placement)
+    with stage('add_crown_material'):
+        add_crown_material(crown, color=crown_params['color'])
+    return [crown]
+
+
+def layout_signature(objects):
+    """
+    Summarize the placement of a component's objects.
+    
+    Dependents only need rebuilding when the signature changes (not, for
+    example, when only a color changes). Sizes are part of the solved
+    placements in every component's parameters, so the signature does not
+    evaluate bounding boxes.
+    """
+    return tuple(
+        (tuple(round(v, 6) for v in obj.location), tuple(round(v, 6) for v in obj.rotation_euler))
+        for obj in objects
+    )
 
 
-def generate_complete_shelf_assembly():
+def create_shelf_graph():
+    """
+    Create the component graph for a shelf assembly.
+    
+    Brackets and backing are positioned from the main shelf, and the crown
+    from the backing; the positions themselves come from the layout solver
+    (see geometry/layout.py).
+    
+    Returns:
+        ComponentGraph: Graph with the main_shelf, brackets, backing and crown components
+    """
+    graph = ComponentGraph()
+    graph.add_component(ComponentNode('main_shelf', build_main_shelf, remove_objects,
+                                      layout_signature, params_key='shelf'))
+    graph.add_component(ComponentNode('brackets', build_brackets, remove_objects,
+                                      layout_signature, dependencies=['main_shelf']))
+    graph.add_component(ComponentNode('backing', build_backing, remove_objects,
+                                      layout_signature, dependencies=['main_shelf']))
+    graph.add_component(ComponentNode('crown', build_crown, remove_objects,
+                                      layout_signature, dependencies=['backing']))
+    return graph
+
+
+def generate_complete_shelf_assembly(params=None, graph=None):
     """
     Generate a complete shelf assembly with all components.
     
+    Passing the same graph on every call makes generation incremental: only
+    components whose parameters changed, and the components positioned from
+    them, are regenerated.
+    
+    Args:
+        params (dict): Assembly parameters (default: DEFAULT_ASSEMBLY_PARAMS)
+        graph (ComponentGraph): Graph from create_shelf_graph() to update
+            (default: a new graph, which regenerates everything)
+    
     Returns:
-        dict: Dictionary containing all created objects organized by component type
+        dict: Dictionary containing all created objects organized by component type,
+            the solved AssemblyLayout under 'layout' and the names of the
+            regenerated components under 'rebuilt'
     """
+    params = params or DEFAULT_ASSEMBLY_PARAMS
+    
     print("Starting shelf generation...")
     
-    # Set up scene
-    setup_scene()
+    # Every transform is solved up front; components are created from it
+    with stage('solve_layout'):
+        layout = solve_assembly_layout(params)
+    for problem in validate_layout(layout):
+        print(f"WARNING: layout: {problem}")
+    
+    if graph is None or not graph.outputs:
+        graph = graph or create_shelf_graph()
+        # Set up scene
+        with stage('setup_scene'):
+            setup_scene()
     
     # Create collection for organization
     shelf_collection = create_collection("BlockbusterShelf")
     
+    with stage('build_components'):
+        rebuilt = graph.update(with_placements(params, layout))
+    
     # Dictionary to store all created objects
+    outputs = graph.outputs
     shelf_assembly = {
-        'main_shelf': None,
-        'brackets': [],
-        'backing': None,
-        'crown': None,
-        'all_objects': []
+        'main_shelf': outputs['main_shelf'][0],
+        'brackets': outputs['brackets'],
+        'backing': outputs['backing'][0],
+        'crown': outputs['crown'][0],
+        'all_objects': [obj for name in graph.nodes for obj in outputs[name]],
+        'components': {name: outputs[name] for name in graph.nodes},
+        'layout': layout,
+        'rebuilt': rebuilt,
     }
     
-    # 1. Create main shelf (extended depth for better proportions)
-    print("Creating main shelf...")
-    main_shelf = create_main_shelf("MainShelf", width=2.0, height=0.1, depth=0.6)
-    add_shelf_material(main_shelf, color=(0.5, 0.5, 0.5, 1.0))  # Gray color
-    shelf_assembly['main_shelf'] = main_shelf
-    shelf_assembly['all_objects'].append(main_shelf)
+    # Organize new objects in collection
+    print("Organizing objects...")
+    with stage('move_objects_to_collection'):
+        move_objects_to_collection([obj for name in rebuilt for obj in outputs[name]], shelf_collection)
     
-    # 2. Create bracket supports
-    print("Creating bracket supports...")
-    brackets = position_brackets_on_shelf(main_shelf, bracket_count=3)
-    # Apply gray material to all brackets
-    for bracket in brackets:
-        add_bracket_material(bracket, color=(0.5, 0.5, 0.5, 1.0))
-    shelf_assembly['brackets'] = brackets
-    shelf_assembly['all_objects'].extend(brackets)
+    print(f"Shelf generation complete! Rebuilt: {', '.join(rebuilt) or 'nothing'}")
+    return shelf_assembly
+
+
+def export_objects(objects, output_dir, basename, formats=None, options=None):
+    """
+    Export a set of objects in multiple formats.
     
-    # 3. Create backing plane
-    print("Creating backing plane...")
-    backing = create_backing_plane("Backing", width=2.2, height=1.5, thickness=0.02)
-    position_backing_behind_shelf(backing, main_shelf, offset=0.01)  # More flush
-    add_backing_material(backing, color=(0.7, 0.65, 0.55, 1.0))  # Darkish beige
-    shelf_assembly['backing'] = backing
-    shelf_assembly['all_objects'].append(backing)
+    Args:
+        objects (list): Objects to export
+        output_dir (str): Output directory for exported files
+        basename (str): File name (without extension) for the exported files
+        formats (list): Export formats (default: FBX, OBJ and GLTF)
+        options (dict): Export options (the 'export' assembly parameters);
+            with 'batching': 'static' the objects are exported as one merged,
+            world-space mesh per material; with 'lod': 'files' or 'msft' a
+            LOD chain is exported as well (see export_lod_levels())
+        
+    Returns:
+        dict: Mapping of each successfully exported format (and LOD output)
+            to its file path
+    """
+    options = options or {}
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
     
-    # 4. Create crown/topper (centered on backing)
-    print("Creating decorative crown...")
-    crown = create_crown_topper("Crown", width=2.2, height=0.15, depth=0.1)
-    position_crown_above_backing(crown, backing, height_offset=0.1)  # Centered on backing
-    add_crown_material(crown, color=(0.4, 0.4, 0.4, 1.0))  # Dark gray
-    shelf_assembly['crown'] = crown
-    shelf_assembly['all_objects'].append(crown)
+    batch = []
+    if options.get('batching') == 'static':
+        with stage('static_batch', objects=len(objects)):
+            batch = create_static_batch(objects, basename=basename)
+        draw_calls_before, draw_calls_after = count_draw_calls(objects), count_draw_calls(batch)
+        print(f"Static batch {basename}: {draw_calls_before} -> {draw_calls_after} draw calls")
+        profiler = active_profiler()
+        if profiler is not None:
+            profiler.record_export(basename, batching='static', draw_calls_before=draw_calls_before,
+                                   draw_calls_after=draw_calls_after)
     
-    # 5. Organize objects in collection
-    print("Organizing objects...")
-    move_objects_to_collection(shelf_assembly['all_objects'], shelf_collection)
+    source = batch or objects
+    lod_chain = options.get('lod', 'none') != 'none'
+    base_lod = options.get('base_lod', 0)
+    levels = None
+    if lod_chain or base_lod > 0:
+        # A budget downgrade exports from a coarser level and builds the
+        # chain from there
+        errors = list(options.get('lod_errors', DEFAULT_LOD_ERRORS))[base_lod:]
+        with stage('lod', objects=len(source)):
+            levels = create_lod_levels(source, errors if lod_chain else errors[:1])
     
-    print("Shelf generation complete!")
-    return shelf_assembly
+    exported = {}
+    try:
+        for fmt in formats or DEFAULT_EXPORT_FORMATS:
+            # MSFT_lod is only written by the native GLB writer
+            embedded = levels if options.get('lod') == 'msft' and fmt.upper() == 'GLB' else None
+            filepath = export_file(levels[0]['objects'] if levels else source, output_dir, basename, fmt,
+                                   options, embedded)
+            if filepath is not None:
+                exported[fmt] = filepath
+        
+        if lod_chain:
+            exported.update(export_lod_levels(levels, output_dir, basename, formats, options, exported))
+    finally:
+        if levels is not None:
+            remove_objects([obj for level in levels for obj in level['objects'] if obj not in source])
+        # Batches only exist for export; the components stay editable
+        remove_objects(batch)
+    return exported
 
 
-def export_shelf_models(shelf_assembly, output_dir="/tmp"):
+def export_file(objects, output_dir, basename, fmt, options=None, lod_levels=None):
+    """
+    Export objects to one file.
+    
+    With export 'compression' set, .glb outputs are first exported without
+    compression to measure the saving, then compressed (see
+    utils/compression.py); the comparison is printed and recorded.
+    
+    Args:
+        objects (list): Objects to export
+        output_dir (str): Output directory
+        basename (str): File name without extension
+        fmt (str): Export format
+        options (dict): Export options (the 'export' assembly parameters)
+        lod_levels (list): LOD levels to embed (native GLB only)
+        
+    Returns:
+        str: The exported file path, or None if the export failed
+        
+    Raises:
+        ValueError: If a quantized GLB exceeds the position error bound
+        RuntimeError: If compression fails
+        
+        In both cases the file is removed, so no out-of-bound or
+        uncompressed output is left under the final name.
+    """
+    options = options or {}
+    extension = EXPORT_EXTENSIONS.get(fmt.upper(), fmt.lower())
+    filepath = os.path.join(output_dir, f"{basename}.{extension}")
+    compression = options.get('compression', 'none') if extension == 'glb' else 'none'
+    try:
+        # Never write through a hardlink into the build cache
+        if os.path.lexists(filepath):
+            os.remove(filepath)
+        with stage(f'export:{fmt.upper()}', path=filepath):
+            export_shelf_assembly(objects, filepath, fmt, dict(options, compression='none'),
+                                  lod_levels=lod_levels)
+    except Exception as e:
+        print(f"Failed to export {fmt}: {e}")
+        return None
+    
+    try:
+        if options.get('quantize') and fmt.upper() == 'GLB':
+            validate_quantized_export(objects, filepath, basename, options, lod_levels)
+        if compression != 'none':
+            uncompressed_bytes = os.path.getsize(filepath)
+            with stage(f'compress:{compression}', path=filepath):
+                if compression == 'draco' and fmt.upper() == 'GLTF':
+                    # Blender's glTF exporter has its own Draco encoder
+                    export_shelf_assembly(objects, filepath, fmt, options, lod_levels=lod_levels)
+                else:
+                    compress_glb(filepath, compression, quantization_bits(options))
+            report = compression_report(filepath, compression, uncompressed_bytes)
+            print(f"Compressed {fmt} ({compression}): {report['uncompressed_bytes']} -> "
+                  f"{report['compressed_bytes']} bytes, ~{report['estimated_decode_ms']} ms to decode")
+            profiler = active_profiler()
+            if profiler is not None:
+                profiler.record_export(f"{basename}:{fmt.upper()}", **report)
+    except Exception:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+    print(f"Exported {fmt}: {filepath}")
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.record_output(f"{basename}:{fmt.upper()}", filepath)
+    return filepath
+
+
+def validate_quantized_export(objects, filepath, basename, options, lod_levels=None):
+    """
+    Check a quantized GLB against a float export of the same objects.
+    
+    Args:
+        objects (list): Exported objects
+        filepath (str): The quantized GLB
+        basename (str): Label for the report
+        options (dict): Export options with 'max_position_error'
+        lod_levels (list): LOD levels embedded in the GLB
+        
+    Raises:
+        ValueError: If a vertex moved further than max_position_error
+    """
+    source = f"{filepath}.float.glb"
+    try:
+        export_shelf_assembly(objects, source, 'GLB', dict(options, quantize=False, compression='none'),
+                              lod_levels=lod_levels)
+        report = validate_quantization(filepath, source, options['max_position_error'])
+    finally:
+        if os.path.exists(source):
+            os.remove(source)
+    print(f"Quantized GLB {basename}: max position error {report['max_position_error'] * 1000:.3f} mm, "
+          f"max normal error {report['max_normal_error_degrees']:.2f} deg")
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.record_export(f"{basename}:GLB", quantization=report)
+    if not report['valid']:
+        raise ValueError(f"Quantized GLB exceeds the position error bound: {report}")
+
+
+def export_lod_levels(levels, output_dir, basename, formats=None, options=None, lod0_files=None):
+    """
+    Export the coarser LOD levels as separate files and write a LOD manifest.
+    
+    Level N is written as <basename>_lod<N> in every format; LOD0 is the
+    regular export. The manifest <basename>_lod.json lists each level's
+    error, triangle count, files and the distance beyond which the client
+    can switch to it (see geometry/lod.py for the viewer assumptions).
+    
+    Args:
+        levels (list): Levels from create_lod_levels()
+        output_dir (str): Output directory
+        basename (str): Name of the LOD0 files
+        formats (list): Export formats
+        options (dict): Export options (the 'export' assembly parameters)
+        lod0_files (dict): Format to path of the LOD0 exports
+        
+    Returns:
+        dict: Output key ('<FMT>_LOD<N>' and 'LOD_MANIFEST') to file path
+    """
+    exported = {}
+    files = [{fmt: os.path.basename(path) for fmt, path in (lod0_files or {}).items()}]
+    for index, level in enumerate(levels[1:], start=1):
+        level_files = {}
+        for fmt in formats or DEFAULT_EXPORT_FORMATS:
+            filepath = export_file(level['objects'], output_dir, f"{basename}_lod{index}", fmt, options)
+            if filepath is not None:
+                exported[f"{fmt}_LOD{index}"] = filepath
+                level_files[fmt] = os.path.basename(filepath)
+        files.append(level_files)
+    
+    manifest_path = os.path.join(output_dir, f"{basename}_lod.json")
+    if os.path.lexists(manifest_path):
+        os.remove(manifest_path)
+    manifest = lod_manifest(levels, files)
+    manifest['embedded'] = options.get('lod') == 'msft' if options else False
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    exported['LOD_MANIFEST'] = manifest_path
+    
+    summary = ', '.join(f"LOD{i} {level['triangles']}" for i, level in enumerate(levels))
+    print(f"LOD chain {basename} (triangles): {summary}")
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.record_export(basename, lod=options.get('lod') if options else None,
+                               lod_triangles=[level['triangles'] for level in levels],
+                               lod_switch_distances=[level['switch_distance'] for level in levels])
+    return exported
+
+
+def export_shelf_models(shelf_assembly, output_dir="/tmp", basename="blockbuster_shelf",
+                        formats=None, options=None):
     """
     Export shelf models in multiple formats.
     
     Args:
         shelf_assembly (dict): Dictionary of shelf objects
         output_dir (str): Output directory for exported files
+        basename (str): File name (without extension) for the exported files
+        formats (list): Export formats (default: FBX, OBJ and GLTF)
+        options (dict): Export options (the 'export' assembly parameters); set
+            'batching' to 'static' for one merged mesh per material, or use
+            export_shelf_components() to keep parts separate for editing
+        
+    Returns:
+        dict: Mapping of each successfully exported format to its file path
     """
     print(f"Exporting shelf models to {output_dir}...")
+    return export_objects(shelf_assembly['all_objects'], output_dir, basename, formats, options)
+
+
+def export_shelf_components(shelf_assembly, output_dir="/tmp", basename="blockbuster_shelf",
+                            formats=None, components=None, options=None):
+    """
+    Export each component of the assembly to its own files.
     
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    Args:
+        shelf_assembly (dict): Dictionary of shelf objects
+        output_dir (str): Output directory for exported files
+        basename (str): File name prefix; files are named <basename>_<component>
+        formats (list): Export formats (default: FBX, OBJ and GLTF)
+        components (list): Components to export (default: the ones rebuilt by
+            the last generate_complete_shelf_assembly() call)
+        options (dict): Export options (the 'export' assembly parameters)
+        
+    Returns:
+        dict: Mapping of component name to its format/file path mapping
+    """
+    if components is None:
+        components = shelf_assembly['rebuilt']
+    print(f"Exporting components to {output_dir}: {', '.join(components) or 'nothing'}")
     
-    # Export formats
-    formats = ['FBX', 'OBJ', 'GLTF']
+    return {
+        name: export_objects(shelf_assembly['components'][name], output_dir,
+                             f"{basename}_{name}", formats, options)
+        for name in components
+    }
+
+
+def remove_exports(exports):
+    """
+    Delete exported files and forget them.
     
-    for fmt in formats:
-        filepath = os.path.join(output_dir, f"blockbuster_shelf.{fmt.lower()}")
+    Args:
+        exports (dict): Output key to file path, or component name to such a
+            mapping (per-component exports); emptied in place
+    """
+    for path in exports.values():
+        if isinstance(path, dict):
+            remove_exports(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+    exports.clear()
+
+
+def measure_assembly(objects, params):
+    """
+    Measure what an assembly will cost the client, for budget checks.
+    
+    Counts what export will write: vertices as the client receives them
+    (flat-shaded meshes per face corner, after the export's vertex
+    deduplication), with static batching one draw call per batch, and with
+    a budget downgrade to a coarser LOD the decimated meshes.
+    
+    Args:
+        objects (list): The assembly's objects
+        params (dict): Complete assembly parameters
+        
+    Returns:
+        dict: 'triangles', 'vertices', 'materials' and 'draw_calls'
+    """
+    export = params['export']
+    totals = geometry_stats(objects)['totals']
+    measured = {metric: totals[metric] for metric in ('triangles', 'materials', 'draw_calls')}
+    measured['vertices'] = render_vertex_count(objects, deduplicate=export['optimize'])
+    if export['batching'] == 'static':
+        measured['draw_calls'] = len(static_batch_groups(objects))
+    if export.get('base_lod', 0) > 0:
+        levels = create_lod_levels(objects, [export['lod_errors'][export['base_lod']]])
+        measured.update(triangles=geometry_stats(levels[0]['objects'])['totals']['triangles'],
+                        vertices=render_vertex_count(levels[0]['objects'], deduplicate=export['optimize']))
+        remove_objects(levels[0]['objects'])
+    return measured
+
+
+def get_blender_version():
+    """
+    Get the Blender version used in build cache keys.
+    
+    Returns:
+        str: Version string such as '4.2.0', or None if Blender is unavailable
+    """
+    if bpy is not None:
+        return '.'.join(str(part) for part in bpy.app.version)
+    return detect_blender_version()
+
+
+def generate_variant(params, output_dir, formats=None, cache=None, blender_version=None,
+                     source_hash=None, graph=None, per_component=False, memory=None):
+    """
+    Generate and export one assembly variant, or restore it from the build cache.
+    
+    Args:
+        params (dict): Complete assembly parameters with a name
+        output_dir (str): Output directory for exported files
+        formats (list): Export formats (default: FBX, OBJ and GLTF)
+        cache (BuildCache): Build cache to restore from and store into (optional)
+        blender_version (str): Blender version for cache keys
+        source_hash (str): hash_source_files() result for cache keys
+        graph (ComponentGraph): Graph from create_shelf_graph() to update incrementally
+        per_component (bool): Export regenerated components instead of the whole assembly
+        memory (MemoryMonitor): Monitor to record memory use around the variant;
+            orphaned datablocks are purged after every generated variant
+        
+    Returns:
+        dict: Result with export paths, regenerated components, the geometry
+            totals of the generated assembly (not set when restored from the
+            cache) and timings in seconds
+    """
+    formats = formats or DEFAULT_EXPORT_FORMATS
+    name = params['name']
+    result = {'name': name, 'exports': {}, 'error': None, 'cached': False}
+    
+    start = time.perf_counter()
+    cache_key = None
+    if cache is not None and blender_version is not None and not per_component:
+        cache_key = compute_cache_key(params, formats, blender_version, source_hash)
+        restored = cache.restore(cache_key, output_dir, name)
+        if restored is not None:
+            print(f"Restored {name} from build cache")
+            result['exports'] = restored
+            result['cached'] = True
+    
+    generated = time.perf_counter()
+    if not result['cached']:
+        profiler = PipelineProfiler(name)
+        before = None
         try:
-            export_shelf_assembly(shelf_assembly['all_objects'], filepath, fmt)
-            print(f"Exported {fmt}: {filepath}")
+            if BLENDER_IMPORT_ERROR is not None:
+                raise RuntimeError(
+                    f"Error importing Blender modules: {BLENDER_IMPORT_ERROR}. "
+                    "Uncached variants must be generated within Blender")
+            check_compression_tool(params['export']['compression'], formats)
+            before = memory_snapshot() if memory is not None else None
+            limits = resolve_budget(params.get('budget'))
+            with profiler.activate():
+                while True:
+                    with stage('generate'):
+                        try:
+                            shelf_assembly = generate_complete_shelf_assembly(params, graph=graph)
+                        except Exception:
+                            if graph is not None:
+                                # Never update a half-built assembly incrementally;
+                                # the next variant starts from a fresh scene
+                                graph.clear()
+                            raise
+                    generated = time.perf_counter()
+                    profiler.record_geometry(shelf_assembly['all_objects'])
+                    result['geometry'] = profiler.geometry['totals']
+                    result['rebuilt'] = shelf_assembly['rebuilt']
+                    
+                    violations = []
+                    if limits is not None:
+                        with stage('measure_budget'):
+                            measured = measure_assembly(shelf_assembly['all_objects'], params)
+                        violations = check_budget(measured, limits)
+                    if not violations:
+                        with stage('export'):
+                            if per_component:
+                                result['exports'] = export_shelf_components(shelf_assembly, output_dir,
+                                                                            basename=name, formats=formats,
+                                                                            options=params.get('export'))
+                            else:
+                                result['exports'] = export_shelf_models(shelf_assembly, output_dir,
+                                                                        basename=name, formats=formats,
+                                                                        options=params.get('export'))
+                        if limits is not None and not per_component:
+                            glb_sizes = [os.path.getsize(result['exports'][fmt]) for fmt in formats
+                                         if fmt in result['exports']
+                                         and result['exports'][fmt].endswith('.glb')]
+                            if glb_sizes:
+                                measured['glb_bytes'] = max(glb_sizes)
+                            violations = check_budget(measured, limits)
+                    if limits is None:
+                        break
+                    
+                    result['budget'] = {'profile': params['budget']['profile'], 'measured': measured,
+                                        'violations': format_violations(violations)}
+                    profiler.record_export(name, budget=result['budget'])
+                    if not violations:
+                        break
+                    downgrade = None
+                    if params['budget']['action'] == 'downgrade':
+                        downgrade = downgrade_params(params, violations)
+                    if downgrade is None:
+                        # Nothing downstream may pick up an over-budget asset
+                        remove_exports(result['exports'])
+                        raise RuntimeError(f"Budget '{params['budget']['profile']}' exceeded: "
+                                           f"{format_violations(violations)}")
+                    params, description = downgrade
+                    print(f"Budget '{params['budget']['profile']}' exceeded "
+                          f"({format_violations(violations)}); downgrading to {description}")
+                    result.setdefault('downgrades', []).append(description)
+            if cache_key is not None and all(fmt in result['exports'] for fmt in formats):
+                cache.store(cache_key, result['exports'])
         except Exception as e:
-            print(f"Failed to export {fmt}: {e}")
+            generated = time.perf_counter()
+            result['error'] = str(e)
+            print(f"Variant {name} failed: {e}")
+        finally:
+            if BLENDER_IMPORT_ERROR is None:
+                # Export-only meshes and replaced components must not
+                # accumulate over a session
+                with profiler.activate(), stage('purge_orphans'):
+                    result['purged'] = purge_orphans()
+            if before is not None:
+                result['memory'] = memory.record(name, before, memory_snapshot())
+                profiler.record_memory(result['memory'])
+            if os.path.isdir(output_dir):
+                result['report'] = profiler.write_report(os.path.join(output_dir, f"{name}_report.json"))
+    finished = time.perf_counter()
+    
+    result['generate_seconds'] = generated - start
+    result['export_seconds'] = finished - generated
+    result['total_seconds'] = finished - start
+    return result
+
+
+def generate_variant_batch(variants, output_dir, formats=None, cache=None, blender_version=None,
+                           graph=None, per_component=False, leak_window=None):
+    """
+    Generate and export many assembly variants in one Blender process.
+    
+    The scene is reset by setup_scene() at the start of every variant, so
+    each variant is generated from a clean scene. Variants found in the build
+    cache are restored from it without touching the scene.
+    
+    With a shared graph, the scene is kept between variants and only the
+    components that differ from the previous variant are regenerated. With
+    per_component, only those regenerated components are exported, each to its
+    own files (the build cache is not used for component exports).
+    
+    Args:
+        variants (list): Complete assembly parameter dicts, each with a unique name
+        output_dir (str): Output directory for exported files
+        formats (list): Export formats (default: FBX, OBJ and GLTF)
+        cache (BuildCache): Build cache to restore from and store into (optional)
+        blender_version (str): Blender version for cache keys (default: detected)
+        graph (ComponentGraph): Graph from create_shelf_graph() shared by all variants
+        per_component (bool): Export regenerated components instead of whole assemblies
+        leak_window (int): Warn when bpy.data or RSS grows over this many
+            variants in a row (default: DEFAULT_LEAK_WINDOW; 0 disables)
+        
+    Returns:
+        list: Per-variant results with export paths and timings in seconds
+    """
+    memory = None
+    if BLENDER_IMPORT_ERROR is None:
+        memory = MemoryMonitor(DEFAULT_LEAK_WINDOW if leak_window is None else leak_window)
+    
+    source_hash = None
+    if cache is not None:
+        blender_version = blender_version or get_blender_version()
+        source_hash = hash_source_files()
+    
+    results = []
+    for index, params in enumerate(variants):
+        print(f"--- Variant {index + 1}/{len(variants)}: {params['name']} ---")
+        results.append(generate_variant(params, output_dir, formats=formats, cache=cache,
+                                        blender_version=blender_version, source_hash=source_hash,
+                                        graph=graph, per_component=per_component, memory=memory))
+    
+    print_batch_summary(results)
+    if memory is not None and memory.alarms:
+        print(f"{len(memory.alarms)} memory leak warnings, see the variant reports")
+    return results
+
+
+def instance_store_units(assembly_objects, units, collection):
+    """
+    Place one unit type's objects at every unit of that type.
+    
+    The placed objects are linked duplicates: they share the unit's mesh
+    data, so exporters write each mesh once.
+    
+    Args:
+        assembly_objects (list): Objects of the generated unit
+        units (list): Units from solve_store_layout() with this unit type
+        collection (bpy.types.Collection): Collection to link the objects to
+        
+    Returns:
+        dict: Unit name -> its placed objects
+    """
+    placed_units = {}
+    for unit in units:
+        unit_matrix = Matrix(unit['matrix'].tolist())
+        placed_units[unit['name']] = []
+        for obj in assembly_objects:
+            placed = bpy.data.objects.new(f"{unit['name']}_{obj.name}", obj.data)
+            placed.matrix_basis = unit_matrix @ obj.matrix_basis
+            collection.objects.link(placed)
+            placed_units[unit['name']].append(placed)
+    return placed_units
+
+
+def export_tile(objects, output_dir, basename, formats, options):
+    """
+    Export the objects of one store tile and describe the files.
+    
+    Args:
+        objects (list): Placed objects of the tile's units
+        output_dir (str): Output directory
+        basename (str): File name without extension
+        formats (list): Export formats
+        options (dict): Export options
+        
+    Returns:
+        dict: Export format -> {'path' (relative to output_dir), 'bytes', 'sha256'}
+    """
+    files = {}
+    for fmt in formats:
+        filepath = export_file(objects, output_dir, basename, fmt, options)
+        if filepath is None:
+            raise RuntimeError(f"Export of tile {basename} to {fmt} failed")
+        files[fmt] = {'path': os.path.basename(filepath), 'bytes': os.path.getsize(filepath),
+                      'sha256': hash_file(filepath)}
+    return files
+
+
+def generate_store(store, output_dir, formats=None):
+    """
+    Generate and export a whole store.
+    
+    Every unit type is generated once and instanced at all of its units;
+    with the store's default 'gpu' instancing, the native GLB holds one mesh
+    per part and an EXT_mesh_gpu_instancing transform table. A
+    <name>_store.json manifest describes sections and units in client
+    coordinates.
+    
+    With store 'tiling' set, units are partitioned into spatial tiles
+    (per section or per grid cell) and every tile is exported to its own
+    <name>_<tile> files instead, so clients can stream nearby tiles first;
+    the manifest lists each tile's bounds, units, byte sizes and SHA-256.
+    
+    Args:
+        store (dict): Store layout from load_store_layout()
+        output_dir (str): Output directory for exported files
+        formats (list): Export formats (default: the store's formats)
+        
+    Returns:
+        dict: Result with export paths (per tile when tiled), the manifest
+            path and the unit count
+    """
+    formats = formats or store['formats']
+    name = store['name']
+    result = {'name': name, 'exports': {}, 'error': None}
+    
+    start = time.perf_counter()
+    solved = solve_store_layout(store)
+    result['units'] = len(solved['units'])
+    for problem in validate_store(store, solved):
+        print(f"WARNING: store layout: {problem}")
+    
+    tiles = assign_tiles(store, solved)
+    
+    profiler = PipelineProfiler(name)
+    placed_units = {}
+    objects = []
+    collection = None
+    try:
+        if BLENDER_IMPORT_ERROR is not None:
+            raise RuntimeError(f"Error importing Blender modules: {BLENDER_IMPORT_ERROR}. "
+                               "Stores must be generated within Blender")
+        check_compression_tool(store['export']['compression'], formats)
+        collection = bpy.data.collections.get(STORE_COLLECTION) or bpy.data.collections.new(STORE_COLLECTION)
+        with profiler.activate():
+            for unit_type, info in solved['unit_types'].items():
+                units = [unit for unit in solved['units'] if unit['unit_type'] == unit_type]
+                print(f"--- Unit type {unit_type}: {len(units)} units ---")
+                with stage('generate', unit_type=unit_type):
+                    assembly = generate_complete_shelf_assembly(info['params'])
+                with stage('instance_units', unit_type=unit_type, units=len(units)):
+                    placed_units.update(instance_store_units(assembly['all_objects'], units, collection))
+            objects = [obj for unit in solved['units'] for obj in placed_units[unit['name']]]
+            profiler.record_geometry(objects)
+            
+            os.makedirs(output_dir, exist_ok=True)
+            tile_files = {}
+            with stage('export'):
+                if tiles:
+                    for tile, indices in tiles.items():
+                        tile_objects = [obj for index in indices
+                                        for obj in placed_units[solved['units'][index]['name']]]
+                        tile_files[tile] = export_tile(tile_objects, output_dir, f"{name}_{tile}",
+                                                       formats, store['export'])
+                        result['exports'][tile] = {fmt: os.path.join(output_dir, entry['path'])
+                                                   for fmt, entry in tile_files[tile].items()}
+                else:
+                    for fmt in formats:
+                        filepath = export_file(objects, output_dir, name, fmt, store['export'])
+                        if filepath is not None:
+                            result['exports'][fmt] = filepath
+        
+        if tiles:
+            manifest = store_manifest(store, solved, tiles=tiles, tile_files=tile_files)
+            sizes = [entry['bytes'] for files in tile_files.values() for entry in files.values()]
+            print(f"Store {name}: {len(tiles)} tiles, {min(sizes, default=0)}-{max(sizes, default=0)} bytes each")
+        else:
+            manifest = store_manifest(store, solved, result['exports'])
+        result['manifest'] = os.path.join(output_dir, f"{name}_store.json")
+        with open(result['manifest'], 'w') as f:
+            json.dump(manifest, f, indent=2)
+        if not tiles:
+            print(f"Store {name}: {result['units']} units of {len(solved['unit_types'])} types, "
+                  + ', '.join(f"{fmt} {os.path.getsize(path)} bytes" for fmt, path in result['exports'].items()))
+    except Exception as e:
+        result['error'] = str(e)
+        print(f"Store {name} failed: {e}")
+    finally:
+        if BLENDER_IMPORT_ERROR is None:
+            remove_objects(objects)
+            if collection is not None and not collection.objects:
+                bpy.data.collections.remove(collection)
+            # The last unit type's source assembly is still in the scene
+            clear_scene()
+        if os.path.isdir(output_dir):
+            result['report'] = profiler.write_report(os.path.join(output_dir, f"{name}_report.json"))
+    result['total_seconds'] = time.perf_counter() - start
+    return result
+
+
+def print_batch_summary(results):
+    """
+    Print a per-variant timing summary for a batch run.
+    
+    Args:
+        results (list): Results from generate_variant_batch()
+    """
+    name_width = max([len(r['name']) for r in results] + [len('Variant')])
+    print("=== Batch timing summary ===")
+    print(f"{'Variant':<{name_width}}  {'Generate':>9}  {'Export':>9}  {'Total':>9}  Status")
+    for r in results:
+        status = 'FAILED' if r['error'] is not None else ('cached' if r.get('cached') else 'ok')
+        print(f"{r['name']:<{name_width}}  {r['generate_seconds']:>8.3f}s  "
+              f"{r['export_seconds']:>8.3f}s  {r['total_seconds']:>8.3f}s  {status}")
+    total = sum(r['total_seconds'] for r in results)
+    print(f"{len(results)} variants in {total:.3f}s "
+          f"({total / max(len(results), 1):.3f}s per variant)")
+
+
+def parse_args(argv=None):
+    """
+    Parse script arguments (the ones after ``--`` on the Blender command line).
+    
+    Args:
+        argv (list): Full argument list (default: sys.argv)
+        
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    argv = sys.argv if argv is None else argv
+    if '--' in argv:
+        script_args = argv[argv.index('--') + 1:]
+    elif bpy is None:
+        # Running under plain Python, so every argument belongs to the script
+        script_args = argv[1:]
+    else:
+        script_args = []
+    
+    parser = argparse.ArgumentParser(prog="gen_shelf_modular.py",
+                                     description="Generate blockbuster shelf models")
+    parser.add_argument('--jobs', help="JSON job file listing assembly variants to generate")
+    parser.add_argument('--store', help="Store layout JSON file; generates one whole-store export instead of variants")
+    parser.add_argument('--tiles', choices=TILING_MODES,
+                        help="With --store, export one file per section or floor grid cell plus a manifest "
+                             "with tile bounds, sizes and hashes")
+    parser.add_argument('--tile-size', type=float, help="Grid cell size in meters for --tiles grid (default: 8)")
+    parser.add_argument('--output-dir', help="Output directory (overrides job file and BLENDER_OUTPUT_DIR)")
+    parser.add_argument('--report', help="Write batch results as JSON to this path")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="Build cache directory (default: $SHELF_CACHE_DIR or ~/.cache/blender/shelf_build_cache)")
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_BYTES / (1024 * 1024),
+                        help="Build cache size limit in MB before LRU eviction")
+    parser.add_argument('--no-cache', action='store_true', help="Always regenerate and do not update the cache")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Keep the scene between variants and regenerate only changed components")
+    parser.add_argument('--per-component', action='store_true',
+                        help="Export each regenerated component to its own files")
+    parser.add_argument('--static-batch', action='store_true',
+                        help="Export one merged mesh per material instead of one object per part")
+    parser.add_argument('--compression', choices=EXPORT_COMPRESSION_MODES,
+                        help="Compress .glb outputs with Draco or meshopt and report the size saving")
+    parser.add_argument('--quantize', action='store_true',
+                        help="Write GLB vertex attributes with KHR_mesh_quantization (int16 positions)")
+    parser.add_argument('--budget', choices=BUDGET_PROFILE_NAMES,
+                        help="Check every assembly against a device budget profile")
+    parser.add_argument('--budget-action', choices=BUDGET_ACTIONS,
+                        help="On a budget overrun, fail the variant or downgrade it until it fits "
+                             "(default: the job's setting, else fail)")
+    parser.add_argument('--lod', choices=EXPORT_LOD_MODES,
+                        help="Also export LOD1-LOD3 as separate files ('files') or embedded with MSFT_lod "
+                             "in GLB output ('msft'), with a <name>_lod.json manifest")
+    parser.add_argument('--leak-window', type=int,
+                        help="Warn when bpy.data collections or RSS grow over this many variants "
+                             "in a row (default: 5, 0 disables)")
+    return parser.parse_args(script_args)
 
 
 def main():
     """Main function - entry point for the script."""
     print("=== Blender Blockbuster Shelf Generator ===")
+    args = parse_args()
     
     try:
-        # Generate shelf assembly
-        shelf_assembly = generate_complete_shelf_assembly()
-        
         # Export models (default to /app for Docker container)
-        output_dir = os.environ.get('BLENDER_OUTPUT_DIR', '/app/steamvr-addon/models')
-        export_shelf_models(shelf_assembly, output_dir)
+        default_output_dir = os.environ.get('BLENDER_OUTPUT_DIR', '/app/steamvr-addon/models')
+        
+        if args.store:
+            store = load_store_layout(args.store)
+            if args.tiles:
+                store['tiling']['mode'] = args.tiles
+            if args.tile_size:
+                store['tiling']['cellSize'] = args.tile_size
+            result = generate_store(store, args.output_dir or store.get('output_dir') or default_output_dir)
+            if args.report:
+                with open(args.report, 'w') as f:
+                    json.dump(result, f, indent=2)
+            if result['error'] is not None:
+                sys.exit(1)
+            print("=== Store generation completed successfully! ===")
+            return
+        
+        if args.jobs:
+            job = load_job_file(args.jobs)
+            variants = job['variants']
+            formats = job['formats']
+            output_dir = args.output_dir or job['output_dir'] or default_output_dir
+        else:
+            variants = [DEFAULT_ASSEMBLY_PARAMS]
+            formats = DEFAULT_EXPORT_FORMATS
+            output_dir = args.output_dir or default_output_dir
+        
+        if args.static_batch:
+            variants = [merge_params(params, {'export': {'batching': 'static'}}) for params in variants]
+        if args.compression:
+            variants = [merge_params(params, {'export': {'compression': args.compression}})
+                        for params in variants]
+        if args.quantize:
+            variants = [merge_params(params, {'export': {'quantize': True}}) for params in variants]
+        if args.budget:
+            variants = [merge_params(params, {'budget': {'profile': args.budget}}) for params in variants]
+        if args.budget_action:
+            variants = [merge_params(params, {'budget': {'action': args.budget_action}}) for params in variants]
+        if args.lod:
+            variants = [merge_params(params, {'export': {'lod': args.lod}}) for params in variants]
+        
+        cache = None
+        if not args.no_cache:
+            cache = BuildCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+        
+        graph = create_shelf_graph() if args.incremental and bpy is not None else None
+        results = generate_variant_batch(variants, output_dir, formats=formats, cache=cache,
+                                         graph=graph, per_component=args.per_component,
+                                         leak_window=args.leak_window)
+        
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump(results, f, indent=2)
+        
+        failed = [r['name'] for r in results if r['error'] is not None]
+        if failed:
+            print(f"Failed variants: {', '.join(failed)}")
+            sys.exit(1)
         
         print("=== Shelf generation completed successfully! ===")
         
@@ -5,10 +5,17 @@ Creates the backing plane/pegboard behind the shelf.
 """
 
 import bpy
-import bmesh
+import numpy as np
 from mathutils import Vector
 import math
 
+from geometry.mesh_core import (backing_slab_arrays, pegboard_arrays, pegboard_hole_centers,
+                                pegboard_texture_hole_count, pegboard_texture_mapping,
+                                pegboard_texture_slab_arrays, pegboard_uvs)
+from utils.materials import assign_material, material_library
+from utils.mesh_builder import mesh_from_arrays, set_loop_uvs
+from utils.textures import pegboard_alpha_tile, pegboard_normal_tile
+
 
 def create_backing_plane(name="Backing", width=2.2, height=1.5, thickness=0.02):
     """
@@ -23,89 +30,180 @@ def create_backing_plane(name="Backing", width=2.2, height=1.5, thickness=0.02):
     Returns:
         bpy.types.Object: The created backing object
     """
-    # Create mesh
-    mesh = bpy.data.meshes.new(f"{name}_mesh")
+    # Create slab from bulk arrays
+    mesh = mesh_from_arrays(f"{name}_mesh", backing_slab_arrays(width, height, thickness))
     obj = bpy.data.objects.new(name, mesh)
     
     # Add to scene
     bpy.context.collection.objects.link(obj)
     
-    # Create bmesh
-    bm = bmesh.new()
-    
-    # Create plane
-    bmesh.ops.create_cube(bm, size=1.0)
-    
-    # Scale to backing dimensions
-    bmesh.ops.scale(bm,
-                   vec=(width, thickness, height),
-                   verts=bm.verts)
-    
-    # Update mesh
-    bm.to_mesh(mesh)
-    bm.free()
-    
     return obj
 
 
-def create_pegboard_holes(backing_obj, hole_spacing=0.1, hole_diameter=0.01):
+def create_pegboard_holes(backing_obj, width=2.2, height=1.5, thickness=0.02,
+                          hole_spacing=0.1, hole_diameter=0.01):
     """
     Add pegboard holes to a backing plane.
     
+    The hole grid is computed in one vectorized step and the perforated slab
+    replaces the backing's mesh in object mode; holes are square.
+    
     Args:
         backing_obj (bpy.types.Object): The backing plane object
+        width (float): Width of the backing (its solved size)
+        height (float): Height of the backing
+        thickness (float): Thickness of the backing
         hole_spacing (float): Distance between holes
         hole_diameter (float): Diameter of each hole
+        
+    Returns:
+        int: Number of holes created
+    """
+    # Build the perforated slab in bulk
+    centers_x, centers_z = pegboard_hole_centers(width, height, hole_spacing)
+    replace_mesh(backing_obj, pegboard_arrays(width, height, thickness, hole_spacing, hole_diameter))
+    
+    return len(centers_x) * len(centers_z)
+
+
+def replace_mesh(backing_obj, arrays):
+    """
+    Swap new geometry into the backing, keeping its materials and mesh name.
+    
+    Args:
+        backing_obj (bpy.types.Object): The backing plane object
+        arrays (MeshArrays): The new geometry
+        
+    Returns:
+        bpy.types.Mesh: The new mesh
+    """
+    old_mesh = backing_obj.data
+    mesh_name = old_mesh.name
+    mesh = mesh_from_arrays(f"{mesh_name}_pegboard", arrays)
+    for mat in old_mesh.materials:
+        mesh.materials.append(mat)
+    backing_obj.data = mesh
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+        mesh.name = mesh_name
+    return mesh
+
+
+def image_from_pixels(name, pixels, non_color=False):
     """
-    # Get backing dimensions
-    width = backing_obj.dimensions.x
-    height = backing_obj.dimensions.z
-    
-    # Calculate hole grid
-    holes_x = int(width / hole_spacing)
-    holes_z = int(height / hole_spacing)
-    
-    # Set backing as active object
-    bpy.context.view_layer.objects.active = backing_obj
-    backing_obj.select_set(True)
-    
-    # Enter edit mode
-    bpy.ops.object.mode_set(mode='EDIT')
-    
-    # Create bmesh from mesh
-    bm = bmesh.from_edit_mesh(backing_obj.data)
-    
-    # Add holes using inset and extrude
-    for i in range(holes_x):
-        for j in range(holes_z):
-            # Calculate hole position
-            x = (i / holes_x - 0.5) * width * 0.9
-            z = (j / holes_z - 0.5) * height * 0.9
-            
-            # Create small circular cut (simplified as square for now)
-            # This would require more complex geometry operations for true circles
-            pass  # Placeholder for hole creation logic
-    
-    # Update mesh
-    bmesh.update_edit_mesh(backing_obj.data)
-    
-    # Exit edit mode
-    bpy.ops.object.mode_set(mode='OBJECT')
+    Create a packed Blender image from 8-bit pixels.
+    
+    Args:
+        name (str): Image name
+        pixels (np.ndarray): (height, width, 3 or 4) uint8 pixels, top row first
+        non_color (bool): Mark the image as data (e.g. normal maps)
+        
+    Returns:
+        bpy.types.Image: The created image
+    """
+    height, width, channels = pixels.shape
+    image = bpy.data.images.new(name, width=width, height=height, alpha=channels == 4)
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    rgba[..., :channels] = pixels / 255.0
+    # Blender stores rows bottom to top
+    image.pixels.foreach_set(rgba[::-1].ravel())
+    if non_color:
+        image.colorspace_settings.name = 'Non-Color'
+    image.pack()
+    return image
 
 
-def position_backing_behind_shelf(backing_obj, shelf_obj, offset=0.01):
+def apply_pegboard_texture(backing_obj, width=2.2, height=1.5, thickness=0.02, hole_spacing=0.1,
+                           hole_diameter=0.01, resolution=64):
     """
-    Position backing plane behind the shelf (more flush).
+    Show pegboard holes with textures instead of geometry.
+    
+    The backing becomes a 60-triangle slab whose faces are split along the
+    edge of the hole area. A one-hole alpha mask and normal map tile are
+    generated and repeated once per hole through the UVs, at the same
+    positions create_pegboard_holes() would cut; the margin around the hole
+    area is clamped to the solid tile edge. Call this after the backing
+    material has been added; the textured material is a shared library
+    variation of it.
     
     Args:
-        backing_obj (bpy.types.Object): The backing object
-        shelf_obj (bpy.types.Object): The shelf object
-        offset (float): Small distance behind the shelf for clearance
+        backing_obj (bpy.types.Object): The backing plane object
+        width (float): Width of the backing (its solved size)
+        height (float): Height of the backing
+        thickness (float): Thickness of the backing
+        hole_spacing (float): Distance between holes
+        hole_diameter (float): Diameter of each hole
+        resolution (int): Texture tile size in texels
+        
+    Returns:
+        int: Number of holes drawn
     """
-    # Position backing very close behind shelf
-    backing_obj.location.x = shelf_obj.location.x
-    backing_obj.location.y = shelf_obj.location.y - shelf_obj.dimensions.y/2 - offset
-    backing_obj.location.z = shelf_obj.location.z
+    mapping = pegboard_texture_mapping(width, height, hole_spacing, hole_diameter)
+    arrays = pegboard_texture_slab_arrays(width, height, thickness, hole_spacing)
+    mesh = replace_mesh(backing_obj, arrays)
+    
+    # One texture tile per hole, projected along the board normal
+    uvs = pegboard_uvs(arrays.vertices[arrays.loops], mapping)
+    set_loop_uvs(mesh, uvs)
+    holes = pegboard_texture_hole_count(uvs, mapping)
+    
+    base_mat = backing_obj.active_material
+    if base_mat is None:
+        return holes
+    
+    def add_pegboard_nodes(mat):
+        mat.name = f"{base_mat.name}_Pegboard"
+        nodes = mat.node_tree.nodes
+        links = mat.node_tree.links
+        bsdf_node = nodes.get('Principled BSDF')
+        if bsdf_node is None:
+            return
+        
+        alpha_image = image_from_pixels(f"{mat.name}_Alpha",
+                                        pegboard_alpha_tile(resolution, mapping['hole_fraction']))
+        normal_image = image_from_pixels(f"{mat.name}_Normal",
+                                         pegboard_normal_tile(resolution, mapping['hole_fraction']),
+                                         non_color=True)
+        
+        # Tint the white alpha tile with the material color
+        alpha_node = nodes.new('ShaderNodeTexImage')
+        alpha_node.image = alpha_image
+        color = tuple(bsdf_node.inputs['Base Color'].default_value)
+        if bpy.app.version >= (3, 4, 0):
+            tint_node = nodes.new('ShaderNodeMix')
+            tint_node.data_type = 'RGBA'
+            tint_node.blend_type = 'MULTIPLY'
+            tint_node.inputs['Factor'].default_value = 1.0
+            tint_node.inputs[6].default_value = color
+            links.new(alpha_node.outputs['Color'], tint_node.inputs[7])
+            links.new(tint_node.outputs[2], bsdf_node.inputs['Base Color'])
+        else:
+            tint_node = nodes.new('ShaderNodeMixRGB')
+            tint_node.blend_type = 'MULTIPLY'
+            tint_node.inputs['Fac'].default_value = 1.0
+            tint_node.inputs['Color1'].default_value = color
+            links.new(alpha_node.outputs['Color'], tint_node.inputs['Color2'])
+            links.new(tint_node.outputs['Color'], bsdf_node.inputs['Base Color'])
+        
+        # Hard-edged holes: round the alpha to 0 or 1 (exported as alpha mask)
+        clip_node = nodes.new('ShaderNodeMath')
+        clip_node.operation = 'ROUND'
+        links.new(alpha_node.outputs['Alpha'], clip_node.inputs[0])
+        links.new(clip_node.outputs['Value'], bsdf_node.inputs['Alpha'])
+        if bpy.app.version < (4, 2, 0):
+            mat.blend_method = 'CLIP'
+        
+        normal_image_node = nodes.new('ShaderNodeTexImage')
+        normal_image_node.image = normal_image
+        normal_map_node = nodes.new('ShaderNodeNormalMap')
+        links.new(normal_image_node.outputs['Color'], normal_map_node.inputs['Color'])
+        links.new(normal_map_node.outputs['Normal'], bsdf_node.inputs['Normal'])
+    
+    # Boards with the same hole pattern and color share one textured material
+    variant = ('pegboard', tuple(round(f, 6) for f in mapping['hole_fraction']), resolution)
+    assign_material(backing_obj, material_library().derive(base_mat, variant, add_pegboard_nodes))
+    
+    return holes
 
 
 def add_backing_material(obj, color=(0.7, 0.65, 0.55, 1.0)):
@@ -116,23 +214,8 @@ def add_backing_material(obj, color=(0.7, 0.65, 0.55, 1.0)):
         obj (bpy.types.Object): The backing object
         color (tuple): RGBA color values (default: darkish beige)
     """
-    # Create material
-    mat = bpy.data.materials.new(name=f"{obj.name}_Material")
-    mat.use_nodes = True
-    
-    # Get the material output node
-    output_node = mat.node_tree.nodes.get('Material Output')
-    if output_node:
-        # Get or create principled BSDF
-        bsdf_node = mat.node_tree.nodes.get('Principled BSDF')
-        if bsdf_node:
-            # Set base color
-            bsdf_node.inputs['Base Color'].default_value = color
-            # Set roughness
-            bsdf_node.inputs['Roughness'].default_value = 0.8
+    # Get the shared material
+    mat = material_library().get("Backing", color, roughness=0.8)
     
     # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
+    assign_material(obj, mat)
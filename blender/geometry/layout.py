@@ -0,0 +1,416 @@
+"""
+Layout Solver Module
+
+Computes where every component of a shelf assembly goes from the assembly
+parameters alone. Transforms and bounding boxes follow analytically from the
+component specs and the shapes in mesh_core, so layout no longer depends on
+reading obj.dimensions from live objects or on the order they were created
+in; Blender objects are only instantiated from the solver's output.
+
+A solved assembly is an AssemblyLayout: one row per component in NumPy
+arrays. Many units (e.g. a whole store) are placed by broadcasting the
+assembly against a stack of unit matrices. Nothing here imports bpy.
+"""
+
+import numpy as np
+
+
+# Bracket shape and placement (see create_bracket_support)
+BRACKET_THICKNESS = 0.1
+BRACKET_SPREAD = 0.8                # Brackets span this fraction of the shelf width
+BRACKET_BACK_INSET = 0.03           # Distance of the bracket origin from the shelf back edge
+BRACKET_ROTATION_Z = 1.5555
+
+# Component kinds in build order
+COMPONENT_KINDS = ('shelf', 'bracket', 'backing', 'crown')
+
+
+class ComponentSpec:
+    """Base class for typed component specs built from a parameter section."""
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+    @classmethod
+    def from_params(cls, section):
+        """
+        Build a spec from one section of the assembly parameters.
+
+        Args:
+            section (dict): Parameter section; extra keys (colors etc.) are ignored
+
+        Returns:
+            ComponentSpec: The spec
+        """
+        return cls(**{name: section[name] for name in cls.__slots__})
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class ShelfSpec(ComponentSpec):
+    """Main shelf box, centered on the assembly origin."""
+
+    __slots__ = ('width', 'height', 'depth')
+
+
+class BracketSpec(ComponentSpec):
+    """Bracket supports spread under the shelf."""
+
+    __slots__ = ('count',)
+
+
+class BackingSpec(ComponentSpec):
+    """Backing slab behind the shelf."""
+
+    __slots__ = ('width', 'height', 'thickness', 'offset')
+
+
+class CrownSpec(ComponentSpec):
+    """Crown ovoid on top of the backing; width, height and depth are semi-axes."""
+
+    __slots__ = ('width', 'height', 'depth', 'height_offset')
+
+
+class AssemblySpec:
+    """The specs of every component of one shelf assembly."""
+
+    __slots__ = ('shelf', 'brackets', 'backing', 'crown')
+
+    def __init__(self, shelf, brackets, backing, crown):
+        self.shelf = shelf
+        self.brackets = brackets
+        self.backing = backing
+        self.crown = crown
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Build the specs from complete assembly parameters.
+
+        Args:
+            params (dict): Assembly parameters (see utils/jobs.py)
+
+        Returns:
+            AssemblySpec: The specs
+        """
+        return cls(ShelfSpec.from_params(params['shelf']),
+                   BracketSpec.from_params(params['brackets']),
+                   BackingSpec.from_params(params['backing']),
+                   CrownSpec.from_params(params['crown']))
+
+
+class Placement:
+    """Transform and bounds of one component, as handed to the Blender side."""
+
+    __slots__ = ('name', 'kind', 'size', 'location', 'rotation', 'bounds_min', 'bounds_max')
+
+    def __init__(self, name, kind, size, location, rotation, bounds_min, bounds_max):
+        self.name = name
+        self.kind = kind
+        self.size = size
+        self.location = location
+        self.rotation = rotation
+        self.bounds_min = bounds_min
+        self.bounds_max = bounds_max
+
+    def to_dict(self):
+        """JSON-serializable form (also used in component fingerprints)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def rotation_matrices(rotations):
+    """
+    Rotation matrices of XYZ Euler angles (Blender's default rotation mode).
+
+    Args:
+        rotations (np.ndarray): (N, 3) angles in radians
+
+    Returns:
+        np.ndarray: (N, 3, 3) matrices
+    """
+    rotations = np.asarray(rotations, dtype=np.float64)
+    cos, sin = np.cos(rotations), np.sin(rotations)
+    matrices = np.empty((len(rotations), 3, 3))
+    cx, cy, cz = cos.T
+    sx, sy, sz = sin.T
+    # Rz @ Ry @ Rx
+    matrices[:, 0, 0] = cy * cz
+    matrices[:, 0, 1] = sx * sy * cz - cx * sz
+    matrices[:, 0, 2] = cx * sy * cz + sx * sz
+    matrices[:, 1, 0] = cy * sz
+    matrices[:, 1, 1] = sx * sy * sz + cx * cz
+    matrices[:, 1, 2] = cx * sy * sz - sx * cz
+    matrices[:, 2, 0] = -sy
+    matrices[:, 2, 1] = sx * cy
+    matrices[:, 2, 2] = cx * cy
+    return matrices
+
+
+def unit_matrices(locations, rotations_z=None):
+    """
+    Build the matrices that place assembly units, e.g. along store rows.
+
+    Args:
+        locations (np.ndarray): (U, 3) unit origins
+        rotations_z (np.ndarray): (U,) rotations about Z in radians (default: none)
+
+    Returns:
+        np.ndarray: (U, 4, 4) matrices
+    """
+    locations = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+    rotations = np.zeros_like(locations)
+    if rotations_z is not None:
+        rotations[:, 2] = rotations_z
+    matrices = np.zeros((len(locations), 4, 4))
+    matrices[:, :3, :3] = rotation_matrices(rotations)
+    matrices[:, :3, 3] = locations
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def transform_bounds(bounds_min, bounds_max, matrices):
+    """
+    Axis-aligned bounds of boxes after a transform.
+
+    Args:
+        bounds_min (np.ndarray): (..., 3) box minimum corners
+        bounds_max (np.ndarray): (..., 3) box maximum corners
+        matrices (np.ndarray): (..., 4, 4) transforms, broadcast against the boxes
+
+    Returns:
+        tuple: (minimum, maximum) corners, each (..., 3)
+    """
+    center = (np.asarray(bounds_min) + np.asarray(bounds_max)) / 2.0
+    half = (np.asarray(bounds_max) - np.asarray(bounds_min)) / 2.0
+    linear = matrices[..., :3, :3]
+    world_center = np.einsum('...ij,...j->...i', linear, center) + matrices[..., :3, 3]
+    # The extent of a transformed box along each axis is |M| @ half
+    world_half = np.einsum('...ij,...j->...i', np.abs(linear), half)
+    return world_center - world_half, world_center + world_half
+
+
+class AssemblyLayout:
+    """Array-backed layout of one assembly: one row per component."""
+
+    __slots__ = ('names', 'kinds', 'sizes', 'locations', 'rotations', 'local_min', 'local_max')
+
+    def __init__(self, names, kinds, sizes, locations, rotations, local_min, local_max):
+        """
+        Args:
+            names (list): Object names
+            kinds (list): Component kind per row (see COMPONENT_KINDS)
+            sizes (np.ndarray): (N, 3) the create_* size arguments of each
+                component, in that function's argument order
+            locations (np.ndarray): (N, 3) locations in the assembly
+            rotations (np.ndarray): (N, 3) XYZ Euler rotations
+            local_min (np.ndarray): (N, 3) mesh bounds minimum in object space
+            local_max (np.ndarray): (N, 3) mesh bounds maximum in object space
+        """
+        self.names = names
+        self.kinds = kinds
+        self.sizes = sizes
+        self.locations = locations
+        self.rotations = rotations
+        self.local_min = local_min
+        self.local_max = local_max
+
+    def __len__(self):
+        return len(self.names)
+
+    def matrices(self):
+        """
+        Object to assembly transforms.
+
+        Returns:
+            np.ndarray: (N, 4, 4) matrices
+        """
+        matrices = np.zeros((len(self), 4, 4))
+        matrices[:, :3, :3] = rotation_matrices(self.rotations)
+        matrices[:, :3, 3] = self.locations
+        matrices[:, 3, 3] = 1.0
+        return matrices
+
+    def component_bounds(self):
+        """
+        Bounds of every component in assembly space.
+
+        Returns:
+            tuple: (minimum, maximum) corners, each (N, 3)
+        """
+        return transform_bounds(self.local_min, self.local_max, self.matrices())
+
+    def bounds(self):
+        """
+        Bounds of the whole assembly.
+
+        Returns:
+            tuple: (minimum, maximum) corners, each (3,)
+        """
+        low, high = self.component_bounds()
+        return low.min(axis=0), high.max(axis=0)
+
+    def placements(self, kind=None):
+        """
+        Placement records for the Blender side.
+
+        Args:
+            kind (str): Only this component kind (default: all)
+
+        Returns:
+            list: Placement per component, in build order
+        """
+        low, high = self.component_bounds()
+        return [Placement(self.names[i], self.kinds[i], self.sizes[i].tolist(),
+                          self.locations[i].tolist(), self.rotations[i].tolist(),
+                          low[i].tolist(), high[i].tolist())
+                for i in range(len(self)) if kind is None or self.kinds[i] == kind]
+
+    def instanced(self, units):
+        """
+        Place the assembly once per unit matrix.
+
+        Args:
+            units (np.ndarray): (U, 4, 4) unit transforms (see unit_matrices())
+
+        Returns:
+            tuple: (U, N, 4, 4) component world matrices and their world
+                bounds as (U, N, 3) minimum and maximum corners
+        """
+        matrices = np.matmul(units[:, None], self.matrices()[None])
+        low, high = transform_bounds(self.local_min, self.local_max, matrices)
+        return matrices, low, high
+
+
+def solve_assembly_layout(spec):
+    """
+    Solve the layout of one shelf assembly.
+
+    Mirrors how the components were positioned from each other's objects:
+    the shelf sits on the origin, brackets hang under its bottom face near the
+    back edge, the backing is just behind it and the crown is centered above
+    the backing.
+
+    Args:
+        spec (AssemblySpec or dict): Specs, or assembly parameters to build them from
+
+    Returns:
+        AssemblyLayout: The solved layout
+    """
+    if not isinstance(spec, AssemblySpec):
+        spec = AssemblySpec.from_params(spec)
+    shelf, brackets, backing, crown = spec.shelf, spec.brackets, spec.backing, spec.crown
+
+    count = int(brackets.count)
+    bracket_height = min(shelf.depth * 0.8, shelf.height * 3)
+    bracket_length = bracket_height * 2
+    if count == 1:
+        bracket_x = np.zeros(1)
+    else:
+        bracket_x = (np.arange(count) / max(count - 1, 1) - 0.5) * (shelf.width * BRACKET_SPREAD)
+
+    backing_location = (0.0, -shelf.depth / 2 - backing.offset, 0.0)
+    crown_location = (backing_location[0], backing_location[1],
+                      backing_location[2] + backing.height / 2 + crown.height_offset)
+
+    rows = len(COMPONENT_KINDS) - 1 + count
+    sizes = np.empty((rows, 3))
+    locations = np.zeros((rows, 3))
+    rotations = np.zeros((rows, 3))
+    local_min = np.empty((rows, 3))
+    local_max = np.empty((rows, 3))
+
+    # Shelf box: create_main_shelf(width, height, depth), extents (width, depth, height)
+    sizes[0] = (shelf.width, shelf.height, shelf.depth)
+    local_max[0] = (shelf.width / 2, shelf.depth / 2, shelf.height / 2)
+    local_min[0] = -local_max[0]
+
+    # Brackets: create_bracket_support(length, height, thickness), the prism
+    # hangs down from its origin
+    bracket_rows = slice(1, 1 + count)
+    sizes[bracket_rows] = (bracket_length, bracket_height, BRACKET_THICKNESS)
+    locations[bracket_rows, 0] = bracket_x
+    locations[bracket_rows, 1] = -shelf.depth / 2 + BRACKET_BACK_INSET
+    locations[bracket_rows, 2] = -shelf.height / 2
+    rotations[bracket_rows, 2] = BRACKET_ROTATION_Z
+    local_min[bracket_rows] = (0.0, 0.0, -bracket_height)
+    local_max[bracket_rows] = (bracket_length, BRACKET_THICKNESS, 0.0)
+
+    # Backing slab: create_backing_plane(width, height, thickness)
+    sizes[1 + count] = (backing.width, backing.height, backing.thickness)
+    locations[1 + count] = backing_location
+    local_max[1 + count] = (backing.width / 2, backing.thickness / 2, backing.height / 2)
+    local_min[1 + count] = -local_max[1 + count]
+
+    # Crown ovoid: create_crown_topper(width, height, depth) with semi-axes
+    sizes[2 + count] = (crown.width, crown.height, crown.depth)
+    locations[2 + count] = crown_location
+    local_max[2 + count] = (crown.width, crown.depth, crown.height)
+    local_min[2 + count] = -local_max[2 + count]
+
+    names = ["MainShelf"] + [f"Bracket_{i + 1}" for i in range(count)] + ["Backing", "Crown"]
+    kinds = ['shelf'] + ['bracket'] * count + ['backing', 'crown']
+    return AssemblyLayout(names, kinds, sizes, locations, rotations, local_min, local_max)
+
+
+def validate_layout(layout, tolerance=1e-6):
+    """
+    Check that a solved assembly fits together.
+
+    Args:
+        layout (AssemblyLayout): Solved layout
+        tolerance (float): Allowed overlap in meters
+
+    Returns:
+        list: Descriptions of the problems found (empty when valid)
+    """
+    problems = [f"{layout.names[i]} has a non-positive size {layout.sizes[i].tolist()}"
+                for i in np.flatnonzero((layout.sizes <= 0).any(axis=1))]
+    low, high = layout.component_bounds()
+    rows = {kind: [i for i, k in enumerate(layout.kinds) if k == kind] for kind in COMPONENT_KINDS}
+    if not rows['shelf'] or not rows['backing']:
+        return problems + ["layout needs a shelf and a backing"]
+    shelf, backing = rows['shelf'][0], rows['backing'][0]
+
+    if high[backing, 1] > low[shelf, 1] + tolerance:
+        problems.append(f"Backing reaches {high[backing, 1] - low[shelf, 1]:.4f} m into the shelf")
+    for i in rows['bracket']:
+        top = layout.locations[i, 2] + layout.local_max[i, 2]
+        if abs(top - low[shelf, 2]) > tolerance:
+            problems.append(f"{layout.names[i]} does not touch the shelf bottom")
+        if not low[shelf, 0] - tolerance <= layout.locations[i, 0] <= high[shelf, 0] + tolerance:
+            problems.append(f"{layout.names[i]} is outside the shelf width")
+    for i in rows['crown']:
+        if layout.locations[i, 2] < high[backing, 2] - tolerance:
+            problems.append(f"{layout.names[i]} is centered below the top of the backing")
+    return problems
+
+
+# Assembly parameter section of every component kind
+COMPONENT_SECTIONS = {'shelf': 'shelf', 'bracket': 'brackets', 'backing': 'backing', 'crown': 'crown'}
+
+
+def with_placements(params, layout):
+    """
+    Add the solved placements to the assembly parameters.
+
+    Each component section gets a 'placements' list, so component builders
+    create their objects from it and component fingerprints change whenever
+    a component moves.
+
+    Args:
+        params (dict): Assembly parameters
+        layout (AssemblyLayout): Layout solved from them
+
+    Returns:
+        dict: Shallow copy of params with placements added
+    """
+    result = dict(params)
+    for kind, section in COMPONENT_SECTIONS.items():
+        result[section] = dict(params[section],
+                               placements=[placement.to_dict() for placement in layout.placements(kind)])
+    return result
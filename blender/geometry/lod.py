@@ -0,0 +1,322 @@
+"""
+Level of Detail Module
+
+Error-bounded mesh decimation for LOD chains. Small meshes are simplified by
+quadric edge collapse: edges are collapsed cheapest first as long as the
+collapsed vertex stays within the error bound of every original face plane
+it represents. Large meshes are first reduced by vectorized vertex
+clustering, which bounds how far any vertex moves. Nothing here imports bpy.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+from geometry.mesh_core import MeshArrays, face_normals, triangulate_loops
+
+
+# Maximum vertex displacement per level in meters; LOD0 is the source mesh
+DEFAULT_LOD_ERRORS = (0.0, 0.005, 0.02, 0.05)
+
+# Viewer used to turn geometric error into switch distances (Quest-class
+# headset: ~90 degree vertical FOV, ~1900 px per eye vertically)
+DEFAULT_VERTICAL_FOV_DEGREES = 90.0
+DEFAULT_SCREEN_HEIGHT_PX = 1900
+DEFAULT_PIXEL_ERROR = 1.0
+
+# Above this many vertices, half of the error budget goes to vertex
+# clustering first, so the per-edge collapse loop stays short
+CLUSTER_VERTEX_LIMIT = 10000
+
+
+def cluster_decimate(mesh, max_error):
+    """
+    Simplify a mesh so that no vertex moves further than max_error.
+
+    Every axis keeps at least two cells, so thin parts (shelf boards,
+    backing slabs) keep their thickness instead of collapsing to a plane.
+
+    Args:
+        mesh (MeshArrays): Source mesh
+        max_error (float): Maximum vertex displacement
+
+    Returns:
+        tuple: (MeshArrays of triangles, measured maximum displacement)
+    """
+    if max_error <= 0 or len(mesh.vertices) == 0:
+        return mesh, 0.0
+
+    vertices = mesh.vertices.astype(np.float64)
+    low = vertices.min(axis=0)
+    extent = vertices.max(axis=0) - low
+
+    # Cell diagonal equal to max_error bounds every displacement
+    cell = max_error / math.sqrt(3.0)
+    cells = np.maximum(np.ceil(extent / cell), 2).astype(np.int64)
+    size = np.where(extent > 0, extent / cells, 1.0)
+    coords = np.minimum(((vertices - low) / size).astype(np.int64), cells - 1)
+    cell_ids = (coords[:, 0] * cells[1] + coords[:, 1]) * cells[2] + coords[:, 2]
+    unique_cells, cluster = np.unique(cell_ids, return_inverse=True)
+    cluster = cluster.ravel()
+    clusters = len(unique_cells)
+
+    # Quadric of every face plane, accumulated per cluster
+    normals = face_normals(mesh)
+    face_of_loop = np.repeat(np.arange(len(mesh.face_sizes)), mesh.face_sizes)
+    loop_normals = normals[face_of_loop]
+    loop_offsets = -np.einsum('ij,ij->i', loop_normals, vertices[mesh.loops])
+    quadric_a = np.zeros((clusters, 3, 3))
+    quadric_b = np.zeros((clusters, 3))
+    np.add.at(quadric_a, cluster[mesh.loops], loop_normals[:, :, None] * loop_normals[:, None, :])
+    np.add.at(quadric_b, cluster[mesh.loops], -loop_normals * loop_offsets[:, None])
+
+    counts = np.bincount(cluster, minlength=clusters)[:, None]
+    mean = np.zeros((clusters, 3))
+    np.add.at(mean, cluster, vertices)
+    mean /= counts
+
+    # Minimize the quadric around the mean; directions the planes do not
+    # constrain (flat or edge clusters) stay at the mean
+    residual = quadric_b - np.einsum('kij,kj->ki', quadric_a, mean)
+    optimal = mean + np.einsum('kij,kj->ki', np.linalg.pinv(quadric_a, rcond=1e-3), residual)
+    cell_coords = np.stack([unique_cells // (cells[1] * cells[2]), (unique_cells // cells[2]) % cells[1],
+                            unique_cells % cells[2]], axis=1)
+    cell_low = low + cell_coords * size
+    representative = np.clip(optimal, cell_low, cell_low + size)
+
+    displacement = np.linalg.norm(representative[cluster] - vertices, axis=1)
+    measured = float(displacement.max()) if len(displacement) else 0.0
+
+    # Rebuild triangles on the clusters, dropping collapsed and repeated ones
+    loop_triangles, _ = triangulate_loops(mesh.face_sizes)
+    triangles = cluster[mesh.loops[loop_triangles]]
+    keep = ((triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2])
+            & (triangles[:, 0] != triangles[:, 2]))
+    triangles = triangles[keep]
+    # Same corners in the same cyclic order are the same triangle
+    rotation = np.argmin(triangles, axis=1)
+    canonical = np.take_along_axis(triangles, (rotation[:, None] + np.arange(3)) % 3, axis=1)
+    _, first = np.unique(canonical, axis=0, return_index=True)
+    triangles = triangles[np.sort(first)]
+
+    # Drop clusters no triangle uses any more
+    used, remap = np.unique(triangles, return_inverse=True)
+    result = MeshArrays(
+        representative[used].astype(np.float32),
+        remap.reshape(-1).astype(np.int32),
+        np.full(len(triangles), 3, dtype=np.int32),
+        mesh.smooth,
+    )
+    return result, measured
+
+
+def collapse_targets(quadrics, positions, u, v):
+    """
+    Find the best merged position and its quadric cost for edges (u, v).
+
+    The quadric minimizer is used where it is well defined; otherwise (and
+    whenever it is worse) the best of the endpoints and the midpoint.
+
+    Args:
+        quadrics (np.ndarray): (N, 4, 4) per-vertex quadrics
+        positions (np.ndarray): (N, 3) vertex positions
+        u (array-like): First endpoint per edge
+        v (array-like): Second endpoint per edge
+
+    Returns:
+        tuple: (K,) costs (summed squared plane distances) and (K, 3) positions
+    """
+    quadric = quadrics[u] + quadrics[v]
+    start, end = positions[u], positions[v]
+    candidates = np.stack([start, end, (start + end) / 2.0, (start + end) / 2.0], axis=1)
+    a = quadric[:, :3, :3]
+    solvable = np.abs(np.linalg.det(a)) > 1e-12
+    if solvable.any():
+        candidates[solvable, 3] = np.linalg.solve(a[solvable], -quadric[solvable, :3, 3:])[..., 0]
+    homogeneous = np.concatenate([candidates, np.ones(candidates.shape[:2] + (1,))], axis=2)
+    costs = np.maximum(np.einsum('kci,kij,kcj->kc', homogeneous, quadric, homogeneous), 0.0)
+    best = np.argmin(costs, axis=1)
+    rows = np.arange(len(best))
+    return costs[rows, best], candidates[rows, best]
+
+
+def collapse_decimate(mesh, max_error):
+    """
+    Simplify a closed mesh by quadric edge collapse within an error bound.
+
+    Every collapse moves the merged vertex to the point minimizing its summed
+    squared distance to the original face planes it represents, and is only
+    applied while that distance stays within max_error. Collapses that would
+    make the surface non-manifold or flip a triangle are skipped.
+
+    Args:
+        mesh (MeshArrays): Source mesh
+        max_error (float): Maximum distance from original face planes
+
+    Returns:
+        tuple: (MeshArrays of triangles, largest error of an applied collapse)
+    """
+    if max_error <= 0 or len(mesh.vertices) == 0:
+        return mesh, 0.0
+
+    positions = mesh.vertices.astype(np.float64)
+    loop_triangles, _ = triangulate_loops(mesh.face_sizes)
+    triangles = mesh.loops[loop_triangles].astype(np.int64)
+
+    # Fundamental quadric of every triangle plane, summed per vertex
+    corners = positions[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    valid = lengths > 0
+    triangles, corners, normals = triangles[valid], corners[valid], normals[valid] / lengths[valid, None]
+    planes = np.concatenate([normals, -np.einsum('ij,ij->i', normals, corners[:, 0])[:, None]], axis=1)
+    quadrics = np.zeros((len(positions), 4, 4))
+    for corner in range(3):
+        np.add.at(quadrics, triangles[:, corner], planes[:, :, None] * planes[:, None, :])
+
+    faces = triangles.tolist()
+    vertex_faces = [set() for _ in range(len(positions))]
+    for index, face in enumerate(faces):
+        for vertex in face:
+            vertex_faces[vertex].add(index)
+    stamps = [0] * len(positions)
+    removed = [False] * len(positions)
+    bound = max_error * max_error
+
+    def neighbours(vertex):
+        return {w for f in vertex_faces[vertex] for w in faces[f]} - {vertex}
+
+    edges = np.unique(np.sort(np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]],
+                                              triangles[:, [2, 0]]]), axis=1), axis=0)
+    costs, _ = collapse_targets(quadrics, positions, edges[:, 0], edges[:, 1])
+    heap = [(cost, u, v, 0, 0) for cost, (u, v) in zip(costs.tolist(), edges.tolist()) if cost <= bound]
+    heapq.heapify(heap)
+
+    measured = 0.0
+    while heap:
+        cost, u, v, stamp_u, stamp_v = heapq.heappop(heap)
+        if removed[u] or removed[v] or stamps[u] != stamp_u or stamps[v] != stamp_v:
+            continue
+        shared = vertex_faces[u] & vertex_faces[v]
+        # Link condition: the edge's endpoints may only share the vertices
+        # of the two triangles on the edge, or the surface pinches
+        if len(neighbours(u) & neighbours(v)) != len(shared):
+            continue
+        costs, targets = collapse_targets(quadrics, positions, [u], [v])
+        cost, target = float(costs[0]), targets[0]
+
+        # Reject collapses that flip (or flatten) any remaining triangle
+        around = np.array([faces[f] for f in (vertex_faces[u] | vertex_faces[v]) - shared], dtype=np.int64)
+        if len(around):
+            before = positions[around]
+            after = before.copy()
+            after[(around == u) | (around == v)] = target
+            old = np.cross(before[:, 1] - before[:, 0], before[:, 2] - before[:, 0])
+            new = np.cross(after[:, 1] - after[:, 0], after[:, 2] - after[:, 0])
+            if (np.einsum('ij,ij->i', old, new) <= 0).any():
+                continue
+
+        # Collapse v into u
+        positions[u] = target
+        quadrics[u] += quadrics[v]
+        for f in shared:
+            for w in faces[f]:
+                vertex_faces[w].discard(f)
+        for f in vertex_faces[v]:
+            faces[f] = [u if w == v else w for w in faces[f]]
+            vertex_faces[u].add(f)
+        vertex_faces[v] = set()
+        removed[v] = True
+        stamps[u] += 1
+        measured = max(measured, math.sqrt(cost))
+
+        ring = list(neighbours(u))
+        if ring:
+            costs, _ = collapse_targets(quadrics, positions, [u] * len(ring), ring)
+            for next_cost, w in zip(costs.tolist(), ring):
+                if next_cost <= bound:
+                    heapq.heappush(heap, (next_cost, u, w, stamps[u], stamps[w]))
+
+    live = sorted({f for fs in vertex_faces for f in fs})
+    remaining = np.array([faces[f] for f in live], dtype=np.int64).reshape(-1, 3)
+    used, remap = np.unique(remaining, return_inverse=True)
+    result = MeshArrays(
+        positions[used].astype(np.float32),
+        remap.reshape(-1).astype(np.int32),
+        np.full(len(remaining), 3, dtype=np.int32),
+        mesh.smooth,
+    )
+    return result, measured
+
+
+def decimate(mesh, max_error):
+    """
+    Simplify a mesh within an error bound.
+
+    Args:
+        mesh (MeshArrays): Source mesh
+        max_error (float): Error budget in meters
+
+    Returns:
+        tuple: (simplified MeshArrays, measured error)
+    """
+    if max_error <= 0:
+        return mesh, 0.0
+    clustered_error = 0.0
+    if len(mesh.vertices) > CLUSTER_VERTEX_LIMIT:
+        max_error /= 2.0
+        mesh, clustered_error = cluster_decimate(mesh, max_error)
+    mesh, collapse_error = collapse_decimate(mesh, max_error)
+    return mesh, clustered_error + collapse_error
+
+
+def lod_chain(mesh, errors=DEFAULT_LOD_ERRORS):
+    """
+    Build a chain of increasingly simplified meshes.
+
+    Each level is decimated from the source, so errors do not accumulate.
+
+    Args:
+        mesh (MeshArrays): Source mesh (LOD0 when errors start with 0)
+        errors (tuple): Maximum vertex displacement per level
+
+    Returns:
+        list: (MeshArrays, measured error) per level
+    """
+    return [decimate(mesh, error) for error in errors]
+
+
+def switch_distance(error, vertical_fov_degrees=DEFAULT_VERTICAL_FOV_DEGREES,
+                    screen_height_px=DEFAULT_SCREEN_HEIGHT_PX, pixel_error=DEFAULT_PIXEL_ERROR):
+    """
+    Distance beyond which a geometric error projects to under pixel_error pixels.
+
+    Args:
+        error (float): Geometric error in meters
+        vertical_fov_degrees (float): Vertical field of view
+        screen_height_px (int): Vertical resolution
+        pixel_error (float): Acceptable error on screen in pixels
+
+    Returns:
+        float: Distance in meters (0 for an exact level)
+    """
+    pixels_per_radian = (screen_height_px / 2.0) / math.tan(math.radians(vertical_fov_degrees) / 2.0)
+    return error * pixels_per_radian / pixel_error
+
+
+def screen_coverage(radius, distance, vertical_fov_degrees=DEFAULT_VERTICAL_FOV_DEGREES):
+    """
+    Fraction of the screen height covered by a bounding sphere at a distance.
+
+    Args:
+        radius (float): Bounding sphere radius
+        distance (float): Viewing distance (0 means the object fills the view)
+
+    Returns:
+        float: Coverage in [0, 1]
+    """
+    if distance <= 0:
+        return 1.0
+    view_height = 2.0 * distance * math.tan(math.radians(vertical_fov_degrees) / 2.0)
+    return min(1.0, 2.0 * radius / view_height)
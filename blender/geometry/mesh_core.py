@@ -0,0 +1,607 @@
+"""
+Mesh Core Module
+
+Blender-independent NumPy geometry for every shelf component. Meshes are
+described as welded polygon topology (MeshArrays), which loads directly into
+Blender, and render_arrays() expands them to the vertex, normal, UV and
+triangle index arrays used by exporters. Nothing here imports bpy.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# vertices: (N, 3) float32 positions
+# loops: (L,) int32 vertex index of every face corner, faces stored back to back
+# face_sizes: (F,) int32 number of corners per face
+# smooth: True to share normals across faces, False for flat shading
+MeshArrays = namedtuple('MeshArrays', ['vertices', 'loops', 'face_sizes', 'smooth'])
+
+# Corner order of the six box faces, wound counter-clockwise seen from outside
+_BOX_CORNERS = np.array([
+    [-0.5, -0.5, -0.5], [0.5, -0.5, -0.5], [0.5, 0.5, -0.5], [-0.5, 0.5, -0.5],
+    [-0.5, -0.5, 0.5], [0.5, -0.5, 0.5], [0.5, 0.5, 0.5], [-0.5, 0.5, 0.5],
+], dtype=np.float32)
+_BOX_FACES = np.array([
+    [0, 3, 2, 1],   # -Z
+    [4, 5, 6, 7],   # +Z
+    [0, 1, 5, 4],   # -Y
+    [2, 3, 7, 6],   # +Y
+    [1, 2, 6, 5],   # +X
+    [3, 0, 4, 7],   # -X
+], dtype=np.int32)
+
+
+def box_arrays(size_x, size_y, size_z):
+    """
+    Create an axis-aligned box centered on the origin.
+
+    Args:
+        size_x (float): Extent along X
+        size_y (float): Extent along Y
+        size_z (float): Extent along Z
+
+    Returns:
+        MeshArrays: 8 vertices and 6 quads
+    """
+    vertices = _BOX_CORNERS * np.array([size_x, size_y, size_z], dtype=np.float32)
+    return MeshArrays(vertices, _BOX_FACES.ravel().copy(), np.full(6, 4, dtype=np.int32), False)
+
+
+def shelf_box_arrays(width=2.0, height=0.1, depth=0.4):
+    """
+    Create the main shelf body (same dimensions as create_main_shelf).
+
+    Args:
+        width (float): Width of the shelf (X)
+        height (float): Height (thickness) of the shelf (Z)
+        depth (float): Depth of the shelf (Y)
+
+    Returns:
+        MeshArrays: The shelf box
+    """
+    return box_arrays(width, depth, height)
+
+
+def backing_slab_arrays(width=2.2, height=1.5, thickness=0.02):
+    """
+    Create the backing slab (same dimensions as create_backing_plane).
+
+    Args:
+        width (float): Width of the backing (X)
+        height (float): Height of the backing (Z)
+        thickness (float): Thickness of the backing (Y)
+
+    Returns:
+        MeshArrays: The backing box
+    """
+    return box_arrays(width, thickness, height)
+
+
+def bracket_prism_arrays(length=0.6, height=0.3, thickness=0.1):
+    """
+    Create a triangular bracket prism (same shape as create_bracket_support).
+
+    The triangle hangs down from the origin along -Z and is extruded along +Y.
+
+    Args:
+        length (float): Length of the bracket (X)
+        height (float): Height of the bracket (Z)
+        thickness (float): Thickness of the bracket (Y)
+
+    Returns:
+        MeshArrays: 6 vertices, 2 triangles and 3 quads
+    """
+    vertices = np.array([
+        [0, 0, 0], [length, 0, 0], [0, 0, -height],
+        [0, thickness, 0], [length, thickness, 0], [0, thickness, -height],
+    ], dtype=np.float32)
+    loops = np.array([
+        0, 2, 1,        # Front triangle (-Y)
+        3, 4, 5,        # Back triangle (+Y)
+        0, 1, 4, 3,     # Top
+        1, 2, 5, 4,     # Slope
+        2, 0, 3, 5,     # Back edge (against the backing)
+    ], dtype=np.int32)
+    face_sizes = np.array([3, 3, 4, 4, 4], dtype=np.int32)
+    return MeshArrays(vertices, loops, face_sizes, False)
+
+
+def crown_ovoid_arrays(width=2.2, height=0.15, depth=0.1, u_segments=16, v_segments=8):
+    """
+    Create the crown ovoid (same shape as create_crown_topper).
+
+    Like the bmesh version, this is a unit UV sphere scaled by
+    (width, depth, height), so those values are the semi-axes.
+
+    Args:
+        width (float): Semi-axis along X
+        height (float): Semi-axis along Z
+        depth (float): Semi-axis along Y
+        u_segments (int): Segments around the equator
+        v_segments (int): Rings from pole to pole
+
+    Returns:
+        MeshArrays: The ovoid with triangle fans at the poles and quads elsewhere
+    """
+    rings = v_segments - 1
+    theta = np.pi * np.arange(1, v_segments) / v_segments            # Polar angle per ring
+    phi = 2.0 * np.pi * np.arange(u_segments) / u_segments           # Azimuth per segment
+
+    sin_theta = np.sin(theta)[:, None]
+    ring_vertices = np.stack([
+        (sin_theta * np.cos(phi)[None, :]).ravel(),
+        (sin_theta * np.sin(phi)[None, :]).ravel(),
+        np.repeat(np.cos(theta), u_segments),
+    ], axis=1)
+    vertices = np.vstack([[0.0, 0.0, 1.0], ring_vertices, [0.0, 0.0, -1.0]])
+    vertices = (vertices * np.array([width, depth, height])).astype(np.float32)
+
+    top = 0
+    bottom = len(vertices) - 1
+    seg = np.arange(u_segments)
+    nxt = (seg + 1) % u_segments
+
+    # Pole fans
+    top_fan = np.stack([np.full(u_segments, top), 1 + seg, 1 + nxt], axis=1)
+    last_ring = 1 + (rings - 1) * u_segments
+    bottom_fan = np.stack([np.full(u_segments, bottom), last_ring + nxt, last_ring + seg], axis=1)
+
+    # Quads between consecutive rings
+    ring = np.arange(rings - 1)[:, None]
+    upper = 1 + ring * u_segments
+    lower = upper + u_segments
+    quads = np.stack([
+        (upper + seg).ravel(), (lower + seg).ravel(),
+        (lower + nxt).ravel(), (upper + nxt).ravel(),
+    ], axis=1)
+
+    loops = np.concatenate([top_fan.ravel(), quads.ravel(), bottom_fan.ravel()]).astype(np.int32)
+    face_sizes = np.concatenate([
+        np.full(u_segments, 3), np.full(len(quads), 4), np.full(u_segments, 3),
+    ]).astype(np.int32)
+    return MeshArrays(vertices, loops, face_sizes, False)
+
+
+def molding_arrays(width=2.1, segments=8, molding_depth=0.05, molding_height=0.03):
+    """
+    Create decorative molding (same shape as create_decorative_molding).
+
+    Every box face is subdivided into a (segments + 1) x (segments + 1) grid,
+    matching bmesh subdivide_edges with grid fill.
+
+    Args:
+        width (float): Width of the molding (X)
+        segments (int): Number of cuts per edge
+        molding_depth (float): Depth of the molding (Y)
+        molding_height (float): Height of the molding (Z)
+
+    Returns:
+        MeshArrays: The subdivided box with welded grid seams
+    """
+    cells = segments + 1
+    t = np.linspace(0.0, 1.0, cells + 1)
+    u, v = np.meshgrid(t, t, indexing='ij')
+
+    # Bilinear grid over each box face; corners a, b, c, d in face winding order
+    corners = _BOX_CORNERS[_BOX_FACES]
+    a, b, c, d = (corners[:, i, None, None, :] for i in range(4))
+    u = u[None, :, :, None]
+    v = v[None, :, :, None]
+    grid = (a * (1 - u) * (1 - v) + b * u * (1 - v) + c * u * v + d * (1 - u) * v)
+    points = grid.reshape(-1, 3)
+
+    # Quads per face grid, indexed into the unwelded points
+    i, j = np.meshgrid(np.arange(cells), np.arange(cells), indexing='ij')
+    base = (i * (cells + 1) + j).ravel()
+    face_quads = np.stack([base, base + cells + 1, base + cells + 2, base + 1], axis=1)
+    offsets = (np.arange(6) * (cells + 1) ** 2)[:, None, None]
+    quads = (face_quads[None, :, :] + offsets).reshape(-1, 4)
+
+    # Weld the seams shared by neighbouring faces
+    keys = np.round(points * (4 * cells), 0).astype(np.int64)
+    unique_keys, first, remap = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    vertices = points[first] * np.array([width, molding_depth, molding_height])
+
+    loops = remap.reshape(-1)[quads].ravel().astype(np.int32)
+    return MeshArrays(vertices.astype(np.float32), loops, np.full(len(quads), 4, dtype=np.int32), False)
+
+
+def face_starts(face_sizes):
+    """
+    Get the index of the first loop of every face.
+
+    Args:
+        face_sizes (np.ndarray): Corners per face
+
+    Returns:
+        np.ndarray: Loop start per face
+    """
+    starts = np.zeros(len(face_sizes), dtype=np.int64)
+    np.cumsum(face_sizes[:-1], out=starts[1:])
+    return starts
+
+
+def triangulate_loops(face_sizes):
+    """
+    Fan-triangulate faces.
+
+    Args:
+        face_sizes (np.ndarray): Corners per face
+
+    Returns:
+        tuple: (M, 3) loop indices of every triangle and (M,) owning face index
+    """
+    face_sizes = np.asarray(face_sizes, dtype=np.int64)
+    tris_per_face = face_sizes - 2
+    face_of_tri = np.repeat(np.arange(len(face_sizes)), tris_per_face)
+
+    # k runs 1..n-2 within each face
+    tri_starts = face_starts(tris_per_face)
+    k = np.arange(len(face_of_tri)) - np.repeat(tri_starts, tris_per_face) + 1
+
+    start = face_starts(face_sizes)[face_of_tri]
+    triangles = np.stack([start, start + k, start + k + 1], axis=1)
+    return triangles, face_of_tri
+
+
+def face_normals(mesh):
+    """
+    Compute unit face normals with Newell's method.
+
+    Args:
+        mesh (MeshArrays): The mesh
+
+    Returns:
+        np.ndarray: (F, 3) face normals
+    """
+    starts = face_starts(mesh.face_sizes)
+    face_of_loop = np.repeat(np.arange(len(mesh.face_sizes)), mesh.face_sizes)
+    position_in_face = np.arange(len(mesh.loops)) - starts[face_of_loop]
+    next_loop = starts[face_of_loop] + (position_in_face + 1) % mesh.face_sizes[face_of_loop]
+
+    current = mesh.vertices[mesh.loops].astype(np.float64)
+    following = mesh.vertices[mesh.loops[next_loop]].astype(np.float64)
+    terms = np.cross(current, following)
+
+    normals = np.zeros((len(mesh.face_sizes), 3))
+    np.add.at(normals, face_of_loop, terms)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.where(lengths > 0, lengths, 1.0)
+
+
+def box_project_uvs(positions, normals):
+    """
+    Generate UVs by projecting every corner along its dominant normal axis.
+
+    Args:
+        positions (np.ndarray): (N, 3) positions
+        normals (np.ndarray): (N, 3) normals
+
+    Returns:
+        np.ndarray: (N, 2) UVs in [0, 1]
+    """
+    low = positions.min(axis=0)
+    extent = positions.max(axis=0) - low
+    extent[extent == 0] = 1.0
+    local = (positions - low) / extent
+
+    axis = np.argmax(np.abs(normals), axis=1)
+    # Use the two remaining axes for U and V
+    u_axis = np.where(axis == 0, 1, 0)
+    v_axis = np.where(axis == 2, 1, 2)
+    rows = np.arange(len(positions))
+    return np.stack([local[rows, u_axis], local[rows, v_axis]], axis=1).astype(np.float32)
+
+
+def render_arrays(mesh):
+    """
+    Expand a mesh to render-ready vertex arrays.
+
+    Flat meshes get one vertex per face corner so every face keeps its own
+    normal; smooth meshes share vertices and use area-weighted normals.
+
+    Args:
+        mesh (MeshArrays): The mesh
+
+    Returns:
+        dict: 'positions' (N, 3) float32, 'normals' (N, 3) float32,
+            'uvs' (N, 2) float32 and 'indices' (M * 3,) uint32
+    """
+    loop_triangles, face_of_tri = triangulate_loops(mesh.face_sizes)
+    normals_per_face = face_normals(mesh)
+
+    if mesh.smooth:
+        positions = mesh.vertices
+        triangles = mesh.loops[loop_triangles]
+        face_of_loop = np.repeat(np.arange(len(mesh.face_sizes)), mesh.face_sizes)
+        normals = np.zeros((len(positions), 3))
+        np.add.at(normals, mesh.loops, normals_per_face[face_of_loop])
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = normals / np.where(lengths > 0, lengths, 1.0)
+    else:
+        positions = mesh.vertices[mesh.loops]
+        triangles = loop_triangles
+        normals = np.repeat(normals_per_face, mesh.face_sizes, axis=0)
+
+    positions = np.ascontiguousarray(positions, dtype=np.float32)
+    normals = np.ascontiguousarray(normals, dtype=np.float32)
+    return {
+        'positions': positions,
+        'normals': normals,
+        'uvs': box_project_uvs(positions, normals),
+        'indices': np.ascontiguousarray(triangles.ravel(), dtype=np.uint32),
+    }
+
+
+def pegboard_hole_centers(width, height, hole_spacing):
+    """
+    Compute the pegboard hole grid in one vectorized step.
+
+    Holes are spread over the central 90% of the board, as many per axis as
+    hole_spacing allows.
+
+    Args:
+        width (float): Board width (X)
+        height (float): Board height (Z)
+        hole_spacing (float): Nominal distance between holes
+
+    Returns:
+        tuple: (X centers, Z centers) as 1D float arrays
+    """
+    holes_x = int(width / hole_spacing)
+    holes_z = int(height / hole_spacing)
+    pitch_x = width * 0.9 / max(holes_x, 1)
+    pitch_z = height * 0.9 / max(holes_z, 1)
+    centers_x = (np.arange(holes_x) - (holes_x - 1) / 2.0) * pitch_x
+    centers_z = (np.arange(holes_z) - (holes_z - 1) / 2.0) * pitch_z
+    return centers_x, centers_z
+
+
+def pegboard_arrays(width=2.2, height=1.5, thickness=0.02, hole_spacing=0.1, hole_diameter=0.01):
+    """
+    Create a perforated backing slab with square through-holes.
+
+    The front and back faces are a grid whose lines run along the hole edges,
+    with the hole cells left out; every hole gets four wall quads and the rim
+    is split along the same grid lines so the mesh stays closed. All faces are
+    generated with array arithmetic, never per hole.
+
+    Args:
+        width (float): Width of the board (X)
+        height (float): Height of the board (Z)
+        thickness (float): Thickness of the board (Y)
+        hole_spacing (float): Nominal distance between holes
+        hole_diameter (float): Width of each (square) hole
+
+    Returns:
+        MeshArrays: The perforated slab (a plain slab if no holes fit)
+    """
+    centers_x, centers_z = pegboard_hole_centers(width, height, hole_spacing)
+    if len(centers_x) == 0 or len(centers_z) == 0:
+        return backing_slab_arrays(width, height, thickness)
+
+    # Keep a wall of material between neighbouring holes
+    pitch = min(np.diff(centers_x).min() if len(centers_x) > 1 else width,
+                np.diff(centers_z).min() if len(centers_z) > 1 else height)
+    radius = min(hole_diameter / 2.0, 0.45 * pitch)
+
+    xs = np.concatenate([[-width / 2.0], np.stack([centers_x - radius, centers_x + radius], 1).ravel(),
+                         [width / 2.0]])
+    zs = np.concatenate([[-height / 2.0], np.stack([centers_z - radius, centers_z + radius], 1).ravel(),
+                         [height / 2.0]])
+    return grid_slab_arrays(xs, zs, thickness, holes=True)
+
+
+def grid_slab_arrays(xs, zs, thickness, holes=False):
+    """
+    Create a slab whose front and back faces are split along a grid.
+
+    Args:
+        xs (np.ndarray): Increasing X grid lines, outer edges included
+        zs (np.ndarray): Increasing Z grid lines, outer edges included
+        thickness (float): Thickness of the slab (Y)
+        holes (bool): Leave out every cell with odd X and Z index and wall
+            it (the pegboard_arrays() layout)
+
+    Returns:
+        MeshArrays: The closed slab
+    """
+    nx, nz = len(xs), len(zs)
+    per_side = nx * nz
+
+    # Grid vertices: side 0 is the front (-Y), side 1 the back (+Y)
+    gx, gz = np.meshgrid(xs, zs, indexing='ij')
+    side = np.array([-thickness / 2.0, thickness / 2.0])
+    vertices = np.stack([
+        np.tile(gx.ravel(), 2),
+        np.repeat(side, per_side),
+        np.tile(gz.ravel(), 2),
+    ], axis=1).astype(np.float32)
+
+    def vid(i, j, s):
+        return s * per_side + i * nz + j
+
+    # Front and back faces for every non-hole cell
+    ci, cj = np.meshgrid(np.arange(nx - 1), np.arange(nz - 1), indexing='ij')
+    solid = ~((ci % 2 == 1) & (cj % 2 == 1)) if holes else np.ones(ci.shape, dtype=bool)
+    ci, cj = ci[solid], cj[solid]
+    front = np.stack([vid(ci, cj, 0), vid(ci + 1, cj, 0), vid(ci + 1, cj + 1, 0), vid(ci, cj + 1, 0)], 1)
+    back = np.stack([vid(ci, cj, 1), vid(ci, cj + 1, 1), vid(ci + 1, cj + 1, 1), vid(ci + 1, cj, 1)], 1)
+
+    # Hole walls, facing into the hole
+    wall_cells = np.arange(1, nx - 1, 2) if holes else np.arange(0)
+    hi, hj = np.meshgrid(wall_cells, np.arange(1, nz - 1, 2), indexing='ij')
+    hi, hj = hi.ravel(), hj.ravel()
+    walls = np.concatenate([
+        np.stack([vid(hi, hj, 0), vid(hi, hj, 1), vid(hi, hj + 1, 1), vid(hi, hj + 1, 0)], 1),
+        np.stack([vid(hi + 1, hj, 0), vid(hi + 1, hj + 1, 0), vid(hi + 1, hj + 1, 1), vid(hi + 1, hj, 1)], 1),
+        np.stack([vid(hi, hj, 0), vid(hi + 1, hj, 0), vid(hi + 1, hj, 1), vid(hi, hj, 1)], 1),
+        np.stack([vid(hi, hj + 1, 0), vid(hi, hj + 1, 1), vid(hi + 1, hj + 1, 1), vid(hi + 1, hj + 1, 0)], 1),
+    ])
+
+    # Outer rim, split along the grid lines
+    ri = np.arange(nx - 1)
+    rj = np.arange(nz - 1)
+    bottom, top = np.zeros_like(ri), np.full_like(ri, nz - 1)
+    left, right = np.zeros_like(rj), np.full_like(rj, nx - 1)
+    rim = np.concatenate([
+        np.stack([vid(ri, bottom, 0), vid(ri, bottom, 1), vid(ri + 1, bottom, 1), vid(ri + 1, bottom, 0)], 1),
+        np.stack([vid(ri, top, 0), vid(ri + 1, top, 0), vid(ri + 1, top, 1), vid(ri, top, 1)], 1),
+        np.stack([vid(left, rj, 0), vid(left, rj + 1, 0), vid(left, rj + 1, 1), vid(left, rj, 1)], 1),
+        np.stack([vid(right, rj, 0), vid(right, rj, 1), vid(right, rj + 1, 1), vid(right, rj + 1, 0)], 1),
+    ])
+
+    quads = np.concatenate([front, back, walls, rim]).astype(np.int32)
+    return MeshArrays(vertices, quads.ravel(), np.full(len(quads), 4, dtype=np.int32), False)
+
+
+def pegboard_texture_mapping(width=2.2, height=1.5, hole_spacing=0.1, hole_diameter=0.01):
+    """
+    Describe how a one-hole texture tile maps onto the backing slab.
+
+    The tile repeats once per hole at the same pitch as pegboard_arrays(), with
+    tile centers on the hole centers, so both pegboard modes line up. Tiles
+    only cover the hole area, the central 90% of the board; pegboard_uvs()
+    clamps the margin outside it to the solid tile edge.
+
+    Args:
+        width (float): Width of the board (X)
+        height (float): Height of the board (Z)
+        hole_spacing (float): Nominal distance between holes
+        hole_diameter (float): Width of each (square) hole
+
+    Returns:
+        dict: 'scale' and 'offset' (U, V) taking local X/Z to tile space,
+            'holes' (U, V) giving the number of tiles, 'extent' (X, Z) the
+            half size of the tiled area and 'hole_fraction' (U, V) the hole
+            size within one tile (0 when no holes fit)
+    """
+    centers_x, centers_z = pegboard_hole_centers(width, height, hole_spacing)
+    holes_x, holes_z = len(centers_x), len(centers_z)
+    pitch_x = width * 0.9 / max(holes_x, 1)
+    pitch_z = height * 0.9 / max(holes_z, 1)
+    fraction = (0.0, 0.0)
+    if holes_x and holes_z:
+        fraction = (min(hole_diameter / pitch_x, 0.9), min(hole_diameter / pitch_z, 0.9))
+    return {
+        'scale': (1.0 / pitch_x, 1.0 / pitch_z),
+        'offset': (holes_x / 2.0, holes_z / 2.0),
+        'holes': (holes_x, holes_z),
+        'extent': (holes_x * pitch_x / 2.0, holes_z * pitch_z / 2.0),
+        'hole_fraction': fraction,
+    }
+
+
+def pegboard_texture_slab_arrays(width=2.2, height=1.5, thickness=0.02, hole_spacing=0.1):
+    """
+    Create the backing slab for texture mode.
+
+    The front and back faces are split along the edge of the tiled area
+    (see pegboard_texture_mapping()), so the margin has faces of its own
+    whose clamped UVs stay on solid texels.
+
+    Args:
+        width (float): Width of the board (X)
+        height (float): Height of the board (Z)
+        thickness (float): Thickness of the board (Y)
+        hole_spacing (float): Nominal distance between holes
+
+    Returns:
+        MeshArrays: The split slab (a plain slab if no holes fit)
+    """
+    mapping = pegboard_texture_mapping(width, height, hole_spacing)
+    if not all(mapping['holes']):
+        return backing_slab_arrays(width, height, thickness)
+    extent_x, extent_z = mapping['extent']
+    xs = np.array([-width / 2.0, -extent_x, extent_x, width / 2.0])
+    zs = np.array([-height / 2.0, -extent_z, extent_z, height / 2.0])
+    return grid_slab_arrays(xs, zs, thickness)
+
+
+def pegboard_uvs(positions, mapping):
+    """
+    Project corners onto the pegboard texture along the board normal (Y).
+
+    UVs are clamped to the tiled area, so corners in the margin land on the
+    solid edge of the outermost tiles.
+
+    Args:
+        positions (np.ndarray): (N, 3) local positions
+        mapping (dict): Result of pegboard_texture_mapping()
+
+    Returns:
+        np.ndarray: (N, 2) float32 UVs in tile units
+    """
+    positions = np.asarray(positions)
+    scale = np.asarray(mapping['scale'])
+    offset = np.asarray(mapping['offset'])
+    uvs = np.clip(positions[:, [0, 2]] * scale + offset, 0.0, np.asarray(mapping['holes'], dtype=float))
+    return uvs.astype(np.float32)
+
+
+def pegboard_texture_hole_count(uvs, mapping):
+    """
+    Count the holes a texture-mode board shows.
+
+    Every tile center (k + 0.5 in tile units) inside the UV range draws one
+    hole, so this is what the client sees, independent of
+    pegboard_hole_centers().
+
+    Args:
+        uvs (np.ndarray): (N, 2) UVs from pegboard_uvs()
+        mapping (dict): Result of pegboard_texture_mapping()
+
+    Returns:
+        int: Number of holes drawn
+    """
+    if not len(uvs) or not all(mapping['hole_fraction']):
+        return 0
+    uvs = np.asarray(uvs, dtype=np.float64)
+    low = np.ceil(uvs.min(axis=0) - 0.5)
+    high = np.floor(uvs.max(axis=0) - 0.5)
+    return int(np.prod(np.maximum(high - low + 1, 0)))
+
+
+def transform_arrays(mesh, matrix):
+    """
+    Bake a transform into a mesh.
+
+    Mirroring transforms (negative determinant) also reverse the corner
+    order of every face, so faces keep pointing outward.
+
+    Args:
+        mesh (MeshArrays): The mesh
+        matrix (np.ndarray): 4x4 transform
+
+    Returns:
+        MeshArrays: The transformed mesh
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    vertices = (mesh.vertices @ matrix[:3, :3].T + matrix[:3, 3]).astype(np.float32)
+    loops = mesh.loops
+    if np.linalg.det(matrix[:3, :3]) < 0:
+        starts = np.repeat(face_starts(mesh.face_sizes), mesh.face_sizes)
+        ends = starts + np.repeat(mesh.face_sizes, mesh.face_sizes) - 1
+        loops = loops[starts + ends - np.arange(len(loops))]
+    return MeshArrays(vertices, loops, mesh.face_sizes, mesh.smooth)
+
+
+def merge_arrays(meshes):
+    """
+    Concatenate meshes into one.
+
+    Args:
+        meshes (list): MeshArrays with the same smooth setting
+
+    Returns:
+        MeshArrays: The combined mesh
+    """
+    offsets = np.cumsum([0] + [len(mesh.vertices) for mesh in meshes[:-1]])
+    return MeshArrays(
+        np.concatenate([mesh.vertices for mesh in meshes]).astype(np.float32),
+        np.concatenate([mesh.loops + offset for mesh, offset in zip(meshes, offsets)]).astype(np.int32),
+        np.concatenate([mesh.face_sizes for mesh in meshes]).astype(np.int32),
+        meshes[0].smooth,
+    )
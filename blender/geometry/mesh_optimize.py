@@ -0,0 +1,308 @@
+"""
+Mesh Optimization Module
+
+Reorders render arrays (see mesh_core.render_arrays) for the GPU before they
+are written out:
+
+1. Vertex deduplication: corners with identical position, normal and UV
+   become one vertex.
+2. Post-transform vertex cache optimization with Tipsify (Sander, Nehab and
+   Barczak, "Fast Triangle Reordering for Vertex Locality and Reduced
+   Overdraw", 2007).
+3. Overdraw ordering: the Tipsify clusters are sorted so that outward
+   facing clusters, which tend to occlude the rest, are drawn first.
+4. Vertex fetch remapping: vertices are renumbered in order of first use.
+
+Cache efficiency is measured as ACMR (average cache miss ratio: vertex
+shader invocations per triangle) on a FIFO cache. Nothing here imports bpy.
+"""
+
+import numpy as np
+
+
+# Post-transform cache entries assumed by the optimizer (typical for
+# mobile GPUs; larger desktop caches only do better)
+DEFAULT_CACHE_SIZE = 16
+
+# Overdraw clusters may cost at most this much ACMR over the cache order
+DEFAULT_OVERDRAW_THRESHOLD = 1.05
+
+VERTEX_ATTRIBUTES = ('positions', 'normals', 'uvs')
+
+
+def acmr(indices, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Average cache miss ratio of a triangle list on a FIFO vertex cache.
+
+    Args:
+        indices (np.ndarray): Triangle list indices
+        cache_size (int): Cache entries
+
+    Returns:
+        float: Cache misses per triangle (0.5 is ideal for large grids, 3 is
+            the worst case)
+    """
+    triangles = len(indices) // 3
+    if triangles == 0:
+        return 0.0
+    return cache_misses(indices, cache_size).sum() / triangles
+
+
+def cache_misses(indices, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Simulate a FIFO vertex cache.
+
+    Args:
+        indices (np.ndarray): Triangle list indices
+        cache_size (int): Cache entries
+
+    Returns:
+        np.ndarray: Misses per triangle
+    """
+    # A vertex is cached while fewer than cache_size misses happened since
+    # it was last loaded
+    loaded = {}
+    misses = 0
+    per_triangle = np.zeros(len(indices) // 3, dtype=np.int64)
+    for position, vertex in enumerate(indices.tolist()):
+        if misses - loaded.get(vertex, -cache_size - 1) > cache_size:
+            loaded[vertex] = misses
+            misses += 1
+            per_triangle[position // 3] += 1
+    return per_triangle
+
+
+def deduplicate_vertices(arrays):
+    """
+    Merge vertices whose attributes are bit-identical.
+
+    Args:
+        arrays (dict): Render arrays
+
+    Returns:
+        dict: Render arrays with unique vertices
+    """
+    attributes = [np.ascontiguousarray(arrays[name], dtype=np.float32)
+                  for name in VERTEX_ATTRIBUTES if arrays.get(name) is not None]
+    if not len(attributes[0]):
+        return arrays
+    rows = np.ascontiguousarray(np.concatenate(attributes, axis=1))
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+    _, first, remap = np.unique(keys, return_index=True, return_inverse=True)
+    result = dict(arrays)
+    for name in VERTEX_ATTRIBUTES:
+        if arrays.get(name) is not None:
+            result[name] = np.ascontiguousarray(arrays[name][first])
+    result['indices'] = remap.reshape(-1)[arrays['indices']].astype(np.uint32)
+    return result
+
+
+def tipsify(indices, vertex_count, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Reorder triangles for the post-transform vertex cache.
+
+    Triangles are emitted as fans around a sequence of vertices; the next
+    fanning vertex is the neighbour that will still be in the cache after
+    its remaining triangles are emitted. When no neighbour qualifies the
+    order jumps (a dead end), which starts a new cluster.
+
+    Args:
+        indices (np.ndarray): Triangle list indices
+        vertex_count (int): Number of vertices
+        cache_size (int): Cache entries
+
+    Returns:
+        tuple: (reordered triangle indices into the input triangle list,
+            start offsets of the clusters)
+    """
+    triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    count = len(triangles)
+    # Vertex -> triangle adjacency in CSR form
+    corner_vertex = triangles.ravel()
+    order = np.argsort(corner_vertex, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(corner_vertex, minlength=vertex_count))]).tolist()
+    adjacency = (order // 3).tolist()
+    corners = triangles.tolist()
+
+    live = np.diff(offsets).tolist()
+    stamps = [0] * vertex_count
+    emitted = [False] * count
+    dead_ends = []
+    output = []
+    clusters = []
+    time = cache_size + 1
+    cursor = 0
+    fanning = 0 if count else -1
+    jumped = True
+
+    while fanning >= 0:
+        if jumped:
+            clusters.append(len(output))
+        candidates = []
+        for t in adjacency[offsets[fanning]:offsets[fanning + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = True
+            output.append(t)
+            for v in corners[t]:
+                dead_ends.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time - stamps[v] > cache_size:
+                    stamps[v] = time
+                    time += 1
+
+        # Best neighbour: the oldest one still in cache after its fan
+        best, best_priority = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = 0
+                if time - stamps[v] + 2 * live[v] <= cache_size:
+                    priority = time - stamps[v]
+                if priority > best_priority:
+                    best, best_priority = v, priority
+        jumped = best < 0
+        if jumped:
+            while dead_ends and best < 0:
+                v = dead_ends.pop()
+                if live[v] > 0:
+                    best = v
+            while best < 0 and cursor < vertex_count:
+                if live[cursor] > 0:
+                    best = cursor
+                cursor += 1
+        fanning = best
+
+    return np.array(output, dtype=np.int64), np.array(clusters, dtype=np.int64)
+
+
+def soft_boundaries(indices, clusters, cache_size=DEFAULT_CACHE_SIZE, threshold=DEFAULT_OVERDRAW_THRESHOLD):
+    """
+    Split cache-ordered clusters further where that costs little ACMR.
+
+    Smaller clusters give the overdraw sort more freedom. Clusters may end
+    up drawn in any order, so each piece is measured from a cold cache, and
+    a cluster is only cut where the piece since the last cut stays within
+    threshold of the whole cluster's ACMR.
+
+    Args:
+        indices (np.ndarray): Cache-ordered triangle list indices
+        clusters (np.ndarray): Hard cluster start offsets (in triangles)
+        cache_size (int): Cache entries
+        threshold (float): Allowed ACMR ratio
+
+    Returns:
+        np.ndarray: Cluster start offsets in triangles
+    """
+    triangles = np.asarray(indices).reshape(-1, 3).tolist()
+    misses = cache_misses(indices, cache_size)
+    ends = np.append(clusters[1:], len(triangles)).tolist()
+    boundaries = []
+    for start, end in zip(clusters.tolist(), ends):
+        target = misses[start:end].sum() / (end - start) * threshold
+        boundaries.append(start)
+        loaded, running = {}, 0
+        cut = start
+        for t in range(start, end):
+            for vertex in triangles[t]:
+                if running - loaded.get(vertex, -cache_size - 1) > cache_size:
+                    loaded[vertex] = running
+                    running += 1
+            if t + 1 < end and running <= target * (t + 1 - cut):
+                boundaries.append(t + 1)
+                loaded, running = {}, 0
+                cut = t + 1
+    return np.array(boundaries, dtype=np.int64)
+
+
+def optimize_overdraw(indices, positions, clusters):
+    """
+    Order clusters front to back as seen from outside the mesh.
+
+    Clusters whose faces point away from the mesh center are likely to
+    occlude the others, so they are drawn first and the depth test rejects
+    hidden fragments.
+
+    Args:
+        indices (np.ndarray): Cache-ordered triangle list indices
+        positions (np.ndarray): (N, 3) vertex positions
+        clusters (np.ndarray): Cluster start offsets in triangles
+
+    Returns:
+        np.ndarray: Reordered triangle list indices
+    """
+    triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    if len(clusters) < 2:
+        return indices
+    corners = positions[triangles].astype(np.float64)
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(normals, axis=1)
+    centroids = corners.mean(axis=1)
+
+    cluster_of = np.repeat(np.arange(len(clusters)), np.diff(np.append(clusters, len(triangles))))
+    weight = np.maximum(np.bincount(cluster_of, weights=areas, minlength=len(clusters)), 1e-20)
+    cluster_centroid = np.stack([np.bincount(cluster_of, weights=centroids[:, i] * areas,
+                                             minlength=len(clusters)) for i in range(3)], axis=1) / weight[:, None]
+    cluster_normal = np.stack([np.bincount(cluster_of, weights=normals[:, i], minlength=len(clusters))
+                               for i in range(3)], axis=1)
+    cluster_normal /= np.maximum(np.linalg.norm(cluster_normal, axis=1, keepdims=True), 1e-20)
+    mesh_centroid = (centroids * areas[:, None]).sum(axis=0) / max(areas.sum(), 1e-20)
+
+    occlusion = np.einsum('ij,ij->i', cluster_centroid - mesh_centroid, cluster_normal)
+    cluster_order = np.argsort(-occlusion, kind='stable')
+    triangle_order = np.argsort(np.argsort(cluster_order)[cluster_of], kind='stable')
+    return triangles[triangle_order].ravel()
+
+
+def optimize_vertex_fetch(arrays):
+    """
+    Renumber vertices in order of first use and drop unused ones.
+
+    Args:
+        arrays (dict): Render arrays
+
+    Returns:
+        dict: Render arrays with sequential vertex access
+    """
+    indices = np.asarray(arrays['indices'], dtype=np.int64)
+    used, first = np.unique(indices, return_index=True)
+    order = used[np.argsort(first)]
+    remap = np.empty(len(arrays['positions']), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    result = dict(arrays)
+    for name in VERTEX_ATTRIBUTES:
+        if arrays.get(name) is not None:
+            result[name] = np.ascontiguousarray(arrays[name][order])
+    result['indices'] = remap[indices].astype(np.uint32)
+    return result
+
+
+def optimize_render_arrays(arrays, cache_size=DEFAULT_CACHE_SIZE, overdraw_threshold=DEFAULT_OVERDRAW_THRESHOLD):
+    """
+    Run the full optimization pass on one set of render arrays.
+
+    Args:
+        arrays (dict): Render arrays
+        cache_size (int): Vertex cache entries to optimize for
+        overdraw_threshold (float): Allowed ACMR ratio for overdraw clusters
+
+    Returns:
+        tuple: (optimized render arrays, stats dict with vertex counts and
+            ACMR before and after)
+    """
+    stats = {
+        'vertices_before': len(arrays['positions']),
+        'triangles': len(arrays['indices']) // 3,
+        'acmr_before': float(acmr(np.asarray(arrays['indices']), cache_size)),
+    }
+    optimized = deduplicate_vertices(arrays)
+    indices = np.asarray(optimized['indices'], dtype=np.int64)
+    order, clusters = tipsify(indices, len(optimized['positions']), cache_size)
+    indices = indices.reshape(-1, 3)[order].ravel()
+    clusters = soft_boundaries(indices, clusters, cache_size, overdraw_threshold)
+    optimized['indices'] = optimize_overdraw(indices, optimized['positions'], clusters)
+    optimized = optimize_vertex_fetch(optimized)
+
+    stats['vertices_after'] = len(optimized['positions'])
+    stats['acmr_after'] = float(acmr(optimized['indices'], cache_size))
+    return optimized, stats
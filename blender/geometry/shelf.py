@@ -5,9 +5,12 @@ Creates the main rectangular shelf structure with proper dimensions and material
 """
 
 import bpy
-import bmesh
 from mathutils import Vector
 
+from geometry.mesh_core import shelf_box_arrays
+from utils.materials import assign_material, material_library
+from utils.mesh_builder import mesh_from_arrays
+
 
 def create_main_shelf(name="MainShelf", width=2.0, height=0.1, depth=0.4):
     """
@@ -22,28 +25,13 @@ def create_main_shelf(name="MainShelf", width=2.0, height=0.1, depth=0.4):
     Returns:
         bpy.types.Object: The created shelf object
     """
-    # Create mesh
-    mesh = bpy.data.meshes.new(f"{name}_mesh")
+    # Create mesh from bulk arrays
+    mesh = mesh_from_arrays(f"{name}_mesh", shelf_box_arrays(width, height, depth))
     obj = bpy.data.objects.new(name, mesh)
     
     # Add to scene
     bpy.context.collection.objects.link(obj)
     
-    # Create bmesh
-    bm = bmesh.new()
-    
-    # Create cube
-    bmesh.ops.create_cube(bm, size=1.0)
-    
-    # Scale to desired dimensions
-    bmesh.ops.scale(bm, 
-                   vec=(width, depth, height),
-                   verts=bm.verts)
-    
-    # Update mesh
-    bm.to_mesh(mesh)
-    bm.free()
-    
     # Set object as active
     bpy.context.view_layer.objects.active = obj
     obj.select_set(True)
@@ -59,23 +47,8 @@ def add_shelf_material(obj, color=(0.5, 0.5, 0.5, 1.0)):
         obj (bpy.types.Object): The shelf object
         color (tuple): RGBA color values (default: medium gray)
     """
-    # Create material
-    mat = bpy.data.materials.new(name=f"{obj.name}_Material")
-    mat.use_nodes = True
-    
-    # Get the material output node
-    output_node = mat.node_tree.nodes.get('Material Output')
-    if output_node:
-        # Get or create principled BSDF
-        bsdf_node = mat.node_tree.nodes.get('Principled BSDF')
-        if bsdf_node:
-            # Set base color
-            bsdf_node.inputs['Base Color'].default_value = color
-            # Set roughness for wood-like appearance
-            bsdf_node.inputs['Roughness'].default_value = 0.7
+    # Get the shared material (roughness for wood-like appearance)
+    mat = material_library().get("Shelf", color, roughness=0.7)
     
     # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
+    assign_material(obj, mat)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Shelf Generation Daemon
+
+Long-lived headless Blender process that generates shelf assemblies on demand.
+Blender startup, module imports and setup_scene() are paid once; every job only
+pays for the components that changed and for export.
+
+Usage:
+    blender --background --python blender/shelf_daemon.py -- --port 8765
+    blender --background --python blender/shelf_daemon.py -- --stdin
+
+Jobs are newline-delimited JSON objects, one response line per job:
+    {"id": 1, "variant": {"name": "wide", "shelf": {"width": 3.0}}, "formats": ["GLB"]}
+    -> {"id": 1, "ok": true, "exports": {...}, "rebuilt": [...], "stats": {...}}
+
+Optional job fields are "output_dir", "formats" and "per_component". Send
+{"command": "ping"} to check the daemon is alive and {"command": "shutdown"} to
+stop it. Jobs are processed one at a time because bpy is not thread-safe.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import time
+
+# Add blender directory to Python path for module imports
+blender_dir = os.path.dirname(os.path.abspath(__file__))
+if blender_dir not in sys.path:
+    sys.path.append(blender_dir)
+
+import gen_shelf_modular
+from gen_shelf_modular import create_shelf_graph, generate_variant, get_blender_version
+from utils.build_cache import BuildCache, DEFAULT_CACHE_DIR, hash_source_files
+from utils.jobs import DEFAULT_EXPORT_FORMATS, resolve_variant_params, validate_formats
+
+
+class ShelfDaemon:
+    """Generation state shared by every job handled by the daemon."""
+
+    def __init__(self, output_dir, cache_dir=DEFAULT_CACHE_DIR, leak_window=5):
+        """
+        Args:
+            output_dir (str): Default output directory for exported files
+            cache_dir (str): Build cache directory, or None to disable the cache
+            leak_window (int): Jobs over which growing memory raises a leak
+                warning (0 disables)
+        """
+        if gen_shelf_modular.BLENDER_IMPORT_ERROR is not None:
+            raise RuntimeError(f"Error importing Blender modules: {gen_shelf_modular.BLENDER_IMPORT_ERROR}. "
+                               "The daemon must be run within Blender")
+        self.output_dir = output_dir
+        self.cache = BuildCache(cache_dir) if cache_dir else None
+        self.blender_version = get_blender_version()
+        self.source_hash = hash_source_files()
+        self.graph = create_shelf_graph()
+        self.memory = gen_shelf_modular.MemoryMonitor(leak_window)
+        self.jobs_handled = 0
+        self.started = time.time()
+        self.running = True
+
+    def handle(self, request):
+        """
+        Handle one request.
+
+        Args:
+            request (dict): Job or command
+
+        Returns:
+            dict: Response to send back
+        """
+        response = {'id': request.get('id')}
+        command = request.get('command', 'generate')
+
+        if command == 'ping':
+            response.update(ok=True, jobs_handled=self.jobs_handled,
+                            uptime_seconds=time.time() - self.started,
+                            memory=self.memory.summary())
+            return response
+        if command == 'shutdown':
+            self.running = False
+            response.update(ok=True)
+            return response
+        if command != 'generate':
+            response.update(ok=False, error=f"Unknown command: {command}")
+            return response
+
+        try:
+            params = resolve_variant_params(request.get('variant', {}))
+            formats = validate_formats(request.get('formats') or DEFAULT_EXPORT_FORMATS)
+        except (TypeError, ValueError, KeyError) as e:
+            response.update(ok=False, error=f"Invalid job: {e}")
+            return response
+
+        result = generate_variant(params, request.get('output_dir') or self.output_dir,
+                                  formats=formats,
+                                  cache=self.cache, blender_version=self.blender_version,
+                                  source_hash=self.source_hash, graph=self.graph,
+                                  per_component=bool(request.get('per_component')),
+                                  memory=self.memory)
+        self.jobs_handled += 1
+
+        stats = {
+            'generate_seconds': result['generate_seconds'],
+            'export_seconds': result['export_seconds'],
+            'total_seconds': result['total_seconds'],
+        }
+        # Only a job that generated geometry has stats of its own; the graph
+        # may still hold a previous job's assembly
+        geometry = result.get('geometry')
+        if geometry is not None:
+            stats.update(vertices=geometry['vertices'], faces=geometry['faces'])
+
+        response.update(
+            ok=result['error'] is None,
+            error=result['error'],
+            exports=result['exports'],
+            rebuilt=result.get('rebuilt', []),
+            cached=result['cached'],
+            memory=result.get('memory'),
+            stats=stats,
+        )
+        return response
+
+    def handle_line(self, line):
+        """
+        Handle one newline-delimited JSON request.
+
+        Args:
+            line (str): Raw request line
+
+        Returns:
+            str: JSON response line, or None for blank input
+        """
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return json.dumps({'id': None, 'ok': False, 'error': f"Invalid JSON: {e}"})
+        return json.dumps(self.handle(request))
+
+
+def serve_stdin(daemon):
+    """
+    Serve requests from stdin, writing responses to stdout.
+
+    Args:
+        daemon (ShelfDaemon): Daemon state
+    """
+    # Blender and the generator print progress to stdout, so responses are
+    # prefixed to keep them distinguishable from log output
+    for line in sys.stdin:
+        response = daemon.handle_line(line)
+        if response is not None:
+            sys.stdout.write(f"@@RESULT {response}\n")
+            sys.stdout.flush()
+        if not daemon.running:
+            break
+
+
+def serve_socket(daemon, host, port):
+    """
+    Serve requests over a local TCP socket, one connection at a time.
+
+    Args:
+        daemon (ShelfDaemon): Daemon state
+        host (str): Interface to bind (should stay local)
+        port (int): Port to listen on
+    """
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                response = daemon.handle_line(raw.decode('utf-8'))
+                if response is not None:
+                    self.wfile.write(response.encode('utf-8') + b"\n")
+                    self.wfile.flush()
+                if not daemon.running:
+                    break
+
+    socketserver.TCPServer.allow_reuse_address = True
+    with socketserver.TCPServer((host, port), RequestHandler) as server:
+        print(f"Shelf daemon listening on {host}:{port}")
+        while daemon.running:
+            server.handle_request()
+
+
+def parse_args(argv=None):
+    """
+    Parse script arguments (the ones after ``--`` on the Blender command line).
+
+    Args:
+        argv (list): Full argument list (default: sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    argv = sys.argv if argv is None else argv
+    script_args = argv[argv.index('--') + 1:] if '--' in argv else []
+
+    parser = argparse.ArgumentParser(prog="shelf_daemon.py", description="Serve shelf generation jobs")
+    parser.add_argument('--stdin', action='store_true', help="Read jobs from stdin instead of a socket")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument('--output-dir', default=os.environ.get('BLENDER_OUTPUT_DIR', '/app/steamvr-addon/models'),
+                        help="Default output directory for jobs")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Build cache directory")
+    parser.add_argument('--no-cache', action='store_true', help="Always regenerate")
+    parser.add_argument('--leak-window', type=int, default=5,
+                        help="Warn when bpy.data collections or RSS grow over this many jobs in a row "
+                             "(default: 5, 0 disables)")
+    return parser.parse_args(script_args)
+
+
+def main():
+    """Main function - entry point for the script."""
+    print("=== Blender Blockbuster Shelf Daemon ===")
+    args = parse_args()
+
+    try:
+        daemon = ShelfDaemon(args.output_dir, cache_dir=None if args.no_cache else args.cache_dir,
+                             leak_window=args.leak_window)
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+
+    if args.stdin:
+        serve_stdin(daemon)
+    else:
+        serve_socket(daemon, args.host, args.port)
+
+    print(f"Shelf daemon stopped after {daemon.jobs_handled} jobs")
+
+
+if __name__ == "__main__":
+    main()
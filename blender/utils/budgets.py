@@ -0,0 +1,132 @@
+"""
+Asset Budget Module
+
+Per-device budget profiles for one generated shelf assembly, and the
+downgrade ladder used when an assembly does not fit. Budgets cover what the
+client pays for per assembly: triangles and vertices to transform,
+materials and draw calls to submit, and GLB bytes to download. This module
+does not depend on bpy.
+"""
+
+import copy
+
+
+# Limits per assembly; None means unlimited
+BUDGET_PROFILES = {
+    # Standalone headset: a store aisle shows dozens of assemblies at 72-90 Hz
+    'quest': {
+        'triangles': 20000,
+        'vertices': 30000,
+        'materials': 4,
+        'draw_calls': 8,
+        'glb_bytes': 1024 * 1024,
+    },
+    'desktop': {
+        'triangles': 250000,
+        'vertices': 400000,
+        'materials': 8,
+        'draw_calls': 32,
+        'glb_bytes': 16 * 1024 * 1024,
+    },
+}
+
+BUDGET_METRICS = ('triangles', 'vertices', 'materials', 'draw_calls', 'glb_bytes')
+
+# 'none' disables budget checks
+BUDGET_PROFILE_NAMES = ['none'] + sorted(BUDGET_PROFILES)
+
+# 'fail' stops the variant on the first overrun; 'downgrade' regenerates it
+# with cheaper settings until it fits or no cheaper setting is left
+BUDGET_ACTIONS = ['fail', 'downgrade']
+
+# Smallest pegboard texture tile the downgrade ladder goes to
+MIN_TEXTURE_RESOLUTION = 16
+
+
+def resolve_budget(budget_params):
+    """
+    Build the limits of a budget section of the assembly parameters.
+
+    Args:
+        budget_params (dict): {'profile': ..., 'limits': {...}}; limits
+            override the profile's values
+
+    Returns:
+        dict: Metric -> limit (None for unlimited), or None if disabled
+    """
+    profile = (budget_params or {}).get('profile', 'none')
+    if profile == 'none':
+        return None
+    if profile not in BUDGET_PROFILES:
+        raise ValueError(f"Unknown budget profile: {profile} (expected one of {BUDGET_PROFILE_NAMES})")
+    limits = dict.fromkeys(BUDGET_METRICS)
+    limits.update(BUDGET_PROFILES[profile])
+    limits.update((budget_params or {}).get('limits') or {})
+    return limits
+
+
+def check_budget(measured, limits):
+    """
+    Compare measured values against budget limits.
+
+    Args:
+        measured (dict): Metric -> measured value (missing metrics are skipped)
+        limits (dict): Metric -> limit from resolve_budget()
+
+    Returns:
+        list: (metric, value, limit) for every exceeded limit
+    """
+    return [(metric, measured[metric], limit) for metric, limit in limits.items()
+            if limit is not None and metric in measured and measured[metric] > limit]
+
+
+def format_violations(violations):
+    """Describe budget violations in one line."""
+    return ', '.join(f"{metric} {value} > {limit}" for metric, value, limit in violations)
+
+
+def with_changes(params, section, **values):
+    """Copy assembly parameters with some values of one section replaced."""
+    changed = copy.deepcopy(params)
+    changed[section].update(values)
+    return changed
+
+
+def downgrade_params(params, violations):
+    """
+    Choose the next cheaper version of an assembly.
+
+    The ladder trades detail for cost in order of how little it changes the
+    look: real pegboard holes become the alpha-masked texture, the texture
+    tile shrinks (when only the download is too big), then the assembly is
+    exported from increasingly coarse LOD levels (export 'base_lod').
+
+    Args:
+        params (dict): Complete assembly parameters
+        violations (list): Result of check_budget()
+
+    Returns:
+        tuple: (downgraded parameters, description), or None if nothing
+            cheaper is left
+    """
+    metrics = {metric for metric, _, _ in violations}
+    backing = params['backing']
+    export = params['export']
+
+    if backing['pegboard'] == 'geometry' and metrics & {'triangles', 'vertices', 'glb_bytes'}:
+        return (with_changes(params, 'backing', pegboard='texture'),
+                "pegboard holes as texture")
+    if (metrics == {'glb_bytes'} and backing['pegboard'] == 'texture'
+            and backing['texture_resolution'] > MIN_TEXTURE_RESOLUTION):
+        resolution = max(backing['texture_resolution'] // 2, MIN_TEXTURE_RESOLUTION)
+        return (with_changes(params, 'backing', texture_resolution=resolution),
+                f"pegboard texture at {resolution} px")
+    if metrics & {'triangles', 'vertices', 'glb_bytes'}:
+        base_lod = export.get('base_lod', 0) + 1
+        if base_lod < len(export['lod_errors']):
+            return (with_changes(params, 'export', base_lod=base_lod),
+                    f"export from LOD{base_lod} ({export['lod_errors'][base_lod] * 1000:g} mm error)")
+    if 'draw_calls' in metrics and export['batching'] != 'static':
+        return (with_changes(params, 'export', batching='static'),
+                "static batching")
+    return None
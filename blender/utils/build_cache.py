@@ -0,0 +1,267 @@
+"""
+Build Cache Module
+
+Content-addressed cache for exported shelf models. The cache key covers the
+assembly parameters, the export formats, the source of every module that
+shapes the geometry, and the Blender version, so a hit is safe to reuse
+without running Blender. This module does not depend on bpy.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+
+
+blender_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SHELF_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'blender', 'shelf_build_cache'))
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+ENTRY_MANIFEST = "entry.json"
+
+
+def cache_source_files():
+    """
+    List the source files whose contents are part of every cache key.
+
+    Returns:
+        list: Sorted absolute paths
+    """
+    patterns = [
+        os.path.join(blender_dir, "geometry", "*.py"),
+        os.path.join(blender_dir, "utils", "*.py"),
+        os.path.join(blender_dir, "gen_shelf_modular.py"),
+    ]
+    files = set()
+    for pattern in patterns:
+        files.update(glob.glob(pattern))
+    return sorted(files)
+
+
+def hash_source_files(files=None):
+    """
+    Hash the contents of the geometry source files.
+
+    Args:
+        files (list): Files to hash (default: cache_source_files())
+
+    Returns:
+        str: Hex digest over the relative paths and contents
+    """
+    digest = hashlib.sha256()
+    for path in files or cache_source_files():
+        digest.update(os.path.relpath(path, blender_dir).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """
+    Hash a file's contents.
+
+    Args:
+        path (str): File to hash
+        chunk_size (int): Bytes read at a time
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_blender_version(blender_bin=None):
+    """
+    Determine the Blender version without importing bpy.
+
+    Args:
+        blender_bin (str): Blender executable (default: $BLENDER_BIN or 'blender')
+
+    Returns:
+        str: Version string such as '4.2.0', or None if Blender is unavailable
+    """
+    blender_bin = blender_bin or os.environ.get('BLENDER_BIN', 'blender')
+    try:
+        output = subprocess.run([blender_bin, "--version"], capture_output=True,
+                                text=True, timeout=60).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"Blender\s+(\d+\.\d+(?:\.\d+)?)", output)
+    return match.group(1) if match else None
+
+
+def compute_cache_key(params, formats, blender_version, source_hash=None):
+    """
+    Compute the cache key for one assembly variant.
+
+    Args:
+        params (dict): Complete assembly parameters
+        formats (list): Export formats
+        blender_version (str): Blender version string
+        source_hash (str): Precomputed hash_source_files() result
+
+    Returns:
+        str: Hex digest identifying the variant's exports
+    """
+    payload = json.dumps({
+        'params': params,
+        'formats': sorted(fmt.upper() for fmt in formats),
+        'blender_version': blender_version,
+        'sources': source_hash or hash_source_files(),
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def link_or_copy(source, target):
+    """
+    Hardlink source to target, falling back to a copy across filesystems.
+
+    Args:
+        source (str): Existing file
+        target (str): Destination path (replaced if present)
+    """
+    if os.path.lexists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class BuildCache:
+    """
+    Local store of exported files keyed by compute_cache_key(), with LRU
+    eviction once the store grows past max_bytes.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def _read_entry(self, key):
+        manifest_path = os.path.join(self._entry_dir(key), ENTRY_MANIFEST)
+        try:
+            with open(manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self, key):
+        """
+        Check for a complete cache entry and mark it as recently used.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            dict: Entry manifest, or None on a miss
+        """
+        entry = self._read_entry(key)
+        if entry is None:
+            return None
+        entry_dir = self._entry_dir(key)
+        if not all(os.path.exists(os.path.join(entry_dir, name)) for name in entry['files'].values()):
+            return None
+        os.utime(os.path.join(entry_dir, ENTRY_MANIFEST))
+        return entry
+
+    def restore(self, key, output_dir, basename):
+        """
+        Materialize cached exports into output_dir without regenerating them.
+
+        Args:
+            key (str): Cache key
+            output_dir (str): Output directory for exported files
+            basename (str): File name (without extension) for the outputs
+
+        Returns:
+            dict: Mapping of format to restored file path, or None on a miss
+        """
+        entry = self.lookup(key)
+        if entry is None:
+            return None
+        os.makedirs(output_dir, exist_ok=True)
+        restored = {}
+        # Entries name their outputs (e.g. LOD levels); older ones only
+        # hold one file per format named after the variant
+        outputs = entry.get('outputs', {})
+        for fmt, name in entry['files'].items():
+            target = os.path.join(output_dir, outputs.get(fmt, basename + os.path.splitext(name)[1]))
+            link_or_copy(os.path.join(self._entry_dir(key), name), target)
+            restored[fmt] = target
+        return restored
+
+    def store(self, key, exported):
+        """
+        Add exported files to the cache and evict old entries if needed.
+
+        Args:
+            key (str): Cache key
+            exported (dict): Mapping of format (or other output, e.g. a LOD
+                level) to exported file path
+        """
+        entry_dir = self._entry_dir(key)
+        staging_dir = f"{entry_dir}.tmp{os.getpid()}"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+
+        files = {}
+        outputs = {}
+        size = 0
+        for fmt, path in exported.items():
+            name = f"{fmt.lower()}{os.path.splitext(path)[1]}"
+            link_or_copy(path, os.path.join(staging_dir, name))
+            files[fmt] = name
+            outputs[fmt] = os.path.basename(path)
+            size += os.path.getsize(path)
+
+        with open(os.path.join(staging_dir, ENTRY_MANIFEST), 'w') as f:
+            json.dump({'key': key, 'files': files, 'outputs': outputs, 'size': size,
+                       'created': time.time()}, f)
+
+        # Publish atomically so concurrent workers never see half an entry
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.rename(staging_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the store fits in max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = []
+        for manifest_path in glob.glob(os.path.join(self.root, "*", "*", ENTRY_MANIFEST)):
+            try:
+                with open(manifest_path, 'r') as f:
+                    size = json.load(f)['size']
+                entries.append((os.path.getmtime(manifest_path), size, os.path.dirname(manifest_path)))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
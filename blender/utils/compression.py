@@ -0,0 +1,232 @@
+"""
+GLB Compression Module
+
+Optional geometry compression for .glb outputs:
+
+- 'draco' (KHR_draco_mesh_compression): Blender's glTF exporter encodes it
+  itself; native GLB writer output is post-processed with the gltf-transform
+  CLI ($GLTF_TRANSFORM_BIN or 'gltf-transform').
+- 'meshopt' (EXT_meshopt_compression): any .glb is post-processed with
+  gltfpack ($GLTFPACK_BIN or 'gltfpack').
+
+Quantization bits are configurable per attribute. Decode cost is estimated
+from the decoded geometry size and typical WebAssembly decoder throughput,
+since it cannot be measured without the client. Nothing here imports bpy.
+"""
+
+import os
+import shutil
+import subprocess
+
+from utils.glb_writer import read_glb
+
+
+# Quantization bits per attribute (the glTF exporter's Draco defaults)
+DEFAULT_QUANTIZATION_BITS = {
+    'position': 14,
+    'normal': 10,
+    'texcoord': 12,
+}
+
+# Draco encoder effort, 0 (fastest) to 10 (smallest)
+DEFAULT_DRACO_LEVEL = 6
+
+# Rough decoded bytes per second of the WebAssembly decoders on a mid-range
+# phone; Draco's entropy decoding is far slower than meshopt's byte-level
+# filters. Only meant to compare modes, not to predict exact load times.
+DECODE_BYTES_PER_SECOND = {
+    'draco': 30e6,
+    'meshopt': 1e9,
+}
+
+# External tool each mode post-processes .glb files with: (environment
+# variable naming the executable, default executable name)
+COMPRESSION_TOOLS = {
+    'draco': ('GLTF_TRANSFORM_BIN', 'gltf-transform'),
+    'meshopt': ('GLTFPACK_BIN', 'gltfpack'),
+}
+
+# Byte size of glTF accessor component types and element types
+COMPONENT_SIZES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT2': 4, 'MAT3': 9, 'MAT4': 16}
+
+
+def quantization_bits(options=None):
+    """
+    Resolve the quantization bits of an export.
+
+    Args:
+        options (dict): Export options; 'quantization_bits' overrides defaults
+
+    Returns:
+        dict: Bits per attribute ('position', 'normal', 'texcoord')
+    """
+    bits = dict(DEFAULT_QUANTIZATION_BITS)
+    bits.update((options or {}).get('quantization_bits') or {})
+    return bits
+
+
+def draco_export_options(bits, level=DEFAULT_DRACO_LEVEL):
+    """
+    Keyword arguments that enable Draco in bpy.ops.export_scene.gltf.
+
+    Args:
+        bits (dict): Quantization bits per attribute
+        level (int): Encoder effort
+
+    Returns:
+        dict: Exporter keyword arguments
+    """
+    return {
+        'export_draco_mesh_compression_enable': True,
+        'export_draco_mesh_compression_level': level,
+        'export_draco_position_quantization': bits['position'],
+        'export_draco_normal_quantization': bits['normal'],
+        'export_draco_texcoord_quantization': bits['texcoord'],
+    }
+
+
+def find_tool(env_var, default):
+    """
+    Locate an external command line tool.
+
+    Args:
+        env_var (str): Environment variable that may name the executable
+        default (str): Executable name to look up on PATH
+
+    Returns:
+        str: Path of the executable, or None if it is not installed
+    """
+    return shutil.which(os.environ.get(env_var, default))
+
+
+def check_compression_tool(mode, formats):
+    """
+    Make sure the tool a compressed export needs is installed, before any
+    geometry is generated.
+
+    Draco in GLTF output is encoded by Blender's glTF exporter and needs no
+    tool; every other compressed .glb output is post-processed.
+
+    Args:
+        mode (str): Compression mode ('none', 'draco' or 'meshopt')
+        formats (list): Export formats
+
+    Raises:
+        RuntimeError: If the tool is not installed
+    """
+    if mode == 'none':
+        return
+    formats = [fmt.upper() for fmt in formats]
+    if mode == 'draco' and 'GLB' not in formats:
+        return
+    if mode == 'meshopt' and not {'GLB', 'GLTF'} & set(formats):
+        return
+    env_var, default = COMPRESSION_TOOLS[mode]
+    if find_tool(env_var, default) is None:
+        raise RuntimeError(f"{mode} compression of GLB output needs {default} (set {env_var})")
+
+
+def compression_command(mode, source, target, bits):
+    """
+    Build the command that compresses source into target.
+
+    Args:
+        mode (str): 'draco' or 'meshopt'
+        source (str): Uncompressed .glb
+        target (str): Compressed .glb to write
+        bits (dict): Quantization bits per attribute
+
+    Returns:
+        list: Command line
+    """
+    if mode == 'meshopt':
+        tool = find_tool(*COMPRESSION_TOOLS['meshopt'])
+        if tool is None:
+            raise RuntimeError("meshopt compression needs gltfpack (set GLTFPACK_BIN)")
+        # -kn/-km keep the node and material structure of the export
+        return [tool, '-i', source, '-o', target, '-cc', '-kn', '-km',
+                '-vp', str(bits['position']), '-vn', str(bits['normal']),
+                '-vt', str(bits['texcoord'])]
+    if mode == 'draco':
+        tool = find_tool(*COMPRESSION_TOOLS['draco'])
+        if tool is None:
+            raise RuntimeError("Draco compression of GLB output needs gltf-transform (set GLTF_TRANSFORM_BIN)")
+        return [tool, 'draco', source, target,
+                '--quantize-position', str(bits['position']),
+                '--quantize-normal', str(bits['normal']),
+                '--quantize-texcoord', str(bits['texcoord'])]
+    raise ValueError(f"Unsupported compression mode: {mode}")
+
+
+def compress_glb(filepath, mode, bits=None):
+    """
+    Compress a .glb file in place with an external tool.
+
+    Args:
+        filepath (str): Uncompressed .glb file
+        mode (str): 'draco' or 'meshopt'
+        bits (dict): Quantization bits per attribute (default: DEFAULT_QUANTIZATION_BITS)
+    """
+    staging = f"{filepath}.{mode}.tmp.glb"
+    command = compression_command(mode, filepath, staging, bits or DEFAULT_QUANTIZATION_BITS)
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=600)
+        if result.returncode != 0 or not os.path.exists(staging):
+            raise RuntimeError(f"{os.path.basename(command[0])} failed: {result.stderr.strip()}")
+        os.replace(staging, filepath)
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+
+
+def decoded_geometry_bytes(document):
+    """
+    Size of the vertex and index data a client holds after decoding.
+
+    Uses the accessors of mesh primitives, which keep their count and type
+    when the data behind them is compressed.
+
+    Args:
+        document (dict): glTF JSON document
+
+    Returns:
+        int: Decoded bytes
+    """
+    accessors = document.get('accessors', [])
+    used = set()
+    for mesh in document.get('meshes', []):
+        for primitive in mesh['primitives']:
+            used.update(primitive['attributes'].values())
+            if 'indices' in primitive:
+                used.add(primitive['indices'])
+    return sum(accessors[i]['count'] * COMPONENT_SIZES[accessors[i]['componentType']]
+               * TYPE_SIZES[accessors[i]['type']] for i in used)
+
+
+def compression_report(filepath, mode, uncompressed_bytes):
+    """
+    Describe the effect of compressing one .glb file.
+
+    Args:
+        filepath (str): The compressed .glb file
+        mode (str): Compression mode ('none', 'draco' or 'meshopt')
+        uncompressed_bytes (int): Size of the same export without compression
+
+    Returns:
+        dict: Sizes, ratio, decoded geometry bytes and the estimated decode
+            time in milliseconds
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    document, _ = read_glb(data)
+    decoded = decoded_geometry_bytes(document)
+    throughput = DECODE_BYTES_PER_SECOND.get(mode)
+    return {
+        'compression': mode,
+        'compressed_bytes': len(data),
+        'uncompressed_bytes': uncompressed_bytes,
+        'ratio': round(len(data) / uncompressed_bytes, 4) if uncompressed_bytes else None,
+        'decoded_geometry_bytes': decoded,
+        'estimated_decode_ms': round(decoded / throughput * 1000.0, 3) if throughput else 0.0,
+    }
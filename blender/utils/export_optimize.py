@@ -0,0 +1,93 @@
+"""
+Export Optimization Module
+
+Brings the GPU ordering of geometry/mesh_optimize.py to Blender's own
+exporters (FBX, OBJ and the glTF operator). The native GLB writer optimizes
+the arrays it writes; the operators write Blender meshes, so for the length
+of an export every mesh is swapped for a temporary copy built from the
+optimized render arrays: deduplicated vertices in fetch order and triangles
+in vertex cache and overdraw order. The exporters keep vertex and face
+order, so the files carry that order. Objects keep their names, transforms
+and materials; the original meshes are put back afterwards.
+"""
+
+import contextlib
+
+import bpy
+import numpy as np
+
+from geometry.mesh_core import MeshArrays
+from geometry.mesh_optimize import optimize_render_arrays
+from utils.glb_export import mesh_render_arrays, record_optimization
+from utils.mesh_builder import mesh_from_arrays, set_loop_uvs
+
+
+def optimized_mesh(mesh):
+    """
+    Build a triangulated, GPU-ordered copy of a mesh.
+
+    Args:
+        mesh (bpy.types.Mesh): Source mesh
+
+    Returns:
+        tuple: (bpy.types.Mesh copy with the source's materials and shading,
+            optimization stats)
+    """
+    arrays, stats = optimize_render_arrays(mesh_render_arrays(mesh))
+    smooth = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+
+    indices = np.asarray(arrays['indices'], dtype=np.int32)
+    copy = mesh_from_arrays(f"{mesh.name}_optimized", MeshArrays(
+        arrays['positions'], indices, np.full(len(indices) // 3, 3, dtype=np.int32), bool(smooth.any())))
+    if mesh.uv_layers.active is not None:
+        set_loop_uvs(copy, arrays['uvs'][indices], name=mesh.uv_layers.active.name)
+    for mat in mesh.materials:
+        copy.materials.append(mat)
+    return copy, stats
+
+
+@contextlib.contextmanager
+def optimized_meshes(objects, label):
+    """
+    Swap the meshes of objects for optimized copies during an export.
+
+    Objects sharing a mesh share its copy, and each copy takes over the
+    source mesh's name, so exported mesh names and instancing do not
+    change. The ACMR before and after is printed and recorded on the active
+    profiler under label.
+
+    Args:
+        objects (list): Objects to export; non-mesh objects are left alone
+        label (str): Export name for the optimization report
+
+    Yields:
+        list: Optimization stats of every copied mesh
+    """
+    copies = {}
+    names = {}
+    stats = []
+    swapped = []
+    try:
+        for obj in objects:
+            if obj.type != 'MESH' or not obj.data.polygons:
+                continue
+            mesh = obj.data
+            if mesh not in copies:
+                copy, mesh_stats = optimized_mesh(mesh)
+                names[mesh] = mesh.name
+                mesh.name = f"{names[mesh]}_source"
+                copy.name = names[mesh]
+                copies[mesh] = copy
+                stats.append(mesh_stats)
+            swapped.append((obj, mesh))
+            obj.data = copies[mesh]
+        if stats:
+            record_optimization(label, stats)
+        yield stats
+    finally:
+        for obj, mesh in swapped:
+            obj.data = mesh
+        bpy.data.batch_remove(list(copies.values()))
+        for mesh, name in names.items():
+            mesh.name = name
@@ -0,0 +1,294 @@
+"""
+GLB Export Module
+
+Exports Blender objects through the native GLB writer (utils/glb_writer.py)
+instead of bpy.ops.export_scene.gltf. Geometry is read with foreach_get and
+written straight from arrays, so no selection state or operator context is
+involved.
+"""
+
+import os
+
+import numpy as np
+
+from geometry.mesh_core import render_arrays
+from geometry.mesh_optimize import deduplicate_vertices, optimize_render_arrays
+from utils.glb_writer import GLBWriter
+from utils.instrumentation import active_profiler
+from utils.lod_levels import lod_screen_coverage
+from utils.mesh_builder import arrays_from_mesh, loop_uvs
+from utils.textures import encode_png
+
+
+def material_parameters(material):
+    """
+    Read the shading parameters of a material's Principled BSDF.
+
+    Args:
+        material (bpy.types.Material): The material (may be None)
+
+    Returns:
+        dict: 'color', 'roughness' and 'metallic' values
+    """
+    parameters = {'color': (0.8, 0.8, 0.8, 1.0), 'roughness': 0.5, 'metallic': 0.0}
+    if material is None:
+        return parameters
+
+    bsdf = material.node_tree.nodes.get('Principled BSDF') if material.use_nodes else None
+    if bsdf is not None:
+        parameters['color'] = tuple(bsdf.inputs['Base Color'].default_value)
+        parameters['roughness'] = bsdf.inputs['Roughness'].default_value
+        parameters['metallic'] = bsdf.inputs['Metallic'].default_value
+    else:
+        parameters['color'] = tuple(material.diffuse_color)
+        parameters['roughness'] = material.roughness
+        parameters['metallic'] = material.metallic
+    return parameters
+
+
+def linked_image(socket, max_depth=4):
+    """
+    Find the image texture feeding a shader socket.
+
+    Follows the first linked input of intermediate nodes (math, mix, normal
+    map), so alpha and normal chains resolve to their source image.
+
+    Args:
+        socket (bpy.types.NodeSocket): Input socket to start from
+        max_depth (int): Maximum number of nodes to walk through
+
+    Returns:
+        bpy.types.Image: The image, or None
+    """
+    for _ in range(max_depth):
+        if not socket.is_linked:
+            return None
+        node = socket.links[0].from_node
+        if node.type == 'TEX_IMAGE':
+            return node.image
+        socket = next((s for s in node.inputs if s.is_linked), None)
+        if socket is None:
+            return None
+    return None
+
+
+def material_textures(material):
+    """
+    Find the alpha and normal map images of a material's Principled BSDF.
+
+    Args:
+        material (bpy.types.Material): The material (may be None)
+
+    Returns:
+        dict: 'alpha' and 'normal' images (None when not textured)
+    """
+    textures = {'alpha': None, 'normal': None}
+    if material is None or not material.use_nodes:
+        return textures
+    bsdf = material.node_tree.nodes.get('Principled BSDF')
+    if bsdf is not None:
+        textures['alpha'] = linked_image(bsdf.inputs['Alpha'])
+        textures['normal'] = linked_image(bsdf.inputs['Normal'])
+    return textures
+
+
+def image_png(image):
+    """
+    Encode a Blender image as PNG from its pixels.
+
+    Args:
+        image (bpy.types.Image): The image
+
+    Returns:
+        bytes: PNG file contents (RGB unless the image uses its alpha)
+    """
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    # Blender stores rows bottom to top, PNG top to bottom
+    pixels = np.round(np.clip(pixels, 0.0, 1.0) * 255.0).astype(np.uint8).reshape(height, width, 4)[::-1]
+    if (pixels[..., 3] == 255).all():
+        pixels = pixels[..., :3]
+    return encode_png(pixels)
+
+
+def mesh_render_arrays(mesh):
+    """
+    Expand a Blender mesh to the render arrays the GLB writer stores.
+
+    Args:
+        mesh (bpy.types.Mesh): The mesh
+
+    Returns:
+        dict: Render arrays (see geometry/mesh_core.render_arrays()); flat
+            meshes keep their loop UVs
+    """
+    mesh_arrays = arrays_from_mesh(mesh)
+    arrays = render_arrays(mesh_arrays)
+    uvs = loop_uvs(mesh)
+    if uvs is not None and not mesh_arrays.smooth:
+        # Flat meshes are expanded per loop, so loop UVs line up
+        arrays['uvs'] = uvs
+    return arrays
+
+
+def render_vertex_count(objects, deduplicate=True):
+    """
+    Count the vertices the client receives for a set of objects.
+
+    Flat-shaded meshes are exported with one vertex per face corner, so this
+    is usually well above len(mesh.vertices). Each distinct mesh is expanded
+    once and counted once for every object that uses it.
+
+    Args:
+        objects (list): Objects; non-mesh objects are skipped
+        deduplicate (bool): Merge identical vertices first, as the export
+            optimization does
+
+    Returns:
+        int: Render vertices over all objects
+    """
+    per_mesh = {}
+    total = 0
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        if obj.data.name not in per_mesh:
+            arrays = mesh_render_arrays(obj.data)
+            if deduplicate:
+                arrays = deduplicate_vertices(arrays)
+            per_mesh[obj.data.name] = len(arrays['positions'])
+        total += per_mesh[obj.data.name]
+    return total
+
+
+def export_glb(objects, filepath, instancing='nodes', lod_levels=None, max_position_error=None,
+               optimize=True):
+    """
+    Export mesh objects to a GLB file with the native writer.
+
+    Objects that share mesh data and material share one glTF mesh, so the
+    geometry is stored (and uploaded by the client) once. Materials with
+    identical shading parameters and textures are written once, even if they
+    are separate Blender materials.
+
+    Args:
+        objects (list): Objects to export; non-mesh objects are skipped
+        filepath (str): Output path
+        instancing (str): How objects sharing a mesh are written: 'nodes'
+            (one node per object) or 'gpu' (one EXT_mesh_gpu_instancing node
+            per shared mesh)
+        lod_levels (list): Levels from lod_levels.create_lod_levels() for
+            these objects; coarser levels are attached with MSFT_lod
+        max_position_error (float): Write quantized vertex attributes
+            (KHR_mesh_quantization) within this position error in meters
+        optimize (bool): Deduplicate and reorder vertices and triangles for
+            the GPU (geometry/mesh_optimize.py); the ACMR before and after
+            is printed and recorded on the active profiler
+
+    Returns:
+        int: Number of bytes written
+    """
+    writer = GLBWriter(max_position_error=max_position_error)
+    material_indices = {}
+    signature_indices = {}
+    texture_indices = {}
+    mesh_indices = {}
+    optimization = []
+
+    def texture_index(image):
+        if image.name not in texture_indices:
+            texture_indices[image.name] = writer.add_texture(writer.add_image(image_png(image), image.name))
+        return texture_indices[image.name]
+
+    def material_index(material):
+        material_key = material.name if material is not None else None
+        if material_key not in material_indices:
+            parameters = material_parameters(material)
+            textures = material_textures(material)
+            if textures['alpha'] is not None:
+                # The alpha tile is white, so the base color still tints it
+                parameters.update(base_color_texture=texture_index(textures['alpha']), alpha_mode='MASK')
+            if textures['normal'] is not None:
+                parameters['normal_texture'] = texture_index(textures['normal'])
+            signature = tuple(sorted((key, repr(value)) for key, value in parameters.items()))
+            if signature not in signature_indices:
+                signature_indices[signature] = writer.add_material(material_key or "Default", **parameters)
+            material_indices[material_key] = signature_indices[signature]
+        return material_indices[material_key]
+
+    def mesh_index(mesh_key, obj):
+        if mesh_key not in mesh_indices:
+            arrays = mesh_render_arrays(obj.data)
+            if optimize:
+                arrays, stats = optimize_render_arrays(arrays)
+                optimization.append(stats)
+            mesh_indices[mesh_key] = writer.add_mesh(
+                obj.data.name, [{'arrays': arrays, 'material': mesh_key[1]}])
+        return mesh_indices[mesh_key]
+
+    def add_nodes(level_objects):
+        # Node index per object; objects drawn by one instanced node share it
+        mesh_objects = {}
+        for obj in level_objects:
+            mesh_key = (obj.data.name, material_index(obj.active_material))
+            mesh_index(mesh_key, obj)
+            mesh_objects.setdefault(mesh_key, []).append(obj)
+
+        object_nodes = {}
+        for mesh_key, mesh_users in mesh_objects.items():
+            if instancing == 'gpu' and len(mesh_users) > 1:
+                node = writer.add_instanced_node(mesh_key[0], mesh_indices[mesh_key], [
+                    (tuple(obj.location), tuple(obj.rotation_euler), tuple(obj.scale)) for obj in mesh_users])
+                object_nodes.update((obj.name, node) for obj in mesh_users)
+                continue
+            for obj in mesh_users:
+                object_nodes[obj.name] = writer.add_node(obj.name, mesh=mesh_indices[mesh_key],
+                                                         location=tuple(obj.location),
+                                                         rotation_euler=tuple(obj.rotation_euler),
+                                                         scale=tuple(obj.scale))
+        return object_nodes
+
+    objects = [obj for obj in objects if obj.type == 'MESH']
+    object_nodes = add_nodes(objects)
+
+    if lod_levels and len(lod_levels) > 1:
+        level_nodes = [add_nodes(level['objects']) for level in lod_levels[1:]]
+        attached = set()
+        for index, obj in enumerate(objects):
+            node = object_nodes[obj.name]
+            if node in attached:
+                continue
+            attached.add(node)
+            lower = [nodes[level['objects'][index].name] for nodes, level in zip(level_nodes, lod_levels[1:])]
+            writer.add_lod(node, lower, lod_screen_coverage(obj, lod_levels))
+
+    if optimization:
+        record_optimization(os.path.splitext(os.path.basename(filepath))[0], optimization)
+    return writer.write(filepath)
+
+
+def record_optimization(label, optimization):
+    """
+    Summarize the mesh optimization of one export.
+
+    Args:
+        label (str): Export name
+        optimization (list): Stats of every optimized mesh
+
+    Returns:
+        dict: Vertex counts and triangle-weighted ACMR before and after
+    """
+    triangles = max(sum(stats['triangles'] for stats in optimization), 1)
+    summary = {
+        'vertices_before': sum(stats['vertices_before'] for stats in optimization),
+        'vertices_after': sum(stats['vertices_after'] for stats in optimization),
+        'acmr_before': round(sum(s['acmr_before'] * s['triangles'] for s in optimization) / triangles, 4),
+        'acmr_after': round(sum(s['acmr_after'] * s['triangles'] for s in optimization) / triangles, 4),
+    }
+    print(f"Mesh optimization {label}: ACMR {summary['acmr_before']} -> {summary['acmr_after']}, "
+          f"{summary['vertices_before']} -> {summary['vertices_after']} vertices")
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.record_export(label, mesh_optimization=summary)
+    return summary
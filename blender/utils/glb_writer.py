@@ -0,0 +1,697 @@
+"""
+GLB Writer Module
+
+Writes binary glTF 2.0 files directly from in-memory geometry arrays, without
+bpy.ops.export_scene. All vertex and index data is packed into one 4-byte
+aligned binary buffer, accessors carry exact min/max bounds, and identical
+input always produces byte-identical output. Nothing here imports bpy.
+
+Positions, normals and transforms are given in Blender's Z-up convention and
+converted to glTF's Y-up convention while they are packed; UVs are flipped from
+Blender's bottom-left origin to glTF's top-left origin the same way.
+
+With a maximum position error set, vertex attributes are written with
+KHR_mesh_quantization: positions as int16 relative to the mesh bounds, with
+the dequantization folded into the transform of every node that draws the
+mesh, normals as normalized int8 and UVs in [0, 1] as normalized uint16.
+"""
+
+import json
+import math
+import struct
+
+import numpy as np
+
+
+GLB_MAGIC = 0x46546C67          # 'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A         # 'JSON'
+CHUNK_BIN = 0x004E4942          # 'BIN\0'
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+# Sampler settings
+LINEAR = 9729
+LINEAR_MIPMAP_LINEAR = 9987
+REPEAT = 10497
+
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+ACCESSOR_TYPES = {1: 'SCALAR', 2: 'VEC2', 3: 'VEC3', 4: 'VEC4'}
+
+# Largest magnitude of a quantized int16 position component
+POSITION_QUANTIZATION_RANGE = 32767
+
+
+def z_up_to_y_up(vectors):
+    """
+    Convert (N, 3) Blender Z-up vectors to glTF Y-up: (x, y, z) -> (x, z, -y).
+
+    Args:
+        vectors (np.ndarray): (N, 3) vectors
+
+    Returns:
+        np.ndarray: Converted (N, 3) float32 vectors
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return np.stack([vectors[:, 0], vectors[:, 2], -vectors[:, 1]], axis=1)
+
+
+def euler_to_quaternion(rotation_euler):
+    """
+    Convert an XYZ Euler rotation to a quaternion.
+
+    Args:
+        rotation_euler (tuple): Rotation around X, Y and Z in radians
+
+    Returns:
+        tuple: Quaternion as (w, x, y, z)
+    """
+    rx, ry, rz = (angle * 0.5 for angle in rotation_euler)
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    return (
+        cx * cy * cz + sx * sy * sz,
+        sx * cy * cz - cx * sy * sz,
+        cx * sy * cz + sx * cy * sz,
+        cx * cy * sz - sx * sy * cz,
+    )
+
+
+def rotate_vectors(rotations, vectors):
+    """
+    Rotate vectors by glTF quaternions.
+
+    Args:
+        rotations (np.ndarray): (N, 4) or (4,) quaternions as (x, y, z, w)
+        vectors (np.ndarray): (N, 3) or (3,) vectors
+
+    Returns:
+        np.ndarray: Rotated vectors
+    """
+    rotations = np.asarray(rotations, dtype=np.float64)
+    vectors = np.asarray(vectors, dtype=np.float64)
+    axis, w = rotations[..., :3], rotations[..., 3:]
+    cross = 2.0 * np.cross(axis, vectors)
+    return vectors + w * cross + np.cross(axis, cross)
+
+
+def quantize_normals(normals):
+    """
+    Quantize unit normals to normalized int8, padded to 4 bytes per vertex.
+
+    Args:
+        normals (np.ndarray): (N, 3) unit normals
+
+    Returns:
+        np.ndarray: (N, 4) int8 array; the fourth component is padding
+    """
+    quantized = np.zeros((len(normals), 4), dtype=np.int8)
+    quantized[:, :3] = np.round(np.clip(normals, -1.0, 1.0) * 127.0)
+    return quantized
+
+
+def convert_transform(location=None, rotation_euler=None, scale=None):
+    """
+    Convert a Blender object transform to glTF node TRS properties.
+
+    Args:
+        location (tuple): Location in Blender units
+        rotation_euler (tuple): XYZ Euler rotation in radians
+        scale (tuple): Per-axis scale
+
+    Returns:
+        dict: 'translation', 'rotation' (x, y, z, w) and 'scale' entries for
+            the components that differ from the identity
+    """
+    properties = {}
+    if location is not None and any(location):
+        x, y, z = location
+        properties['translation'] = [float(x), float(z), float(-y)]
+    if rotation_euler is not None and any(rotation_euler):
+        w, x, y, z = euler_to_quaternion(rotation_euler)
+        properties['rotation'] = [x, z, -y, w]
+    if scale is not None and tuple(scale) != (1.0, 1.0, 1.0):
+        sx, sy, sz = scale
+        properties['scale'] = [float(sx), float(sz), float(sy)]
+    return properties
+
+
+class GLBWriter:
+    """
+    Builds a glTF 2.0 scene from geometry arrays and writes it as one GLB.
+
+    Typical use:
+        writer = GLBWriter()
+        material = writer.add_material("Wood", color=(0.5, 0.5, 0.5, 1.0), roughness=0.7)
+        mesh = writer.add_mesh("Shelf", [{'arrays': render_arrays(shelf), 'material': material}])
+        writer.add_node("Shelf", mesh=mesh, location=(0, 0, 1))
+        writer.write("shelf.glb")
+    """
+
+    def __init__(self, generator="steam-brick-and-mortar glb_writer", max_position_error=None):
+        """
+        Args:
+            generator (str): asset.generator string
+            max_position_error (float): Write quantized attributes
+                (KHR_mesh_quantization); meshes whose int16 positions would
+                move a vertex further than this keep float positions
+        """
+        self.generator = generator
+        self.max_position_error = max_position_error
+        self.materials = []
+        self.meshes = []
+        self.nodes = []
+        self.images = []
+        self.textures = []
+        self.samplers = []
+        self.extensions_used = set()
+        self.extensions_required = set()
+        # Pending binary data: (array, target, conversion, stride) in packing
+        # order, where conversion is None, 'axes' or 'flip_v' and stride is
+        # set for padded vertex attributes
+        self._views = []
+        self._accessors = []
+        # Mesh index -> (offset, step) that turns its int16 positions back
+        # into glTF units
+        self._dequantization = {}
+
+    def add_material(self, name, color=(0.8, 0.8, 0.8, 1.0), roughness=0.5, metallic=0.0,
+                     base_color_texture=None, normal_texture=None, alpha_mode=None, alpha_cutoff=0.5):
+        """
+        Add a metallic-roughness material.
+
+        Args:
+            name (str): Material name
+            color (tuple): RGBA base color
+            roughness (float): Roughness factor
+            metallic (float): Metallic factor
+            base_color_texture (int): Texture index multiplied with the base color
+            normal_texture (int): Tangent-space normal map texture index
+            alpha_mode (str): 'OPAQUE', 'MASK' or 'BLEND' (default: BLEND if the
+                color is translucent, otherwise opaque)
+            alpha_cutoff (float): Alpha threshold for MASK
+
+        Returns:
+            int: Material index
+        """
+        material = {
+            'name': name,
+            'pbrMetallicRoughness': {
+                'baseColorFactor': [float(c) for c in color],
+                'metallicFactor': float(metallic),
+                'roughnessFactor': float(roughness),
+            },
+        }
+        if base_color_texture is not None:
+            material['pbrMetallicRoughness']['baseColorTexture'] = {'index': base_color_texture}
+        if normal_texture is not None:
+            material['normalTexture'] = {'index': normal_texture}
+        if alpha_mode is None and len(color) == 4 and color[3] < 1.0:
+            alpha_mode = 'BLEND'
+        if alpha_mode and alpha_mode != 'OPAQUE':
+            material['alphaMode'] = alpha_mode
+            if alpha_mode == 'MASK':
+                material['alphaCutoff'] = float(alpha_cutoff)
+        self.materials.append(material)
+        return len(self.materials) - 1
+
+    def add_image(self, data, name=None, mime_type='image/png'):
+        """
+        Embed an encoded image in the binary buffer.
+
+        Args:
+            data (bytes): Encoded image file contents
+            name (str): Image name
+            mime_type (str): 'image/png' or 'image/jpeg'
+
+        Returns:
+            int: Image index
+        """
+        self._views.append((np.frombuffer(bytes(data), dtype=np.uint8), None, None, None))
+        image = {'bufferView': len(self._views) - 1, 'mimeType': mime_type}
+        if name:
+            image['name'] = name
+        self.images.append(image)
+        return len(self.images) - 1
+
+    def add_texture(self, image):
+        """
+        Add a texture that repeats an image with linear filtering.
+
+        Args:
+            image (int): Image index
+
+        Returns:
+            int: Texture index
+        """
+        if not self.samplers:
+            self.samplers.append({'magFilter': LINEAR, 'minFilter': LINEAR_MIPMAP_LINEAR,
+                                  'wrapS': REPEAT, 'wrapT': REPEAT})
+        self.textures.append({'sampler': 0, 'source': image})
+        return len(self.textures) - 1
+
+    def add_accessor(self, array, target=ARRAY_BUFFER, convert_axes=False, normalized=False,
+                     flip_v=False, components=None):
+        """
+        Queue an array for packing and describe it with an accessor.
+
+        Args:
+            array (np.ndarray): (N,) or (N, K) data of a supported dtype
+            target (int): ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER or None for data
+                that is not a vertex attribute or index (e.g. instance transforms)
+            convert_axes (bool): Convert (N, 3) vectors from Z-up to Y-up
+            normalized (bool): Mark integer data as normalized
+            flip_v (bool): Convert (N, 2) float UVs from a bottom-left to a
+                top-left origin (v -> 1 - v)
+            components (int): Components per element the accessor exposes,
+                when the array carries trailing padding columns (e.g. int16
+                positions padded to 8 bytes for vertex alignment)
+
+        Returns:
+            int: Accessor index
+        """
+        array = np.asarray(array)
+        if array.dtype not in COMPONENT_TYPES:
+            raise ValueError(f"Unsupported accessor dtype: {array.dtype}")
+        columns = 1 if array.ndim == 1 else array.shape[1]
+        components = components or columns
+        stride = columns * array.itemsize if components < columns else None
+
+        self._views.append((array, target, 'axes' if convert_axes else 'flip_v' if flip_v else None, stride))
+        accessor = {
+            'bufferView': len(self._views) - 1,
+            'componentType': COMPONENT_TYPES[array.dtype],
+            'count': int(array.shape[0]),
+            'type': ACCESSOR_TYPES[components],
+        }
+        if normalized:
+            accessor['normalized'] = True
+        if target == ARRAY_BUFFER or components == 1:
+            # Exact bounds from the packed values themselves
+            flat = array.reshape(array.shape[0], columns)[:, :components]
+            low = flat.min(axis=0).tolist()
+            high = flat.max(axis=0).tolist()
+            if convert_axes:
+                low, high = [low[0], low[2], -high[1]], [high[0], high[2], -low[1]]
+            elif flip_v:
+                one = np.float32(1.0)
+                low, high = ([low[0], float(one - np.float32(high[1]))],
+                             [high[0], float(one - np.float32(low[1]))])
+            accessor['min'] = low
+            accessor['max'] = high
+        self._accessors.append(accessor)
+        return len(self._accessors) - 1
+
+    def add_primitive(self, arrays, material=None, dequantization=None):
+        """
+        Build a primitive from render arrays (see geometry/mesh_core.render_arrays).
+
+        Args:
+            arrays (dict): 'positions', 'normals', optional 'uvs' and 'indices'
+            material (int): Material index
+            dequantization (tuple): (offset, step) of the mesh when its
+                positions are quantized (see add_mesh())
+
+        Returns:
+            dict: glTF primitive
+        """
+        if self.max_position_error is None:
+            attributes = {
+                'POSITION': self.add_accessor(np.asarray(arrays['positions'], dtype=np.float32),
+                                              convert_axes=True),
+                'NORMAL': self.add_accessor(np.asarray(arrays['normals'], dtype=np.float32),
+                                            convert_axes=True),
+            }
+        else:
+            attributes = self.add_quantized_attributes(arrays, dequantization)
+        if arrays.get('uvs') is not None and 'TEXCOORD_0' not in attributes:
+            attributes['TEXCOORD_0'] = self.add_accessor(np.asarray(arrays['uvs'], dtype=np.float32),
+                                                         flip_v=True)
+
+        indices = np.asarray(arrays['indices'])
+        index_dtype = np.uint16 if len(arrays['positions']) <= 0xFFFF else np.uint32
+        primitive = {
+            'attributes': attributes,
+            'indices': self.add_accessor(indices.astype(index_dtype, copy=False),
+                                         target=ELEMENT_ARRAY_BUFFER),
+            'mode': 4,
+        }
+        if material is not None:
+            primitive['material'] = material
+        return primitive
+
+    def add_mesh(self, name, primitives):
+        """
+        Add a mesh.
+
+        Args:
+            name (str): Mesh name
+            primitives (list): Dicts with 'arrays' (render arrays) and optional 'material'
+
+        Returns:
+            int: Mesh index
+        """
+        dequantization = None
+        if self.max_position_error is not None:
+            dequantization = self.position_dequantization([p['arrays']['positions'] for p in primitives])
+        self.meshes.append({
+            'name': name,
+            'primitives': [self.add_primitive(p['arrays'], p.get('material'), dequantization)
+                           for p in primitives],
+        })
+        if dequantization is not None:
+            self._dequantization[len(self.meshes) - 1] = dequantization
+        return len(self.meshes) - 1
+
+    def position_dequantization(self, positions):
+        """
+        Choose the int16 grid for a mesh's positions.
+
+        All primitives of a mesh share one grid, since the dequantization is
+        part of the node transform. The grid is centered on the mesh bounds
+        and uniform, so normals need no correction.
+
+        Args:
+            positions (list): (N, 3) Z-up positions of every primitive
+
+        Returns:
+            tuple: (offset, step) in glTF units, or None if the rounding
+                error would exceed max_position_error
+        """
+        converted = np.concatenate([z_up_to_y_up(p) for p in positions]).astype(np.float64)
+        if len(converted) == 0:
+            return None
+        low, high = converted.min(axis=0), converted.max(axis=0)
+        extent = float((high - low).max())
+        step = extent / (2 * POSITION_QUANTIZATION_RANGE) if extent > 0 else 1.0
+        # Rounding moves every component by at most half a step
+        if math.sqrt(3.0) * step / 2.0 > self.max_position_error:
+            return None
+        return (low + high) / 2.0, step
+
+    def add_quantized_attributes(self, arrays, dequantization):
+        """
+        Add KHR_mesh_quantization position, normal and UV accessors.
+
+        Vertex attributes must be 4-byte aligned, so int16 positions and
+        int8 normals are padded to four components and exposed as VEC3.
+
+        Args:
+            arrays (dict): Render arrays
+            dequantization (tuple): (offset, step) from position_dequantization(),
+                or None to keep float positions
+
+        Returns:
+            dict: Attribute name -> accessor index
+        """
+        attributes = {}
+        if dequantization is None:
+            attributes['POSITION'] = self.add_accessor(np.asarray(arrays['positions'], dtype=np.float32),
+                                                       convert_axes=True)
+        else:
+            offset, step = dequantization
+            positions = np.zeros((len(arrays['positions']), 4), dtype=np.int16)
+            positions[:, :3] = np.round((z_up_to_y_up(arrays['positions']) - offset) / step)
+            attributes['POSITION'] = self.add_accessor(positions, components=3)
+        attributes['NORMAL'] = self.add_accessor(quantize_normals(z_up_to_y_up(arrays['normals'])),
+                                                 normalized=True, components=3)
+
+        uvs = arrays.get('uvs')
+        if uvs is not None:
+            uvs = np.asarray(uvs, dtype=np.float64)
+            flipped = np.stack([uvs[:, 0], 1.0 - uvs[:, 1]], axis=1)
+            # Tiled UVs outside [0, 1] (e.g. the pegboard) stay float
+            if len(flipped) and flipped.min() >= 0.0 and flipped.max() <= 1.0:
+                attributes['TEXCOORD_0'] = self.add_accessor(
+                    np.round(flipped * 65535.0).astype(np.uint16), normalized=True)
+
+        self.extensions_used.add('KHR_mesh_quantization')
+        self.extensions_required.add('KHR_mesh_quantization')
+        return attributes
+
+    def dequantized_transform(self, mesh, translation, rotation, scale):
+        """
+        Fold a mesh's position dequantization into glTF node transforms.
+
+        Args:
+            mesh (int): Mesh index
+            translation (np.ndarray): (N, 3) translations (Y-up)
+            rotation (np.ndarray): (N, 4) quaternions (x, y, z, w)
+            scale (np.ndarray): (N, 3) scales
+
+        Returns:
+            tuple: (translation, scale) drawing the int16 positions at their
+                original place; rotation is unchanged
+        """
+        if mesh not in self._dequantization:
+            return translation, scale
+        offset, step = self._dequantization[mesh]
+        return translation + rotate_vectors(rotation, scale * offset), scale * step
+
+    def add_node(self, name, mesh=None, location=None, rotation_euler=None, scale=None,
+                 children=None):
+        """
+        Add a node with a Blender-style transform.
+
+        Args:
+            name (str): Node name
+            mesh (int): Mesh index
+            location (tuple): Location (Z-up)
+            rotation_euler (tuple): XYZ Euler rotation in radians (Z-up)
+            scale (tuple): Per-axis scale (Z-up)
+            children (list): Child node indices
+
+        Returns:
+            int: Node index
+        """
+        node = {'name': name}
+        node.update(convert_transform(location, rotation_euler, scale))
+        if mesh is not None and mesh in self._dequantization:
+            if children:
+                # The dequantization scale must not reach the children
+                children = [self.add_node(f"{name}_mesh", mesh=mesh)] + list(children)
+                mesh = None
+            else:
+                translation, scale = self.dequantized_transform(
+                    mesh, np.array([node.get('translation', [0.0, 0.0, 0.0])]),
+                    np.array([node.get('rotation', [0.0, 0.0, 0.0, 1.0])]),
+                    np.array([node.get('scale', [1.0, 1.0, 1.0])]))
+                node['translation'] = [float(v) for v in translation[0]]
+                node['scale'] = [float(v) for v in scale[0]]
+        if mesh is not None:
+            node['mesh'] = mesh
+        if children:
+            node['children'] = list(children)
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+
+    def add_instanced_node(self, name, mesh, transforms):
+        """
+        Add one node that draws a mesh many times with EXT_mesh_gpu_instancing.
+
+        The extension is marked required, because a viewer that ignored it
+        would draw the mesh only once.
+
+        Args:
+            name (str): Node name
+            mesh (int): Mesh index
+            transforms (list): (location, rotation_euler, scale) per instance (Z-up)
+
+        Returns:
+            int: Node index
+        """
+        locations = np.array([t[0] for t in transforms], dtype=np.float64).reshape(-1, 3)
+        rotations = np.array([euler_to_quaternion(t[1]) for t in transforms], dtype=np.float64).reshape(-1, 4)
+        scales = np.array([t[2] for t in transforms], dtype=np.float64).reshape(-1, 3)
+
+        # Z-up -> Y-up, as in convert_transform(); quaternions become (x, y, z, w)
+        translations = np.stack([locations[:, 0], locations[:, 2], -locations[:, 1]], axis=1)
+        rotations = np.stack([rotations[:, 1], rotations[:, 3], -rotations[:, 2], rotations[:, 0]], axis=1)
+        scales = scales[:, [0, 2, 1]]
+        translations, scales = self.dequantized_transform(mesh, translations, rotations, scales)
+        translations, rotations, scales = (np.ascontiguousarray(a, dtype=np.float32)
+                                           for a in (translations, rotations, scales))
+
+        # Only store the attributes that vary from the identity
+        attributes = {}
+        if translations.any():
+            attributes['TRANSLATION'] = self.add_accessor(translations, target=None)
+        if (rotations[:, :3] != 0).any():
+            attributes['ROTATION'] = self.add_accessor(rotations, target=None)
+        if (scales != 1.0).any():
+            attributes['SCALE'] = self.add_accessor(scales, target=None)
+        if not attributes:
+            # The extension needs at least one attribute
+            attributes['TRANSLATION'] = self.add_accessor(translations, target=None)
+
+        self.extensions_used.add('EXT_mesh_gpu_instancing')
+        self.extensions_required.add('EXT_mesh_gpu_instancing')
+        self.nodes.append({
+            'name': name,
+            'mesh': mesh,
+            'extensions': {'EXT_mesh_gpu_instancing': {'attributes': attributes}},
+        })
+        return len(self.nodes) - 1
+
+    def add_lod(self, node, lower_nodes, screen_coverage):
+        """
+        Attach coarser levels of detail to a node with MSFT_lod.
+
+        The LOD nodes are left out of the scene; viewers without MSFT_lod
+        simply draw the full-detail node, so the extension is not required.
+
+        Args:
+            node (int): Full-detail node index
+            lower_nodes (list): Node indices of the coarser levels, in order
+            screen_coverage (list): MSFT_screencoverage thresholds, one per
+                level including the full-detail one
+        """
+        entry = self.nodes[node]
+        entry.setdefault('extensions', {})['MSFT_lod'] = {'ids': list(lower_nodes)}
+        entry.setdefault('extras', {})['MSFT_screencoverage'] = [float(c) for c in screen_coverage]
+        self.extensions_used.add('MSFT_lod')
+
+    def _layout(self):
+        """Compute 4-byte aligned offsets of every pending buffer view."""
+        offsets = []
+        total = 0
+        for array, _, _, _ in self._views:
+            total = (total + 3) & ~3
+            offsets.append(total)
+            total += array.nbytes
+        return offsets, (total + 3) & ~3
+
+    def build(self):
+        """
+        Pack the binary buffer and build the glTF JSON document.
+
+        Returns:
+            tuple: (document dict, bytearray binary buffer)
+        """
+        offsets, total = self._layout()
+        buffer = bytearray(total)
+        buffer_views = []
+        for (array, target, conversion, stride), offset in zip(self._views, offsets):
+            # Copy straight into the shared buffer, no intermediate arrays
+            view = np.frombuffer(buffer, dtype=array.dtype, count=array.size, offset=offset)
+            view = view.reshape(array.shape)
+            if conversion == 'axes':
+                view[:, 0] = array[:, 0]
+                view[:, 1] = array[:, 2]
+                np.negative(array[:, 1], out=view[:, 2])
+            elif conversion == 'flip_v':
+                view[:, 0] = array[:, 0]
+                np.subtract(1.0, array[:, 1], out=view[:, 1])
+            else:
+                view[...] = array
+            buffer_view = {
+                'buffer': 0,
+                'byteOffset': offset,
+                'byteLength': array.nbytes,
+            }
+            if stride is not None:
+                buffer_view['byteStride'] = stride
+            if target is not None:
+                buffer_view['target'] = target
+            buffer_views.append(buffer_view)
+
+        child_nodes = {child for node in self.nodes for child in node.get('children', [])}
+        child_nodes.update(child for node in self.nodes
+                           for child in node.get('extensions', {}).get('MSFT_lod', {}).get('ids', []))
+        document = {
+            'asset': {'version': '2.0', 'generator': self.generator},
+            'scene': 0,
+            'scenes': [{'nodes': [i for i in range(len(self.nodes)) if i not in child_nodes]}],
+            'nodes': self.nodes,
+            'meshes': self.meshes,
+        }
+        if self.materials:
+            document['materials'] = self.materials
+        if self.textures:
+            document['textures'] = self.textures
+            document['images'] = self.images
+            document['samplers'] = self.samplers
+        if self._accessors:
+            document['accessors'] = self._accessors
+            document['bufferViews'] = buffer_views
+            document['buffers'] = [{'byteLength': total}]
+        if self.extensions_used:
+            document['extensionsUsed'] = sorted(self.extensions_used)
+        if self.extensions_required:
+            document['extensionsRequired'] = sorted(self.extensions_required)
+        return document, buffer
+
+    def chunks(self):
+        """
+        Serialize the GLB as a sequence of byte chunks.
+
+        Returns:
+            list: Header, JSON chunk and BIN chunk pieces in file order
+        """
+        document, buffer = self.build()
+        json_bytes = json.dumps(document, separators=(',', ':')).encode('utf-8')
+        json_bytes += b' ' * (-len(json_bytes) % 4)
+
+        pieces = [None, struct.pack('<II', len(json_bytes), CHUNK_JSON), json_bytes]
+        if buffer:
+            pieces += [struct.pack('<II', len(buffer), CHUNK_BIN), buffer]
+        length = 12 + sum(len(piece) for piece in pieces[1:])
+        pieces[0] = struct.pack('<III', GLB_MAGIC, GLB_VERSION, length)
+        return pieces
+
+    def to_bytes(self):
+        """Serialize the GLB into a single bytes object."""
+        return b''.join(self.chunks())
+
+    def write(self, filepath):
+        """
+        Write the GLB file.
+
+        Args:
+            filepath (str): Output path
+
+        Returns:
+            int: Number of bytes written
+        """
+        written = 0
+        with open(filepath, 'wb') as f:
+            for piece in self.chunks():
+                written += f.write(piece)
+        return written
+
+
+def read_glb(data):
+    """
+    Split a GLB file into its JSON document and binary buffer.
+
+    Args:
+        data (bytes): GLB file contents
+
+    Returns:
+        tuple: (document dict, bytes of the BIN chunk or b'')
+    """
+    magic, version, length = struct.unpack_from('<III', data, 0)
+    if magic != GLB_MAGIC or version != GLB_VERSION:
+        raise ValueError("Not a glTF 2.0 binary file")
+    document, buffer = None, b''
+    offset = 12
+    while offset < length:
+        chunk_length, chunk_type = struct.unpack_from('<II', data, offset)
+        chunk = data[offset + 8:offset + 8 + chunk_length]
+        if chunk_type == CHUNK_JSON:
+            document = json.loads(chunk)
+        elif chunk_type == CHUNK_BIN:
+            buffer = bytes(chunk)
+        offset += 8 + chunk_length
+    if document is None:
+        raise ValueError("GLB file has no JSON chunk")
+    return document, buffer
@@ -0,0 +1,235 @@
+"""
+Instrumentation Module
+
+Stage-level timing and geometry statistics for the shelf pipeline.
+Stages are recorded on the active PipelineProfiler; when no profiler is
+active, stage() is a no-op so the geometry code can stay instrumented at
+no cost. This module does not import bpy; geometry statistics only read
+attributes of the objects they are given.
+"""
+
+import contextlib
+import json
+import os
+import time
+
+import numpy as np
+
+
+_active_profiler = None
+
+
+class PipelineProfiler:
+    """Collects stage timings, geometry statistics and output sizes for one run."""
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Name of the run (usually the variant name)
+        """
+        self.name = name
+        self.stages = []
+        self.geometry = {}
+        self.outputs = {}
+        self.exports = {}
+        self.memory = None
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def stage(self, name, **details):
+        """
+        Time a pipeline stage.
+
+        Args:
+            name (str): Stage name, e.g. 'create_main_shelf' or 'export:GLTF'
+            **details: Extra values to store with the stage record
+        """
+        record = {'stage': name, 'depth': self._depth}
+        record.update(details)
+        self.stages.append(record)
+        self._depth += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            self._depth -= 1
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make this profiler the target of module-level stage() calls."""
+        global _active_profiler
+        previous = _active_profiler
+        _active_profiler = self
+        try:
+            yield self
+        finally:
+            _active_profiler = previous
+
+    def record_geometry(self, objects):
+        """
+        Record geometry statistics for the generated objects.
+
+        Args:
+            objects (list): Blender objects to measure
+        """
+        self.geometry = geometry_stats(objects)
+
+    def record_output(self, fmt, filepath):
+        """
+        Record the size of an exported file.
+
+        Args:
+            fmt (str): Export format
+            filepath (str): Path of the exported file
+        """
+        self.outputs[fmt] = {'path': filepath, 'bytes': os.path.getsize(filepath)}
+
+    def record_export(self, label, **stats):
+        """
+        Record how a set of objects was prepared for export.
+
+        Args:
+            label (str): Export name (usually the file basename)
+            **stats: Values to store, e.g. draw call counts before and after
+                batching; values recorded earlier for the label are kept
+        """
+        self.exports.setdefault(label, {}).update(stats)
+
+    def record_memory(self, report):
+        """
+        Record memory use around the run.
+
+        Args:
+            report (dict): Report from utils.memory.MemoryMonitor.record()
+        """
+        self.memory = report
+
+    def totals(self):
+        """
+        Sum top-level stage timings.
+
+        Returns:
+            dict: Total wall and CPU seconds
+        """
+        top_level = [s for s in self.stages if s['depth'] == 0 and 'wall_seconds' in s]
+        return {
+            'wall_seconds': sum(s['wall_seconds'] for s in top_level),
+            'cpu_seconds': sum(s['cpu_seconds'] for s in top_level),
+        }
+
+    def to_dict(self):
+        """Build the JSON-serializable report."""
+        return {
+            'name': self.name,
+            'totals': self.totals(),
+            'stages': self.stages,
+            'geometry': self.geometry,
+            'outputs': self.outputs,
+            'exports': self.exports,
+            'memory': self.memory,
+        }
+
+    def write_report(self, filepath):
+        """
+        Write the report as JSON.
+
+        Args:
+            filepath (str): Report path
+
+        Returns:
+            str: The report path
+        """
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return filepath
+
+
+def stage(name, **details):
+    """
+    Time a stage on the active profiler, if any.
+
+    Args:
+        name (str): Stage name
+        **details: Extra values to store with the stage record
+
+    Returns:
+        contextlib.AbstractContextManager: The timing context
+    """
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.stage(name, **details)
+
+
+def active_profiler():
+    """Get the active profiler, or None."""
+    return _active_profiler
+
+
+def mesh_stats(obj):
+    """
+    Count the geometry of one mesh object.
+
+    Args:
+        obj (bpy.types.Object): Mesh object
+
+    Returns:
+        dict: Vertex, face and triangle counts and material names
+    """
+    mesh = obj.data
+    # Read face sizes in bulk; a per-polygon loop is slow on pegboards
+    face_sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", face_sizes)
+    return {
+        'vertices': len(mesh.vertices),
+        'faces': len(mesh.polygons),
+        'triangles': int((face_sizes - 2).sum()),
+        'materials': [mat.name for mat in mesh.materials if mat is not None],
+    }
+
+
+def count_draw_calls(objects):
+    """
+    Count the draw calls a client needs for a set of objects.
+
+    Every mesh object costs one draw call per material it uses (at least
+    one), matching one glTF primitive per material.
+
+    Args:
+        objects (list): Objects; non-mesh objects are skipped
+
+    Returns:
+        int: Number of draw calls
+    """
+    return sum(max(1, len({mat.name for mat in obj.data.materials if mat is not None}))
+               for obj in objects if obj.type == 'MESH')
+
+
+def geometry_stats(objects):
+    """
+    Count the geometry of a set of objects.
+
+    Args:
+        objects (list): Blender objects; non-mesh objects are skipped
+
+    Returns:
+        dict: Per-object counts and totals, including the number of unique
+            materials and mesh datablocks
+    """
+    per_object = {obj.name: mesh_stats(obj) for obj in objects if obj.type == 'MESH'}
+    materials = {name for stats in per_object.values() for name in stats['materials']}
+    meshes = {obj.data.name for obj in objects if obj.type == 'MESH'}
+    return {
+        'objects': per_object,
+        'totals': {
+            'objects': len(per_object),
+            'meshes': len(meshes),
+            'vertices': sum(s['vertices'] for s in per_object.values()),
+            'faces': sum(s['faces'] for s in per_object.values()),
+            'triangles': sum(s['triangles'] for s in per_object.values()),
+            'materials': len(materials),
+            'draw_calls': count_draw_calls(objects),
+        },
+    }
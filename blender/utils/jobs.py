@@ -0,0 +1,224 @@
+"""
+Job File Module
+
+Assembly parameter defaults and job file loading for batch shelf generation.
+This module does not depend on bpy, so job files can be prepared and split
+outside of Blender.
+"""
+
+import copy
+import json
+
+from utils.budgets import BUDGET_ACTIONS, BUDGET_METRICS, BUDGET_PROFILE_NAMES
+
+
+# Parameters for the standard blockbuster shelf assembly
+DEFAULT_ASSEMBLY_PARAMS = {
+    'name': 'blockbuster_shelf',
+    'shelf': {
+        'width': 2.0,
+        'height': 0.1,
+        'depth': 0.6,
+        'color': (0.5, 0.5, 0.5, 1.0),      # Gray
+    },
+    'brackets': {
+        'count': 3,
+        'color': (0.5, 0.5, 0.5, 1.0),      # Gray
+    },
+    'backing': {
+        'width': 2.2,
+        'height': 1.5,
+        'thickness': 0.02,
+        'offset': 0.01,                     # More flush
+        'color': (0.7, 0.65, 0.55, 1.0),    # Darkish beige
+        'pegboard': 'none',                 # 'none', 'geometry' or 'texture'
+        'hole_spacing': 0.1,
+        'hole_diameter': 0.01,
+        'texture_resolution': 64,           # Texels per hole tile ('texture' mode)
+    },
+    'crown': {
+        'width': 2.2,
+        'height': 0.15,
+        'depth': 0.1,
+        'height_offset': 0.1,               # Centered on backing
+        'color': (0.4, 0.4, 0.4, 1.0),      # Dark gray
+    },
+    'export': {
+        'instancing': 'nodes',              # 'nodes' or 'gpu' (EXT_mesh_gpu_instancing)
+        'batching': 'none',                 # 'none' or 'static' (one merged mesh per material)
+        'lod': 'none',                      # 'none', 'files' or 'msft'
+        'lod_errors': [0.0, 0.005, 0.02, 0.05],  # Max error per level in meters (LOD0-LOD3)
+        'compression': 'none',              # 'none', 'draco' or 'meshopt' (.glb outputs)
+        'quantization_bits': {'position': 14, 'normal': 10, 'texcoord': 12},
+        'quantize': False,                  # KHR_mesh_quantization in GLB (native writer) output
+        'max_position_error': 0.0005,       # Meters; checked against a float export
+        'optimize': True,                   # Vertex cache/overdraw/fetch order of exported geometry
+        'base_lod': 0,                      # Export from this LOD level (set by budget downgrades)
+    },
+    'budget': {
+        'profile': 'none',                  # 'none', 'quest' or 'desktop' (see utils/budgets.py)
+        'action': 'fail',                   # 'fail' or 'downgrade' when a limit is exceeded
+        'limits': {},                       # Per-metric overrides of the profile
+    },
+}
+
+DEFAULT_EXPORT_FORMATS = ['FBX', 'OBJ', 'GLTF']
+
+# 'geometry' cuts real holes (create_pegboard_holes); 'texture' keeps a plain
+# slab (split along the hole area) and draws the holes with an alpha mask and
+# normal map
+PEGBOARD_MODES = ['none', 'geometry', 'texture']
+
+# How objects sharing one mesh (e.g. brackets) are exported: one node each
+# referencing the shared glTF mesh, or one EXT_mesh_gpu_instancing node
+EXPORT_INSTANCING_MODES = ['nodes', 'gpu']
+
+# 'static' merges all parts into one world-space mesh per material at export;
+# 'none' keeps one object per part for editing workflows
+EXPORT_BATCHING_MODES = ['none', 'static']
+
+# 'files' writes <name>_lod<N> files for every level plus a <name>_lod.json
+# manifest with switch distances; 'msft' also embeds the levels in the native
+# GLB output with MSFT_lod
+EXPORT_LOD_MODES = ['none', 'files', 'msft']
+
+# Geometry compression of .glb outputs (see utils/compression.py)
+EXPORT_COMPRESSION_MODES = ['none', 'draco', 'meshopt']
+
+# GLTF uses Blender's glTF exporter, GLB the native writer (utils/glb_writer.py);
+# both write <name>.glb, so only one of them may be requested at a time
+SUPPORTED_EXPORT_FORMATS = ['FBX', 'OBJ', 'GLTF', 'GLB']
+
+
+def merge_params(base, overrides):
+    """
+    Recursively merge parameter overrides into a copy of the base parameters.
+
+    Args:
+        base (dict): Base parameters
+        overrides (dict): Values to override; nested dicts are merged
+
+    Returns:
+        dict: The merged parameters
+    """
+    merged = copy.deepcopy(base)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_params(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def resolve_variant_params(variant):
+    """
+    Resolve a variant description against the default assembly parameters.
+
+    Args:
+        variant (dict): Partial assembly parameters
+
+    Returns:
+        dict: Complete assembly parameters
+    """
+    params = merge_params(DEFAULT_ASSEMBLY_PARAMS, variant)
+    # Colors come back from JSON as lists
+    for component in ('shelf', 'brackets', 'backing', 'crown'):
+        params[component]['color'] = tuple(params[component]['color'])
+    if params['backing']['pegboard'] not in PEGBOARD_MODES:
+        raise ValueError(f"Unsupported pegboard mode: {params['backing']['pegboard']} "
+                         f"(expected one of {PEGBOARD_MODES})")
+    if params['export']['instancing'] not in EXPORT_INSTANCING_MODES:
+        raise ValueError(f"Unsupported instancing mode: {params['export']['instancing']} "
+                         f"(expected one of {EXPORT_INSTANCING_MODES})")
+    if params['export']['batching'] not in EXPORT_BATCHING_MODES:
+        raise ValueError(f"Unsupported batching mode: {params['export']['batching']} "
+                         f"(expected one of {EXPORT_BATCHING_MODES})")
+    if params['export']['lod'] not in EXPORT_LOD_MODES:
+        raise ValueError(f"Unsupported LOD mode: {params['export']['lod']} "
+                         f"(expected one of {EXPORT_LOD_MODES})")
+    lod_errors = params['export']['lod_errors']
+    if not lod_errors or lod_errors[0] != 0 or any(b <= a for a, b in zip(lod_errors, lod_errors[1:])):
+        raise ValueError(f"LOD errors must start at 0 and increase: {lod_errors}")
+    if params['export']['compression'] not in EXPORT_COMPRESSION_MODES:
+        raise ValueError(f"Unsupported compression mode: {params['export']['compression']} "
+                         f"(expected one of {EXPORT_COMPRESSION_MODES})")
+    if not 0 <= params['export']['base_lod'] < len(lod_errors):
+        raise ValueError(f"base_lod must index lod_errors: {params['export']['base_lod']}")
+    if params['budget']['profile'] not in BUDGET_PROFILE_NAMES:
+        raise ValueError(f"Unsupported budget profile: {params['budget']['profile']} "
+                         f"(expected one of {BUDGET_PROFILE_NAMES})")
+    if params['budget']['action'] not in BUDGET_ACTIONS:
+        raise ValueError(f"Unsupported budget action: {params['budget']['action']} "
+                         f"(expected one of {BUDGET_ACTIONS})")
+    unknown = set(params['budget']['limits']) - set(BUDGET_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown budget metrics: {sorted(unknown)} (expected {list(BUDGET_METRICS)})")
+    if params['export']['max_position_error'] <= 0:
+        raise ValueError(f"max_position_error must be positive: {params['export']['max_position_error']}")
+    for attribute, bits in params['export']['quantization_bits'].items():
+        if not 1 <= bits <= 16:
+            raise ValueError(f"Quantization bits for {attribute} must be between 1 and 16: {bits}")
+    return params
+
+
+def validate_formats(formats):
+    """
+    Check a list of export formats.
+
+    Args:
+        formats (list): Export format names
+
+    Returns:
+        list: Upper-case format names
+    """
+    formats = [fmt.upper() for fmt in formats]
+    unsupported = [fmt for fmt in formats if fmt not in SUPPORTED_EXPORT_FORMATS]
+    if unsupported:
+        raise ValueError(f"Unsupported export formats: {unsupported}")
+    if 'GLTF' in formats and 'GLB' in formats:
+        raise ValueError("GLTF and GLB both write .glb files; request only one of them")
+    return formats
+
+
+def load_job_file(filepath):
+    """
+    Load a batch job file.
+
+    A job file is either a JSON list of variants or an object of the form
+    ``{"output_dir": ..., "formats": [...], "export": {...}, "variants": [...]}``.
+    Each variant holds partial assembly parameters and should set a unique
+    ``name``; the optional ``export`` options apply to every variant unless
+    the variant overrides them.
+
+    Args:
+        filepath (str): Path to the JSON job file
+
+    Returns:
+        dict: Job settings with ``variants`` resolved to complete parameters
+    """
+    with open(filepath, 'r') as f:
+        job = json.load(f)
+
+    if isinstance(job, list):
+        job = {'variants': job}
+
+    variants = job.get('variants')
+    if not variants:
+        raise ValueError(f"Job file has no variants: {filepath}")
+
+    resolved = []
+    names = set()
+    for index, variant in enumerate(variants):
+        params = resolve_variant_params(merge_params({'export': job.get('export', {})}, variant))
+        if 'name' not in variant:
+            params['name'] = f"{DEFAULT_ASSEMBLY_PARAMS['name']}_{index + 1:03d}"
+        if params['name'] in names:
+            raise ValueError(f"Duplicate variant name in job file: {params['name']}")
+        names.add(params['name'])
+        resolved.append(params)
+
+    return {
+        'output_dir': job.get('output_dir'),
+        'formats': validate_formats(job.get('formats', DEFAULT_EXPORT_FORMATS)),
+        'variants': resolved,
+    }
@@ -0,0 +1,122 @@
+"""
+LOD Levels Module
+
+Builds LOD objects for a set of exported objects from the decimation in
+geometry/lod.py. Every mesh datablock is decimated once per level, so objects
+that share a mesh (e.g. brackets) share its LOD meshes too. LOD objects are
+temporary export objects; the originals stay LOD0.
+"""
+
+import bpy
+
+from geometry.lod import DEFAULT_LOD_ERRORS, decimate, screen_coverage, switch_distance
+from utils.instrumentation import geometry_stats
+from utils.mesh_builder import arrays_from_mesh, mesh_from_arrays
+
+
+def create_lod_levels(objects, errors=DEFAULT_LOD_ERRORS, collection=None):
+    """
+    Create decimated copies of objects for every LOD level.
+
+    Meshes with UVs (e.g. the textured pegboard slab) are already low-poly
+    and would lose their UVs when decimated, so they are shared unchanged by
+    every level.
+
+    Args:
+        objects (list): LOD0 objects; non-mesh objects are skipped
+        errors (tuple): Maximum error per level in meters; levels with
+            error 0 are the source objects themselves
+        collection (bpy.types.Collection): Collection to link the LOD
+            objects to (default: the context collection)
+
+    Returns:
+        list: One dict per level with 'objects' (parallel to the mesh
+            objects), 'max_error', 'measured_error', 'switch_distance' and
+            'triangles'
+    """
+    objects = [obj for obj in objects if obj.type == 'MESH']
+    levels = []
+    for level, error in enumerate(errors):
+        if error <= 0:
+            levels.append({
+                'objects': objects,
+                'max_error': 0.0,
+                'measured_error': 0.0,
+                'switch_distance': 0.0,
+                'triangles': geometry_stats(objects)['totals']['triangles'],
+            })
+            continue
+
+        meshes = {}
+        measured = 0.0
+        level_objects = []
+        for obj in objects:
+            source = obj.data
+            if source.name not in meshes:
+                if source.uv_layers.active is not None:
+                    meshes[source.name] = source
+                else:
+                    arrays, mesh_error = decimate(arrays_from_mesh(source), error)
+                    mesh = mesh_from_arrays(f"{source.name}_LOD{level}", arrays)
+                    for mat in source.materials:
+                        mesh.materials.append(mat)
+                    meshes[source.name] = mesh
+                    measured = max(measured, mesh_error)
+
+            lod_obj = bpy.data.objects.new(f"{obj.name}_LOD{level}", meshes[source.name])
+            lod_obj.matrix_basis = obj.matrix_basis.copy()
+            lod_obj.parent = obj.parent
+            (collection or bpy.context.collection).objects.link(lod_obj)
+            level_objects.append(lod_obj)
+
+        levels.append({
+            'objects': level_objects,
+            'max_error': float(error),
+            'measured_error': measured,
+            'switch_distance': switch_distance(error),
+            'triangles': geometry_stats(level_objects)['totals']['triangles'],
+        })
+    return levels
+
+
+def lod_screen_coverage(obj, levels):
+    """
+    Screen coverage thresholds for MSFT_lod, one per level.
+
+    Level i is drawn while the object covers more of the screen height than
+    threshold i; the thresholds are the coverage of the object's bounding
+    sphere at the next level's switch distance. The last threshold is 0, so
+    the coarsest level is never culled.
+
+    Args:
+        obj (bpy.types.Object): LOD0 object
+        levels (list): Levels from create_lod_levels()
+
+    Returns:
+        list: Decreasing coverage thresholds
+    """
+    radius = obj.dimensions.length / 2.0
+    return [screen_coverage(radius, level['switch_distance']) for level in levels[1:]] + [0.0]
+
+
+def lod_manifest(levels, files):
+    """
+    Describe a LOD chain for clients that switch between separate files.
+
+    Args:
+        levels (list): Levels from create_lod_levels()
+        files (list): Per level, a mapping of export format to file path
+
+    Returns:
+        dict: JSON-serializable manifest
+    """
+    return {
+        'levels': [{
+            'level': index,
+            'max_error': level['max_error'],
+            'measured_error': round(level['measured_error'], 6),
+            'switch_distance': round(level['switch_distance'], 3),
+            'triangles': level['triangles'],
+            'files': level_files,
+        } for index, (level, level_files) in enumerate(zip(levels, files))],
+    }
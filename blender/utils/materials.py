@@ -0,0 +1,246 @@
+"""
+Material Library Module
+
+Shared Principled BSDF materials keyed by their full shading parameters.
+Components with identical color, roughness, metallic and specular values get
+the same material datablock, so exports carry one material (and one draw
+call batch) per distinct look instead of one per object.
+
+The library is kept for the whole Blender process, so every variant of a
+batch run or daemon session reuses the same materials. Library materials
+carry a fake user so they survive their objects being removed between
+variants; when the scene is reset, release_unused() drops the materials no
+object uses any more, so a colour sweep does not pin one material per
+colour for the rest of the session.
+"""
+
+import bpy
+
+
+# Principled BSDF input names, newest first (Blender 4.0 renamed Specular)
+BSDF_INPUT_NAMES = {
+    'color': ('Base Color',),
+    'roughness': ('Roughness',),
+    'metallic': ('Metallic',),
+    'specular': ('Specular IOR Level', 'Specular'),
+}
+
+
+def bsdf_input(bsdf, parameter):
+    """
+    Find a Principled BSDF input by parameter, across Blender versions.
+
+    Args:
+        bsdf (bpy.types.ShaderNode): Principled BSDF node
+        parameter (str): 'color', 'roughness', 'metallic' or 'specular'
+
+    Returns:
+        bpy.types.NodeSocket: The input socket, or None if the node has none
+    """
+    for name in BSDF_INPUT_NAMES[parameter]:
+        socket = bsdf.inputs.get(name)
+        if socket is not None:
+            return socket
+    return None
+
+
+def material_key(color, roughness=0.5, metallic=0.0, specular=0.5):
+    """
+    Build the registry key for a set of shading parameters.
+
+    Values are rounded so that float noise (e.g. colors read back from JSON)
+    does not split otherwise identical materials.
+
+    Returns:
+        tuple: Hashable key
+    """
+    return (tuple(round(float(c), 6) for c in color),
+            round(float(roughness), 6), round(float(metallic), 6), round(float(specular), 6))
+
+
+def create_material(name, color, roughness=0.5, metallic=0.0, specular=0.5):
+    """
+    Create a Principled BSDF material.
+
+    Args:
+        name (str): Material name
+        color (tuple): RGBA base color
+        roughness (float): Roughness
+        metallic (float): Metallic
+        specular (float): Specular level (0.5 is Blender's default)
+
+    Returns:
+        bpy.types.Material: The created material
+    """
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    mat.diffuse_color = color
+
+    bsdf = mat.node_tree.nodes.get('Principled BSDF')
+    if bsdf is not None:
+        values = {'color': color, 'roughness': roughness, 'metallic': metallic, 'specular': specular}
+        for parameter, value in values.items():
+            socket = bsdf_input(bsdf, parameter)
+            if socket is not None:
+                socket.default_value = value
+    return mat
+
+
+def assign_material(obj, mat):
+    """
+    Make a material the object's first material.
+
+    Args:
+        obj (bpy.types.Object): Object to modify
+        mat (bpy.types.Material): Material to assign
+    """
+    if obj.data.materials:
+        obj.data.materials[0] = mat
+    else:
+        obj.data.materials.append(mat)
+
+
+class MaterialLibrary:
+    """Registry of shared materials keyed by shading parameters."""
+
+    def __init__(self):
+        # Keys map to material names, which stay valid when datablocks are
+        # removed behind the library's back (a stale name is simply rebuilt)
+        self._names = {}
+        self.requests = 0
+        self.created = 0
+
+    def lookup(self, key):
+        """
+        Get the registered material for a key.
+
+        Args:
+            key (tuple): Registry key
+
+        Returns:
+            bpy.types.Material: The material, or None
+        """
+        name = self._names.get(key)
+        mat = bpy.data.materials.get(name) if name else None
+        if mat is None:
+            self._names.pop(key, None)
+        return mat
+
+    def register(self, key, mat):
+        """
+        Register a material under a key and protect it from orphan cleanup.
+
+        Args:
+            key (tuple): Registry key
+            mat (bpy.types.Material): The material
+        """
+        mat.use_fake_user = True
+        self._names[key] = mat.name
+
+    def get(self, name, color, roughness=0.5, metallic=0.0, specular=0.5):
+        """
+        Get the shared material for a set of shading parameters.
+
+        Args:
+            name (str): Name prefix used if the material has to be created
+                (the material is called <name>_Material)
+            color (tuple): RGBA base color
+            roughness (float): Roughness
+            metallic (float): Metallic
+            specular (float): Specular level
+
+        Returns:
+            bpy.types.Material: The shared material
+        """
+        self.requests += 1
+        key = material_key(color, roughness, metallic, specular)
+        mat = self.lookup(key)
+        if mat is None:
+            mat = create_material(f"{name}_Material", color, roughness, metallic, specular)
+            self.register(key, mat)
+            self.created += 1
+        return mat
+
+    def derive(self, mat, variant, build):
+        """
+        Get a shared variation of a library material (e.g. with textures).
+
+        Args:
+            mat (bpy.types.Material): Base material
+            variant (tuple): Hashable description of the variation; part of
+                the key together with the base material
+            build (callable): build(material) modifies a fresh copy of the
+                base material into the variation
+
+        Returns:
+            bpy.types.Material: The shared variation
+        """
+        self.requests += 1
+        key = ('derived', mat.name, variant)
+        derived = self.lookup(key)
+        if derived is None:
+            derived = mat.copy()
+            build(derived)
+            self.register(key, derived)
+            self.created += 1
+        return derived
+
+    def release_unused(self):
+        """
+        Forget the materials no mesh or object uses and drop their fake users.
+
+        A base material is kept while a variation derived from it is in use,
+        since the variation is registered under the base material's name.
+        Released materials are left without users for purge_orphans().
+
+        Returns:
+            int: Number of released materials
+        """
+        live = {key: self.lookup(key) for key in list(self._names)}
+        live = {key: mat for key, mat in live.items() if mat is not None}
+        used = {key for key, mat in live.items() if mat.users > int(mat.use_fake_user)}
+        bases = {key[1] for key in used if key[0] == 'derived'}
+        released = 0
+        for key, mat in live.items():
+            if key not in used and mat.name not in bases:
+                mat.use_fake_user = False
+                del self._names[key]
+                released += 1
+        return released
+
+    def clear(self):
+        """Forget every material and release the library's fake users."""
+        for key in list(self._names):
+            mat = self.lookup(key)
+            if mat is not None:
+                mat.use_fake_user = False
+        self._names.clear()
+
+    def stats(self):
+        """
+        Summarize library use.
+
+        Returns:
+            dict: Live materials, material requests and how many were reused
+        """
+        return {
+            'materials': sum(1 for key in list(self._names) if self.lookup(key) is not None),
+            'requests': self.requests,
+            'reused': self.requests - self.created,
+        }
+
+
+_library = None
+
+
+def material_library():
+    """
+    Get the process-wide material library.
+
+    Returns:
+        MaterialLibrary: The shared library
+    """
+    global _library
+    if _library is None:
+        _library = MaterialLibrary()
+    return _library
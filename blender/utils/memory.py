@@ -0,0 +1,192 @@
+"""
+Memory Accounting Module
+
+Keeps long-running generation sessions (batch runs, the daemon) from growing
+without bound. purge_orphans() removes datablocks nothing uses any more
+(meshes left by removed objects, unprotected materials, node trees, images),
+and MemoryMonitor records bpy.data collection sizes and process RSS around
+every variant and raises a leak alarm when a value keeps growing over a
+window of variants.
+
+Library materials (utils/materials.py) carry a fake user so they survive
+between variants; purge_orphans() releases the ones no object uses any more
+and removes them too, so a colour sweep does not grow bpy.data.materials.
+"""
+
+import os
+import sys
+
+import bpy
+
+from utils.materials import material_library
+
+
+# bpy.data collections that are counted, in report order
+DATA_COLLECTIONS = ('objects', 'meshes', 'materials', 'node_groups', 'images', 'textures',
+                    'cameras', 'lights', 'collections')
+
+# Collections purge_orphans() removes unused datablocks from; materials go
+# before node groups and images, which they may be the last users of.
+# Camera and light data are left alone: setup_scene() reuses them by name.
+PURGE_COLLECTIONS = ('meshes', 'materials', 'node_groups', 'textures', 'images')
+
+# Variants a value must keep growing over before the leak alarm goes off
+DEFAULT_LEAK_WINDOW = 5
+
+# RSS growth over the window below which allocator noise is ignored
+DEFAULT_RSS_TOLERANCE_BYTES = 32 * 1024 * 1024
+
+
+def datablock_counts():
+    """
+    Count the datablocks of the tracked bpy.data collections.
+
+    Returns:
+        dict: Collection name -> number of datablocks
+    """
+    return {name: len(getattr(bpy.data, name)) for name in DATA_COLLECTIONS}
+
+
+def process_rss_bytes():
+    """
+    Resident set size of this process.
+
+    Reads /proc on Linux; elsewhere falls back to the peak RSS, which can
+    only grow but still shows a leak.
+
+    Returns:
+        int: RSS in bytes (0 where neither is available, e.g. Windows)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+        except ImportError:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def memory_snapshot():
+    """
+    Take a snapshot of datablock counts and process RSS.
+
+    Returns:
+        dict: {'datablocks': {...}, 'rss_bytes': int}
+    """
+    return {'datablocks': datablock_counts(), 'rss_bytes': process_rss_bytes()}
+
+
+def purge_orphans():
+    """
+    Remove every datablock without users from the purged collections.
+
+    Removing a material can orphan its images and node groups, so the purge
+    repeats until nothing is left to remove. Once the orphaned meshes are
+    gone, library materials no object uses any more lose their fake user
+    (MaterialLibrary.release_unused()) and are removed as well.
+
+    Returns:
+        dict: Collection name -> number of removed datablocks (only non-zero)
+    """
+    removed = {}
+    while True:
+        found = False
+        for name in PURGE_COLLECTIONS:
+            orphans = [datablock for datablock in getattr(bpy.data, name) if datablock.users == 0]
+            if orphans:
+                bpy.data.batch_remove(orphans)
+                removed[name] = removed.get(name, 0) + len(orphans)
+                found = True
+        if not found and not material_library().release_unused():
+            return removed
+
+
+def snapshot_delta(before, after):
+    """
+    Difference between two snapshots.
+
+    Returns:
+        dict: Non-zero datablock count changes and the RSS change in bytes
+    """
+    return {
+        'datablocks': {name: after['datablocks'][name] - before['datablocks'][name]
+                       for name in after['datablocks']
+                       if after['datablocks'][name] != before['datablocks'].get(name, 0)},
+        'rss_bytes': after['rss_bytes'] - before['rss_bytes'],
+    }
+
+
+class MemoryMonitor:
+    """Tracks memory across the variants of one session and detects leaks."""
+
+    def __init__(self, window=DEFAULT_LEAK_WINDOW, rss_tolerance=DEFAULT_RSS_TOLERANCE_BYTES):
+        """
+        Args:
+            window (int): Variants a value must keep growing over to count
+                as a leak
+            rss_tolerance (int): RSS growth over the window that is ignored
+        """
+        self.window = window
+        self.rss_tolerance = rss_tolerance
+        self.history = []
+        self.alarms = []
+
+    def record(self, name, before, after):
+        """
+        Record the snapshots taken around one variant.
+
+        Args:
+            name (str): Variant name
+            before (dict): memory_snapshot() before the variant
+            after (dict): memory_snapshot() after the variant (and its purge)
+
+        Returns:
+            dict: Per-variant memory report with 'before', 'after', 'delta'
+                and the leak alarms raised by this variant under 'leaks'
+        """
+        self.history.append(after)
+        leaks = self.check_leaks()
+        for leak in leaks:
+            print(f"WARNING: possible memory leak after {name}: {leak}")
+        self.alarms.extend({'variant': name, 'leak': leak} for leak in leaks)
+        return {'before': before, 'after': after, 'delta': snapshot_delta(before, after), 'leaks': leaks}
+
+    def check_leaks(self):
+        """
+        Find values that grew after every one of the last window variants.
+
+        Returns:
+            list: Descriptions of the growing values
+        """
+        if self.window < 1 or len(self.history) <= self.window:
+            return []
+        recent = self.history[-self.window - 1:]
+        leaks = []
+        for name in DATA_COLLECTIONS:
+            counts = [snapshot['datablocks'][name] for snapshot in recent]
+            if all(b > a for a, b in zip(counts, counts[1:])):
+                leaks.append(f"bpy.data.{name} grew from {counts[0]} to {counts[-1]} "
+                             f"over {self.window} variants")
+        rss = [snapshot['rss_bytes'] for snapshot in recent]
+        if all(b > a for a, b in zip(rss, rss[1:])) and rss[-1] - rss[0] > self.rss_tolerance:
+            leaks.append(f"RSS grew by {(rss[-1] - rss[0]) / (1024 * 1024):.1f} MB "
+                         f"over {self.window} variants")
+        return leaks
+
+    def summary(self):
+        """
+        Summarize the session.
+
+        Returns:
+            dict: Variants recorded, first and last snapshot and all alarms
+        """
+        return {
+            'variants': len(self.history),
+            'first': self.history[0] if self.history else None,
+            'last': self.history[-1] if self.history else None,
+            'alarms': self.alarms,
+        }
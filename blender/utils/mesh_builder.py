@@ -0,0 +1,136 @@
+"""
+Mesh Builder Module
+
+Loads MeshArrays from geometry/mesh_core.py into Blender meshes in bulk with
+foreach_set, instead of creating vertices and faces one element at a time.
+"""
+
+import bpy
+import numpy as np
+
+from geometry.mesh_core import MeshArrays
+
+
+def fill_mesh(mesh, arrays):
+    """
+    Replace the geometry of a mesh datablock with the given arrays.
+
+    Args:
+        mesh (bpy.types.Mesh): Mesh to fill (must be empty)
+        arrays (MeshArrays): Geometry to load
+    """
+    vertices = np.ascontiguousarray(arrays.vertices, dtype=np.float32)
+    loops = np.ascontiguousarray(arrays.loops, dtype=np.int32)
+    face_sizes = np.ascontiguousarray(arrays.face_sizes, dtype=np.int32)
+    starts = np.zeros(len(face_sizes), dtype=np.int32)
+    np.cumsum(face_sizes[:-1], out=starts[1:])
+
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", vertices.ravel())
+
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", loops)
+
+    mesh.polygons.add(len(face_sizes))
+    mesh.polygons.foreach_set("loop_start", starts)
+    if bpy.app.version < (4, 0, 0):
+        # Blender 4.x derives loop_total from the loop starts
+        mesh.polygons.foreach_set("loop_total", face_sizes)
+    mesh.polygons.foreach_set("use_smooth", np.full(len(face_sizes), arrays.smooth, dtype=bool))
+
+    mesh.update(calc_edges=True)
+
+
+def mesh_from_arrays(name, arrays):
+    """
+    Create a mesh datablock from arrays.
+
+    Args:
+        name (str): Mesh name
+        arrays (MeshArrays): Geometry to load
+
+    Returns:
+        bpy.types.Mesh: The created mesh
+    """
+    mesh = bpy.data.meshes.new(name)
+    fill_mesh(mesh, arrays)
+    return mesh
+
+
+def object_from_arrays(name, arrays, collection=None):
+    """
+    Create a mesh object from arrays and link it to a collection.
+
+    Args:
+        name (str): Object name; the mesh is named <name>_mesh
+        arrays (MeshArrays): Geometry to load
+        collection (bpy.types.Collection): Collection to link to
+            (default: the context collection)
+
+    Returns:
+        bpy.types.Object: The created object
+    """
+    mesh = mesh_from_arrays(f"{name}_mesh", arrays)
+    obj = bpy.data.objects.new(name, mesh)
+    (collection or bpy.context.collection).objects.link(obj)
+    return obj
+
+
+def arrays_from_mesh(mesh):
+    """
+    Read the geometry of a Blender mesh back into arrays in bulk.
+
+    Args:
+        mesh (bpy.types.Mesh): Mesh to read
+
+    Returns:
+        MeshArrays: The mesh geometry (smooth if any face is smooth shaded)
+    """
+    vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertices)
+
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loops)
+
+    face_sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", face_sizes)
+    smooth = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+
+    return MeshArrays(vertices.reshape(-1, 3), loops, face_sizes, bool(smooth.any()))
+
+
+def set_loop_uvs(mesh, uvs, name="UVMap"):
+    """
+    Store per-corner UVs on a mesh in bulk.
+
+    Args:
+        mesh (bpy.types.Mesh): Mesh to modify
+        uvs (np.ndarray): (L, 2) UVs, one per loop
+        name (str): UV layer name; the layer is created if missing
+
+    Returns:
+        bpy.types.MeshUVLoopLayer: The UV layer
+    """
+    layer = mesh.uv_layers.get(name) or mesh.uv_layers.new(name=name)
+    layer.data.foreach_set("uv", np.ascontiguousarray(uvs, dtype=np.float32).ravel())
+    mesh.uv_layers.active = layer
+    return layer
+
+
+def loop_uvs(mesh):
+    """
+    Read the active UV layer of a mesh in bulk.
+
+    Args:
+        mesh (bpy.types.Mesh): Mesh to read
+
+    Returns:
+        np.ndarray: (L, 2) float32 UVs, one per loop, or None without UVs
+    """
+    layer = mesh.uv_layers.active
+    if layer is None:
+        return None
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    layer.data.foreach_get("uv", uvs)
+    return uvs.reshape(-1, 2)
@@ -0,0 +1,219 @@
+"""
+Quantization Validator Module
+
+Checks a GLB written with KHR_mesh_quantization against a float export of the
+same objects. Both files are decoded independently of the writer: accessors
+are read with their stride, component type and normalization, every mesh
+instance is placed in world space through the node hierarchy (including
+EXT_mesh_gpu_instancing), and the decoded positions, normals and UVs are
+compared. Nothing here imports bpy.
+"""
+
+import numpy as np
+
+from utils.glb_writer import read_glb
+
+
+# glTF component type -> NumPy dtype
+COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+TYPE_COMPONENTS = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT4': 16}
+
+
+def read_accessor(document, buffer, index):
+    """
+    Decode an accessor into float64 values.
+
+    Args:
+        document (dict): glTF JSON document
+        buffer (bytes): GLB binary chunk
+        index (int): Accessor index
+
+    Returns:
+        np.ndarray: (count, components) values, normalized integers mapped
+            to [-1, 1] or [0, 1] as the glTF spec defines
+    """
+    accessor = document['accessors'][index]
+    view = document['bufferViews'][accessor['bufferView']]
+    dtype = np.dtype(COMPONENT_DTYPES[accessor['componentType']])
+    components = TYPE_COMPONENTS[accessor['type']]
+    stride = view.get('byteStride', dtype.itemsize * components)
+    start = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+
+    raw = np.frombuffer(buffer, dtype=np.uint8, count=stride * (accessor['count'] - 1)
+                        + dtype.itemsize * components, offset=start)
+    rows = np.lib.stride_tricks.as_strided(raw, shape=(accessor['count'], dtype.itemsize * components),
+                                           strides=(stride, 1))
+    values = np.ascontiguousarray(rows).view(dtype).reshape(accessor['count'], components).astype(np.float64)
+    if accessor.get('normalized'):
+        info = np.iinfo(dtype)
+        values = np.maximum(values / info.max, -1.0) if info.min < 0 else values / info.max
+    return values
+
+
+def trs_matrices(translation, rotation, scale):
+    """
+    Build 4x4 matrices from glTF TRS values.
+
+    Args:
+        translation (np.ndarray): (N, 3)
+        rotation (np.ndarray): (N, 4) quaternions as (x, y, z, w)
+        scale (np.ndarray): (N, 3)
+
+    Returns:
+        np.ndarray: (N, 4, 4) matrices
+    """
+    x, y, z, w = (rotation[:, i] for i in range(4))
+    matrices = np.zeros((len(translation), 4, 4))
+    matrices[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    matrices[:, 0, 1] = 2 * (x * y - z * w)
+    matrices[:, 0, 2] = 2 * (x * z + y * w)
+    matrices[:, 1, 0] = 2 * (x * y + z * w)
+    matrices[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    matrices[:, 1, 2] = 2 * (y * z - x * w)
+    matrices[:, 2, 0] = 2 * (x * z - y * w)
+    matrices[:, 2, 1] = 2 * (y * z + x * w)
+    matrices[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    matrices[:, :3, :3] *= scale[:, None, :]
+    matrices[:, :3, 3] = translation
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def node_matrix(node):
+    """Local 4x4 matrix of a glTF node."""
+    if 'matrix' in node:
+        return np.array(node['matrix'], dtype=np.float64).reshape(4, 4).T
+    return trs_matrices(np.array([node.get('translation', [0.0, 0.0, 0.0])], dtype=np.float64),
+                        np.array([node.get('rotation', [0.0, 0.0, 0.0, 1.0])], dtype=np.float64),
+                        np.array([node.get('scale', [1.0, 1.0, 1.0])], dtype=np.float64))[0]
+
+
+def mesh_instances(document, buffer):
+    """
+    Find the world matrix of every drawn mesh instance.
+
+    Nodes hidden behind MSFT_lod are included, since they are drawn at a
+    distance.
+
+    Args:
+        document (dict): glTF JSON document
+        buffer (bytes): GLB binary chunk
+
+    Returns:
+        dict: Mesh index -> list of 4x4 world matrices in traversal order
+    """
+    nodes = document.get('nodes', [])
+    instances = {}
+
+    def visit(index, parent):
+        node = nodes[index]
+        world = parent @ node_matrix(node)
+        if 'mesh' in node:
+            gpu = node.get('extensions', {}).get('EXT_mesh_gpu_instancing')
+            if gpu is None:
+                instances.setdefault(node['mesh'], []).append(world)
+            else:
+                attributes = gpu['attributes']
+                count = document['accessors'][next(iter(attributes.values()))]['count']
+                translation = (read_accessor(document, buffer, attributes['TRANSLATION'])
+                               if 'TRANSLATION' in attributes else np.zeros((count, 3)))
+                rotation = (read_accessor(document, buffer, attributes['ROTATION'])
+                            if 'ROTATION' in attributes else np.tile([0.0, 0.0, 0.0, 1.0], (count, 1)))
+                scale = (read_accessor(document, buffer, attributes['SCALE'])
+                         if 'SCALE' in attributes else np.ones((count, 3)))
+                instances.setdefault(node['mesh'], []).extend(
+                    world @ trs_matrices(translation, rotation, scale))
+        for child in node.get('children', []):
+            visit(child, world)
+        for lod in node.get('extensions', {}).get('MSFT_lod', {}).get('ids', []):
+            visit(lod, parent)
+
+    for index in document['scenes'][document.get('scene', 0)]['nodes']:
+        visit(index, np.eye(4))
+    return instances
+
+
+def decoded_meshes(data):
+    """
+    Decode every mesh instance of a GLB into world-space attributes.
+
+    Args:
+        data (bytes): GLB file contents
+
+    Returns:
+        dict: Mesh index -> list of per-instance lists of primitive dicts
+            with 'positions', 'normals' and 'uvs' (or None)
+    """
+    document, buffer = read_glb(data)
+    decoded = {}
+    for mesh, matrices in mesh_instances(document, buffer).items():
+        primitives = document['meshes'][mesh]['primitives']
+        local = [{name: read_accessor(document, buffer, primitive['attributes'][attribute])
+                  if attribute in primitive['attributes'] else None
+                  for name, attribute in (('positions', 'POSITION'), ('normals', 'NORMAL'),
+                                          ('uvs', 'TEXCOORD_0'))} for primitive in primitives]
+        decoded[mesh] = []
+        for matrix in matrices:
+            placed = []
+            for attributes in local:
+                positions = attributes['positions'] @ matrix[:3, :3].T + matrix[:3, 3]
+                normals = attributes['normals']
+                if normals is not None:
+                    normals = normals @ np.linalg.inv(matrix[:3, :3])
+                    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+                placed.append({'positions': positions, 'normals': normals, 'uvs': attributes['uvs']})
+            decoded[mesh].append(placed)
+    return decoded
+
+
+def validate_quantization(quantized_path, source_path, max_position_error):
+    """
+    Compare a quantized GLB with the float export it was made from.
+
+    Args:
+        quantized_path (str): GLB written with KHR_mesh_quantization
+        source_path (str): Float GLB of the same objects
+        max_position_error (float): Allowed world-space position error
+
+    Returns:
+        dict: Largest position error (m), normal error (degrees) and UV error,
+            and 'valid' (False also when the two files do not match up)
+    """
+    with open(quantized_path, 'rb') as f:
+        quantized = decoded_meshes(f.read())
+    with open(source_path, 'rb') as f:
+        source = decoded_meshes(f.read())
+
+    report = {'max_position_error': 0.0, 'max_normal_error_degrees': 0.0, 'max_uv_error': 0.0,
+              'max_position_error_allowed': max_position_error, 'valid': True}
+    if quantized.keys() != source.keys():
+        report['valid'] = False
+        return report
+    for mesh, instances in source.items():
+        if len(quantized[mesh]) != len(instances):
+            report['valid'] = False
+            continue
+        for expected_instance, actual_instance in zip(instances, quantized[mesh]):
+            for expected, actual in zip(expected_instance, actual_instance):
+                if len(expected['positions']) != len(actual['positions']):
+                    report['valid'] = False
+                    continue
+                error = np.linalg.norm(actual['positions'] - expected['positions'], axis=1)
+                report['max_position_error'] = max(report['max_position_error'], float(error.max(initial=0.0)))
+                if expected['normals'] is not None and actual['normals'] is not None:
+                    cosine = np.clip(np.einsum('ij,ij->i', expected['normals'], actual['normals']), -1.0, 1.0)
+                    report['max_normal_error_degrees'] = max(report['max_normal_error_degrees'],
+                                                             float(np.degrees(np.arccos(cosine)).max(initial=0.0)))
+                if expected['uvs'] is not None and actual['uvs'] is not None:
+                    report['max_uv_error'] = max(report['max_uv_error'],
+                                                 float(np.abs(actual['uvs'] - expected['uvs']).max(initial=0.0)))
+    if report['max_position_error'] > max_position_error:
+        report['valid'] = False
+    return report
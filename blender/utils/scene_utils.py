@@ -2,94 +2,229 @@
 Utilities Module
 
 Common utility functions for Blender shelf generation.
+
+Scene management works on bpy.data directly (bulk removal, datablocks
+created with .new()) rather than through operators, so resetting the scene
+between batch variants does not depend on selection or UI context. Blender's
+exporters still are operators; they run on a temporary scene through a
+context override.
 """
 
+import contextlib
+import os
+
 import bpy
 import bmesh
 
+from utils.compression import draco_export_options, quantization_bits
+from utils.export_optimize import optimized_meshes
+from utils.glb_export import export_glb
+from utils.memory import purge_orphans
+
+
+# Names of the camera and light kept by setup_scene()
+CAMERA_NAME = "ShelfCamera"
+LIGHT_NAME = "ShelfLight"
 
-def clear_scene():
-    """Clear all objects from the current scene."""
-    # Select all objects
-    bpy.ops.object.select_all(action='SELECT')
+
+def clear_scene(scene=None, purge=True):
+    """
+    Remove all objects from a scene in one bulk operation.
+    
+    Works on bpy.data directly, so no selection, active object or operator
+    context is involved and the cost does not depend on the UI state.
     
-    # Delete all selected objects
-    bpy.ops.object.delete(use_global=False)
+    Args:
+        scene (bpy.types.Scene): Scene to clear (default: the context scene)
+        purge (bool): Also remove the meshes, materials, node trees and
+            images left without users (see utils/memory.py), including
+            library materials no remaining object uses
+        
+    Returns:
+        dict: Removed orphans per bpy.data collection
+    """
+    scene = scene or bpy.context.scene
+    objects = list(scene.objects)
+    if objects:
+        bpy.data.batch_remove(objects)
+    return purge_orphans() if purge else {}
+
+
+def reuse_or_create(collection, name, *args):
+    """Get a datablock by name, or create it (keeps setup_scene() from piling up data)."""
+    datablock = collection.get(name)
+    return datablock if datablock is not None else collection.new(name, *args)
 
 
 def setup_scene():
     """Set up the scene for shelf generation."""
     # Clear existing objects
-    clear_scene()
+    scene = bpy.context.scene
+    clear_scene(scene)
     
     # Set units to metric
-    scene = bpy.context.scene
     scene.unit_settings.system = 'METRIC'
     scene.unit_settings.scale_length = 1.0
     
-    # Set up camera and lighting (basic setup)
-    # Add camera
-    bpy.ops.object.camera_add(location=(3, -3, 2))
-    camera = bpy.context.active_object
+    # Set up camera and lighting (basic setup); the data is reused across
+    # variants, only the objects are recreated
+    camera = bpy.data.objects.new(CAMERA_NAME, reuse_or_create(bpy.data.cameras, CAMERA_NAME))
+    camera.location = (3, -3, 2)
     camera.rotation_euler = (1.1, 0, 0.785)  # Point at origin
+    scene.collection.objects.link(camera)
+    scene.camera = camera
     
-    # Add light
-    bpy.ops.object.light_add(type='SUN', location=(2, 2, 5))
-    light = bpy.context.active_object
-    light.data.energy = 5.0
+    light_data = reuse_or_create(bpy.data.lights, LIGHT_NAME, 'SUN')
+    light_data.energy = 5.0
+    light = bpy.data.objects.new(LIGHT_NAME, light_data)
+    light.location = (2, 2, 5)
+    scene.collection.objects.link(light)
 
 
-def export_shelf_assembly(objects, filepath, file_format='FBX'):
+@contextlib.contextmanager
+def export_scene(objects):
+    """
+    Make a temporary scene that holds only the objects to export.
+    
+    Exporters then run on the whole (temporary) scene through a context
+    override, so the selection of the working scene is never touched.
+    Objects are linked, not copied; removing the scene leaves them as they
+    were.
+    
+    Args:
+        objects (list): Objects to export
+        
+    Yields:
+        bpy.types.Scene: The temporary scene, active in the context
+    """
+    scene = bpy.data.scenes.new("ShelfExport")
+    try:
+        for obj in objects:
+            scene.collection.objects.link(obj)
+        with bpy.context.temp_override(scene=scene, view_layer=scene.view_layers[0]):
+            yield scene
+    finally:
+        bpy.data.scenes.remove(scene)
+
+
+def export_shelf_assembly(objects, filepath, file_format='FBX', options=None, lod_levels=None):
     """
     Export shelf assembly to file.
     
     Args:
         objects (list): List of objects to export
         filepath (str): Export file path
-        file_format (str): Export format ('FBX', 'OBJ', 'GLTF')
+        file_format (str): Export format ('FBX', 'OBJ', 'GLTF', or 'GLB' for
+            the native GLB writer)
+        options (dict): Export options from the assembly parameters
+            ('instancing': 'nodes' or 'gpu'; 'compression': 'draco' enables
+            the glTF exporter's Draco encoder, other compression is applied
+            after export, see utils/compression.py; 'quantize' with
+            'max_position_error' writes GLB with KHR_mesh_quantization;
+            'optimize' deduplicates and reorders the exported geometry for
+            the vertex cache, in every format)
+        lod_levels (list): LOD levels to embed with MSFT_lod (GLB only)
     """
-    # Select objects for export
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in objects:
-        obj.select_set(True)
+    options = options or {}
+    instancing = options.get('instancing', 'nodes')
     
-    # Export based on format
-    if file_format.upper() == 'FBX':
+    if file_format.upper() in ('FBX', 'OBJ', 'GLTF'):
+        # The operators write Blender meshes, so they get optimized copies
+        optimize = contextlib.nullcontext()
+        if options.get('optimize', True):
+            label = f"{os.path.splitext(os.path.basename(filepath))[0]}:{file_format.upper()}"
+            optimize = optimized_meshes(objects, label)
+        with optimize, export_scene(objects):
+            export_with_operator(filepath, file_format.upper(), instancing, options)
+    elif file_format.upper() == 'GLB':
+        # Native writer straight from mesh arrays, no exporter operator
+        max_position_error = options.get('max_position_error') if options.get('quantize') else None
+        export_glb(objects, filepath, instancing=instancing, lod_levels=lod_levels,
+                   max_position_error=max_position_error, optimize=options.get('optimize', True))
+    else:
+        raise ValueError(f"Unsupported export format: {file_format}")
+
+
+def export_with_operator(filepath, file_format, instancing='nodes', options=None):
+    """
+    Export the whole context scene with one of Blender's exporters.
+    
+    Args:
+        filepath (str): Export file path
+        file_format (str): 'FBX', 'OBJ' or 'GLTF'
+        instancing (str): 'nodes' or 'gpu' (GLTF only)
+        options (dict): Export options from the assembly parameters
+    """
+    options = options or {}
+    if file_format == 'FBX':
         bpy.ops.export_scene.fbx(
             filepath=filepath,
-            use_selection=True,
+            use_selection=False,
             global_scale=1.0
         )
-    elif file_format.upper() == 'OBJ':
-        bpy.ops.export_scene.obj(
-            filepath=filepath,
-            use_selection=True,
-            global_scale=1.0
-        )
-    elif file_format.upper() == 'GLTF':
+    elif file_format == 'OBJ':
+        if hasattr(bpy.ops.wm, 'obj_export'):
+            # Blender 4.x replaced the Python OBJ exporter
+            bpy.ops.wm.obj_export(
+                filepath=filepath,
+                export_selected_objects=False,
+                global_scale=1.0
+            )
+        else:
+            bpy.ops.export_scene.obj(
+                filepath=filepath,
+                use_selection=False,
+                global_scale=1.0
+            )
+    elif file_format == 'GLTF':
+        # Objects with linked mesh data already share one glTF mesh;
+        # use_active_scene keeps the exporter from adding every other scene
+        gltf_options = {'use_active_scene': True}
+        if instancing == 'gpu' and bpy.app.version >= (3, 6, 0):
+            gltf_options['export_gpu_instances'] = True
+        if options.get('compression') == 'draco':
+            gltf_options.update(draco_export_options(quantization_bits(options)))
         bpy.ops.export_scene.gltf(
             filepath=filepath,
-            use_selection=True
+            export_format='GLB',
+            use_selection=False,
+            **gltf_options
         )
-    else:
-        raise ValueError(f"Unsupported export format: {file_format}")
+
+
+def apply_placement(obj, placement):
+    """
+    Move an object to its solved placement (see geometry/layout.py).
+    
+    Args:
+        obj (bpy.types.Object): Object to place
+        placement (Placement): Solved transform
+    """
+    obj.location = placement.location
+    obj.rotation_euler = placement.rotation
 
 
 def create_collection(name="ShelfAssembly"):
     """
     Create a collection for organizing shelf objects.
     
+    An existing collection with the same name is reused, so repeated
+    generation in one Blender session does not pile up numbered duplicates.
+    
     Args:
         name (str): Name of the collection
         
     Returns:
-        bpy.types.Collection: The created collection
+        bpy.types.Collection: The created or reused collection
     """
-    # Create new collection
-    collection = bpy.data.collections.new(name)
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        # Create new collection
+        collection = bpy.data.collections.new(name)
     
     # Link to scene
-    bpy.context.scene.collection.children.link(collection)
+    if collection.name not in bpy.context.scene.collection.children:
+        bpy.context.scene.collection.children.link(collection)
     
     return collection
 
@@ -109,3 +244,15 @@ def move_objects_to_collection(objects, collection):
         
         # Add to target collection
         collection.objects.link(obj)
+
+
+def remove_objects(objects):
+    """
+    Remove objects from the file along with mesh data they no longer share.
+    
+    Args:
+        objects (list): List of objects to remove
+    """
+    meshes = {obj.data for obj in objects if obj.type == 'MESH'}
+    bpy.data.batch_remove(objects)
+    bpy.data.batch_remove([mesh for mesh in meshes if mesh.users == 0])
@@ -0,0 +1,76 @@
+"""
+Static Batch Module
+
+Merges static objects into one mesh per material with their transforms baked
+in, so a client draws a whole assembly with one draw call per material
+instead of one per object. Batches are temporary export objects; the
+original per-component objects are left untouched.
+"""
+
+import bpy
+import numpy as np
+
+from geometry.mesh_core import merge_arrays, transform_arrays
+from utils.mesh_builder import arrays_from_mesh, loop_uvs, mesh_from_arrays, set_loop_uvs
+
+
+def static_batch_groups(objects):
+    """
+    Group mesh objects that can be merged into one mesh.
+
+    Objects merge when they share their material and shading mode (smooth or
+    flat), since a merged mesh has one of each.
+
+    Args:
+        objects (list): Objects; non-mesh objects are skipped
+
+    Returns:
+        dict: (material, smooth) -> list of objects, in first-seen order
+    """
+    groups = {}
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        smooth = any(poly.use_smooth for poly in obj.data.polygons)
+        groups.setdefault((obj.active_material, smooth), []).append(obj)
+    return groups
+
+
+def create_static_batch(objects, basename="StaticBatch", collection=None):
+    """
+    Create one merged, world-space object per material.
+
+    Args:
+        objects (list): Static objects to merge
+        basename (str): Name prefix for the batch objects
+        collection (bpy.types.Collection): Collection to link the batch
+            objects to (default: the context collection)
+
+    Returns:
+        list: The created batch objects (remove them with
+            scene_utils.remove_objects() when done)
+    """
+    # Make sure matrix_world reflects locations set since the last update
+    bpy.context.view_layer.update()
+
+    batch = []
+    for index, ((mat, _), members) in enumerate(static_batch_groups(objects).items()):
+        meshes = []
+        uvs = []
+        for obj in members:
+            arrays = arrays_from_mesh(obj.data)
+            meshes.append(transform_arrays(arrays, np.array(obj.matrix_world)))
+            member_uvs = loop_uvs(obj.data)
+            uvs.append(member_uvs if member_uvs is not None else np.zeros((len(arrays.loops), 2), np.float32))
+
+        label = mat.name if mat is not None else f"Default_{index}"
+        mesh = mesh_from_arrays(f"{basename}_{label}_mesh", merge_arrays(meshes))
+        if any(obj.data.uv_layers.active is not None for obj in members):
+            set_loop_uvs(mesh, np.concatenate(uvs))
+        if mat is not None:
+            mesh.materials.append(mat)
+
+        obj = bpy.data.objects.new(f"{basename}_{label}", mesh)
+        (collection or bpy.context.collection).objects.link(obj)
+        batch.append(obj)
+    return batch
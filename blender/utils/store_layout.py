@@ -0,0 +1,411 @@
+"""
+Store Layout Module
+
+Places shelf units for a whole store from the client's store layout
+description (StoreLayoutConfigFactory in client/src/scene/StoreLayoutConfig.ts,
+serialized as JSON). Every section is a double-sided gondola: its units stand
+side by side in two back-to-back runs, one facing each aisle. Sections with
+a position stand there; sections without one are laid out on the
+shelfRows x shelfUnitsPerRow grid.
+
+For progressive loading, units can be partitioned into spatial tiles (one
+per section, or per square grid cell of the floor) that are exported as
+separate files; the manifest lists each tile's bounds and files.
+
+Units whose resolved assembly parameters are equal share a unit type, so the
+exporter stores their geometry once and each unit is only a transform.
+
+The client config is Y-up with +Z towards the entrance; Blender is Z-up,
+so a client position (x, y, z) is (x, -z, y) here. Nothing here imports bpy.
+"""
+
+import copy
+import json
+import math
+import re
+
+import numpy as np
+
+from geometry.layout import solve_assembly_layout, transform_bounds, unit_matrices
+from utils.jobs import merge_params, resolve_variant_params, validate_formats
+
+
+# StoreLayoutConfigFactory.createDefaultLayout(), plus the options that only
+# the generator reads: 'name', 'formats', 'unit' (assembly parameter
+# overrides for every unit, also allowed per section), 'export' and
+# 'unitSpacing' (distance between units in a run; default: backing width)
+DEFAULT_STORE_LAYOUT = {
+    'name': 'store',
+    'formats': ['GLB'],
+    'unit': {},
+    'export': {'instancing': 'gpu'},
+    'unitSpacing': None,
+    # 'none' exports one file; 'section' or 'grid' (cellSize x cellSize m
+    # floor cells) export one file per tile
+    'tiling': {'mode': 'none', 'cellSize': 8.0},
+    'width': 22,
+    'height': 3.2,
+    'depth': 16,
+    'shelfRows': 2,
+    'shelfUnitsPerRow': 3,
+    'shelfSpacing': 6.5,
+    'aisleWidth': 2.2,
+    'mainAisleWidth': 3.0,
+    'wallClearance': 1.0,
+    'sections': [
+        {'name': 'New & Trending', 'position': [-6.5, 0, 3], 'shelfCount': 3,
+         'category': 'new-trending', 'priority': 'high'},
+        {'name': 'Action Games', 'position': [0, 0, 3], 'shelfCount': 4,
+         'category': 'action', 'priority': 'high'},
+        {'name': 'Adventure & Story', 'position': [6.5, 0, 3], 'shelfCount': 3,
+         'category': 'adventure', 'priority': 'medium'},
+        {'name': 'RPG & Fantasy', 'position': [-6.5, 0, -3], 'shelfCount': 4,
+         'category': 'rpg', 'priority': 'medium'},
+        {'name': 'Strategy & Sim', 'position': [0, 0, -3], 'shelfCount': 3,
+         'category': 'strategy', 'priority': 'medium'},
+        {'name': 'Casual & Family', 'position': [6.5, 0, -3], 'shelfCount': 2,
+         'category': 'casual', 'priority': 'low'},
+    ],
+}
+
+TILING_MODES = ['none', 'section', 'grid']
+
+# Components that stand on the floor; the crown overhangs neighbouring units
+FOOTPRINT_KINDS = ('shelf', 'bracket', 'backing')
+
+
+def client_vector(value):
+    """
+    Read a client vector, serialized as {"x", "y", "z"} or [x, y, z].
+
+    Returns:
+        tuple: (x, y, z) floats
+    """
+    if isinstance(value, dict):
+        return (float(value.get('x', 0.0)), float(value.get('y', 0.0)), float(value.get('z', 0.0)))
+    return tuple(float(v) for v in value)
+
+
+def to_blender(position):
+    """Convert a client (Y-up) position to Blender (Z-up)."""
+    x, y, z = position
+    return (x, -z, y)
+
+
+def to_client(position):
+    """Convert a Blender (Z-up) position to the client (Y-up)."""
+    x, y, z = position
+    return (x, z, -y)
+
+
+def section_slug(section):
+    """Short identifier of a section for object names."""
+    return section.get('category') or re.sub(r'[^a-z0-9]+', '-', section['name'].lower()).strip('-')
+
+
+def resolve_store_layout(config):
+    """
+    Resolve a store layout description against the defaults.
+
+    Args:
+        config (dict): Store layout; missing keys take DEFAULT_STORE_LAYOUT values
+            (a given 'sections' list replaces the default sections)
+
+    Returns:
+        dict: Complete store layout; every section gets complete assembly
+            parameters under 'unit' and the name of its unit type under 'unit_type'
+    """
+    store = merge_params({key: value for key, value in DEFAULT_STORE_LAYOUT.items() if key != 'sections'},
+                         {key: value for key, value in config.items() if key != 'sections'})
+    store['sections'] = copy.deepcopy(config.get('sections', DEFAULT_STORE_LAYOUT['sections']))
+    store['formats'] = validate_formats(store['formats'])
+    store['export'] = resolve_variant_params({'export': store['export']})['export']
+    if not store['sections']:
+        raise ValueError("Store layout has no sections")
+    if store['tiling']['mode'] not in TILING_MODES:
+        raise ValueError(f"Unsupported tiling mode: {store['tiling']['mode']} (expected one of {TILING_MODES})")
+    if store['tiling']['cellSize'] <= 0:
+        raise ValueError(f"Tile cellSize must be positive: {store['tiling']['cellSize']}")
+
+    unit_types = {}
+    slugs = set()
+    for section in store['sections']:
+        if section.get('shelfCount', 0) < 1:
+            raise ValueError(f"Section {section.get('name')} needs a positive shelfCount")
+        section['slug'] = section_slug(section)
+        if section['slug'] in slugs:
+            raise ValueError(f"Duplicate store section: {section['slug']}")
+        slugs.add(section['slug'])
+
+        params = resolve_variant_params(merge_params(store['unit'], section.get('unit', {})))
+        key = json.dumps({k: v for k, v in params.items() if k != 'name'}, sort_keys=True)
+        if key not in unit_types:
+            unit_types[key] = f"{store['name']}_unit{len(unit_types) + 1}"
+        params['name'] = unit_types[key]
+        section['unit'] = params
+        section['unit_type'] = unit_types[key]
+    return store
+
+
+def load_store_layout(filepath):
+    """
+    Load a store layout JSON file.
+
+    Args:
+        filepath (str): Path to the JSON file
+
+    Returns:
+        dict: Complete store layout (see resolve_store_layout())
+    """
+    with open(filepath, 'r') as f:
+        return resolve_store_layout(json.load(f))
+
+
+def unit_footprint(layout):
+    """
+    Floor footprint of a solved unit.
+
+    Args:
+        layout (AssemblyLayout): Solved unit
+
+    Returns:
+        tuple: (minimum, maximum) corners in unit space, each (3,)
+    """
+    low, high = layout.component_bounds()
+    rows = [i for i, kind in enumerate(layout.kinds) if kind in FOOTPRINT_KINDS]
+    return low[rows].min(axis=0), high[rows].max(axis=0)
+
+
+def gondola_units(count, spacing, back_y):
+    """
+    Place the units of one double-sided gondola around its center.
+
+    The front run faces +Y (towards the client's -Z); the back run is
+    turned around so both runs share the plane behind their backings.
+
+    Args:
+        count (int): Units in the gondola
+        spacing (float): Distance between units in a run
+        back_y (float): Unit-space Y of the back face of the backing
+
+    Returns:
+        tuple: (count, 3) unit locations relative to the gondola center and
+            (count,) rotations about Z
+    """
+    front = (count + 1) // 2
+    locations = np.zeros((count, 3))
+    rotations = np.zeros(count)
+    for run, (start, units) in enumerate(((0, front), (front, count - front))):
+        columns = (np.arange(units) - (units - 1) / 2.0) * spacing
+        locations[start:start + units, 0] = columns if run == 0 else -columns
+        locations[start:start + units, 1] = -back_y if run == 0 else back_y
+        rotations[start:start + units] = 0.0 if run == 0 else math.pi
+    return locations, rotations
+
+
+def solve_store_layout(store):
+    """
+    Place every shelf unit of a store.
+
+    Args:
+        store (dict): Layout from resolve_store_layout()
+
+    Returns:
+        dict: 'unit_types' (name -> {'params', 'layout', 'footprint'}) and
+            'units' (one dict per unit with 'name', 'section', 'unit_type' and
+            its 4x4 unit-to-store 'matrix' in Blender space)
+    """
+    unit_types = {}
+    for section in store['sections']:
+        if section['unit_type'] not in unit_types:
+            layout = solve_assembly_layout(section['unit'])
+            unit_types[section['unit_type']] = {'params': section['unit'], 'layout': layout,
+                                                'footprint': unit_footprint(layout)}
+
+    rows, per_row = store['shelfRows'], store['shelfUnitsPerRow']
+    units = []
+    for index, section in enumerate(store['sections']):
+        unit_type = unit_types[section['unit_type']]
+        layout = unit_type['layout']
+        backing = layout.kinds.index('backing')
+        back_y = layout.locations[backing, 1] + layout.local_min[backing, 1]
+        low, high = unit_type['footprint']
+
+        if section.get('position') is not None:
+            center = to_blender(client_vector(section['position']))
+        else:
+            # Grid: sections shelfSpacing apart along X, rows separated by
+            # the main aisle
+            row, column = divmod(index, per_row)
+            row_pitch = store['mainAisleWidth'] + 2.0 * (high[1] - back_y)
+            center = ((column - (per_row - 1) / 2.0) * store['shelfSpacing'],
+                      (row - (rows - 1) / 2.0) * row_pitch, 0.0)
+
+        spacing = store['unitSpacing'] or layout.sizes[backing, 0]
+        offsets, rotations = gondola_units(section['shelfCount'], spacing, back_y)
+        # Units are modeled around the shelf; stand them on the floor
+        offsets[:, 2] = -low[2]
+        matrices = unit_matrices(offsets + np.array(center), rotations)
+        for number, matrix in enumerate(matrices, 1):
+            units.append({'name': f"{section['slug']}_{number:02d}", 'section': section['slug'],
+                          'unit_type': section['unit_type'], 'matrix': matrix})
+    return {'unit_types': unit_types, 'units': units}
+
+
+def unit_bounds(solved, footprint=False):
+    """
+    Bounds of every placed unit in store space.
+
+    Args:
+        solved (dict): Result of solve_store_layout()
+        footprint (bool): Only the floor footprint (see FOOTPRINT_KINDS)
+            instead of the whole unit
+
+    Returns:
+        tuple: (minimum, maximum) corners, each (U, 3)
+    """
+    if not solved['units']:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+    type_bounds = {name: info['footprint'] if footprint else info['layout'].bounds()
+                   for name, info in solved['unit_types'].items()}
+    low = np.array([type_bounds[unit['unit_type']][0] for unit in solved['units']])
+    high = np.array([type_bounds[unit['unit_type']][1] for unit in solved['units']])
+    return transform_bounds(low, high, np.array([unit['matrix'] for unit in solved['units']]))
+
+
+def client_bounds(low, high):
+    """
+    Convert Blender-space boxes to client-space boxes.
+
+    Args:
+        low (np.ndarray): (..., 3) minimum corners
+        high (np.ndarray): (..., 3) maximum corners
+
+    Returns:
+        tuple: (minimum, maximum) corners in client coordinates
+    """
+    low, high = np.asarray(low), np.asarray(high)
+    # Blender -Y is client +Z, so the Y extremes swap
+    return (np.stack([low[..., 0], low[..., 2], -high[..., 1]], axis=-1),
+            np.stack([high[..., 0], high[..., 2], -low[..., 1]], axis=-1))
+
+
+def assign_tiles(store, solved):
+    """
+    Partition the placed units into spatial tiles.
+
+    Grid cells are taken from the center of each unit's footprint, so a
+    unit is never split between tiles.
+
+    Args:
+        store (dict): Layout from resolve_store_layout()
+        solved (dict): Result of solve_store_layout()
+
+    Returns:
+        dict: Tile id -> unit indices, in unit order (empty when tiling is off)
+    """
+    mode = store['tiling']['mode']
+    tiles = {}
+    if mode == 'section':
+        for index, unit in enumerate(solved['units']):
+            tiles.setdefault(unit['section'], []).append(index)
+    elif mode == 'grid':
+        low, high = client_bounds(*unit_bounds(solved, footprint=True))
+        cells = np.floor((low + high) / 2.0 / store['tiling']['cellSize']).astype(int)
+        for index, (x, _, z) in enumerate(cells):
+            tiles.setdefault(f"cell_{x}_{z}", []).append(index)
+    return tiles
+
+
+def validate_store(store, solved, tolerance=1e-6):
+    """
+    Check that the placed units fit the room and do not collide.
+
+    Units of one section touch on purpose; units of different sections must
+    not overlap, and every unit must keep wallClearance from the walls.
+
+    Args:
+        store (dict): Layout from resolve_store_layout()
+        solved (dict): Result of solve_store_layout()
+        tolerance (float): Allowed overlap in meters
+
+    Returns:
+        list: Descriptions of the problems found (empty when valid)
+    """
+    low, high = unit_bounds(solved, footprint=True)
+    problems = []
+    sections = np.array([unit['section'] for unit in solved['units']])
+    overlap = ((low[:, None, :2] < high[None, :, :2] - tolerance)
+               & (low[None, :, :2] < high[:, None, :2] - tolerance)).all(axis=2)
+    overlap &= sections[:, None] != sections[None, :]
+    pairs = sorted({tuple(sorted((sections[i], sections[j]))) for i, j in zip(*np.nonzero(overlap))})
+    problems.extend(f"Sections {a} and {b} overlap" for a, b in pairs)
+
+    # The room is centered on the origin: width along X, depth along the
+    # client's Z (Blender -Y)
+    half = np.array([store['width'] / 2.0, store['depth'] / 2.0]) - store['wallClearance']
+    outside = ((low[:, :2] < -half - tolerance) | (high[:, :2] > half + tolerance)).any(axis=1)
+    problems.extend(f"Unit {solved['units'][i]['name']} is closer than {store['wallClearance']} m to a wall"
+                    for i in np.flatnonzero(outside))
+    return problems
+
+
+def store_manifest(store, solved, exports=None, tiles=None, tile_files=None):
+    """
+    Describe a generated store for the client, in client (Y-up) coordinates.
+
+    Args:
+        store (dict): Layout from resolve_store_layout()
+        solved (dict): Result of solve_store_layout()
+        exports (dict): Export format -> file path of the whole-store export
+        tiles (dict): Result of assign_tiles() when the store was exported in tiles
+        tile_files (dict): Tile id -> export format -> file description
+            ({'path', 'bytes', 'sha256'})
+
+    Returns:
+        dict: JSON-serializable manifest with sections, unit types, one
+            entry per unit with its position, rotation about the vertical
+            axis, footprint and tile, and the tiles with their bounds and files
+    """
+    low, high = client_bounds(*unit_bounds(solved, footprint=True))
+    full_low, full_high = client_bounds(*unit_bounds(solved))
+    unit_tiles = {index: tile for tile, indices in (tiles or {}).items() for index in indices}
+    units = []
+    for index, unit in enumerate(solved['units']):
+        matrix = unit['matrix']
+        units.append({
+            'name': unit['name'],
+            'section': unit['section'],
+            'unit_type': unit['unit_type'],
+            'tile': unit_tiles.get(index),
+            'position': [round(float(v), 6) for v in to_client(matrix[:3, 3])],
+            # Rotation about the client's Y axis (Blender Z)
+            'rotation_y': round(float(math.atan2(matrix[1, 0], matrix[0, 0])), 6),
+            'bounds_min': [round(float(v), 6) for v in low[index]],
+            'bounds_max': [round(float(v), 6) for v in high[index]],
+        })
+
+    tile_entries = []
+    for tile, indices in (tiles or {}).items():
+        tile_low, tile_high = full_low[indices].min(axis=0), full_high[indices].max(axis=0)
+        tile_entries.append({
+            'id': tile,
+            'bounds_min': [round(float(v), 6) for v in tile_low],
+            'bounds_max': [round(float(v), 6) for v in tile_high],
+            'center': [round(float(v), 6) for v in (tile_low + tile_high) / 2.0],
+            'units': [solved['units'][index]['name'] for index in indices],
+            'files': (tile_files or {}).get(tile, {}),
+        })
+
+    return {
+        'name': store['name'],
+        'room': {'width': store['width'], 'height': store['height'], 'depth': store['depth']},
+        'sections': [{'name': section['name'], 'slug': section['slug'], 'category': section.get('category'),
+                      'priority': section.get('priority'), 'shelf_count': section['shelfCount'],
+                      'unit_type': section['unit_type']} for section in store['sections']],
+        'unit_types': sorted(solved['unit_types']),
+        'units': units,
+        'exports': exports or {},
+        'tiling': {'mode': store['tiling']['mode'], 'cell_size': store['tiling']['cellSize'],
+                   'tiles': tile_entries},
+    }
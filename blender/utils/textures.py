@@ -0,0 +1,133 @@
+"""
+Texture Generation Module
+
+Generates tileable pegboard textures with NumPy and encodes them as PNG with
+the standard library only. One tile holds one hole, so a texture repeated
+once per hole reproduces the whole pattern. Nothing here imports bpy.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+
+def hole_fractions(hole_fraction):
+    """Split a hole size into (U, V) fractions; a single number is square."""
+    fraction_u, fraction_v = np.broadcast_to(np.asarray(hole_fraction, dtype=float), (2,))
+    return float(fraction_u), float(fraction_v)
+
+
+def square_coverage(resolution, hole_fraction):
+    """
+    Compute how much of each texel a centered rectangular hole covers.
+
+    Coverage is exact (area of overlap), so hole edges come out antialiased
+    at any resolution.
+
+    Args:
+        resolution (int): Tile size in texels
+        hole_fraction (float or tuple): Hole size as a fraction of the tile
+            (0-1), or separate (U, V) fractions
+
+    Returns:
+        np.ndarray: (resolution, resolution) float coverage in [0, 1]
+    """
+    edges = np.linspace(0.0, 1.0, resolution + 1)
+
+    def overlap(fraction):
+        # Overlap of every texel interval with the hole interval
+        low, high = 0.5 - fraction / 2.0, 0.5 + fraction / 2.0
+        return np.clip(np.minimum(edges[1:], high) - np.maximum(edges[:-1], low), 0.0, None) * resolution
+
+    fraction_u, fraction_v = hole_fractions(hole_fraction)
+    return np.outer(overlap(fraction_v), overlap(fraction_u))
+
+
+def pegboard_alpha_tile(resolution=64, hole_fraction=0.1):
+    """
+    Create an RGBA pegboard tile: white, transparent where the hole is.
+
+    The color channels are white so the tile can be used as a base color
+    texture that the material's base color tints.
+
+    Args:
+        resolution (int): Tile size in texels
+        hole_fraction (float or tuple): Hole size as a fraction of the tile,
+            or separate (U, V) fractions
+
+    Returns:
+        np.ndarray: (resolution, resolution, 4) uint8 pixels, top row first
+    """
+    pixels = np.full((resolution, resolution, 4), 255, dtype=np.uint8)
+    alpha = 1.0 - square_coverage(resolution, hole_fraction)
+    pixels[..., 3] = np.round(alpha * 255.0)
+    return pixels
+
+
+def pegboard_normal_tile(resolution=64, hole_fraction=0.1, bevel_fraction=0.05, strength=1.0):
+    """
+    Create a tangent-space normal map tile with a beveled hole edge.
+
+    The surface is modelled as a height field that drops from 1 to 0 over a
+    bevel around the hole. Gradients wrap around the tile, so the result
+    tiles seamlessly.
+
+    Args:
+        resolution (int): Tile size in texels
+        hole_fraction (float or tuple): Hole size as a fraction of the tile,
+            or separate (U, V) fractions
+        bevel_fraction (float): Bevel width as a fraction of the tile
+        strength (float): Slope scale of the bevel
+
+    Returns:
+        np.ndarray: (resolution, resolution, 3) uint8 pixels, top row first
+    """
+    centers = (np.arange(resolution) + 0.5) / resolution
+    fraction_u, fraction_v = hole_fractions(hole_fraction)
+    # Distance outside the hole (Chebyshev), per texel
+    outside = np.maximum.outer(np.abs(centers - 0.5) - fraction_v / 2.0,
+                               np.abs(centers - 0.5) - fraction_u / 2.0)
+    height = np.clip(outside / max(bevel_fraction, 1e-6), 0.0, 1.0)
+
+    # Central differences with wraparound; rows run top to bottom, so +V is -row
+    du = (np.roll(height, -1, axis=1) - np.roll(height, 1, axis=1)) * (resolution / 2.0)
+    dv = (np.roll(height, 1, axis=0) - np.roll(height, -1, axis=0)) * (resolution / 2.0)
+    scale = strength * bevel_fraction
+    normals = np.stack([-du * scale, -dv * scale, np.ones_like(height)], axis=-1)
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    return np.round((normals * 0.5 + 0.5) * 255.0).astype(np.uint8)
+
+
+def encode_png(pixels):
+    """
+    Encode 8-bit pixels as a PNG file.
+
+    Args:
+        pixels (np.ndarray): (height, width, channels) uint8 pixels, top row
+            first, with 1 (gray), 3 (RGB) or 4 (RGBA) channels
+
+    Returns:
+        bytes: The PNG file contents
+    """
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    if pixels.ndim == 2:
+        pixels = pixels[..., np.newaxis]
+    height, width, channels = pixels.shape
+    color_types = {1: 0, 3: 2, 4: 6}
+    if channels not in color_types:
+        raise ValueError(f"Unsupported channel count: {channels}")
+
+    # Every scanline starts with filter type 0 (None)
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * channels)
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, color_types[channels], 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(rows.tobytes(), 9))
+            + chunk(b'IEND', b''))